@@ -1,4 +1,7 @@
+import os
+
 import torch
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings
 
 
@@ -39,6 +42,29 @@ class Settings(BaseSettings):
     voice_weight_normalization: bool = (
         True  # Normalize the voice weights so they add up to 1
     )
+    verbalization_cache_size: int = (
+        32768  # Entries per cache of number/money/time verbalizations
+    )
+    verbalization_cache_warmup: bool = (
+        True  # Precompute common numbers, years and clock times at startup
+    )
+    phonemizer_pool_size: int = min(
+        4, os.cpu_count() or 1
+    )  # espeak backends per language, shared by concurrent G2P calls
+    token_estimator: str = (
+        "linear"  # How smart_split plans chunks: "linear" estimates token counts, "exact" phonemizes every sentence
+    )
+
+    # Pronunciation dictionary shared by the text pre-pass and pipeline lexicons
+    pronunciations_dict_path: str = Field(
+        default="/app/api/pronunciations.json",
+        validation_alias=AliasChoices(
+            "pronunciations_dict_path", "pronunciation_dict_path"
+        ),
+    )
+    pronunciations_poll_interval_s: float = (
+        2.0  # How often to check the dictionary file for changes, 0 disables
+    )
 
     gap_trim_ms: int = (
         1  # Base amount to trim from streaming chunk ends in milliseconds
@@ -50,6 +76,24 @@ class Settings(BaseSettings):
         "?": 1,
         ",": 0.8,
     }
+    crossfade_ms: int = (
+        0  # Equal-power crossfade between streamed chunks in milliseconds, 0 disables
+    )
+
+    # Batch Synthesis Settings
+    batch_max_items: int = 5000  # Maximum prompts per /v1/audio/speech/batch request
+    batch_concurrency: int = 4  # Batch items synthesized and encoded at once
+
+    # Background Job Settings
+    jobs_dir: str = "api/jobs"  # Job queue database, chunk checkpoints and finished audio
+    jobs_idle_poll_s: float = 0.25  # How often a waiting job checks for interactive traffic
+    jobs_max_age_hours: float = 24  # Delete completed and failed jobs after this long, 0 keeps them
+    jobs_cleanup_interval_s: float = 3600.0  # How often an idle runner checks for expired jobs
+
+    # Resumable Streaming Settings
+    stream_resume_enabled: bool = False  # Buffer streamed speech so clients can reconnect by X-Stream-Id
+    stream_resume_ttl_s: float = 60.0  # How long a stream stays resumable without a connected client, generation keeps running until then
+    stream_resume_max_mb: int = 256  # Memory limit for all buffered streams, least recently used are evicted
 
     # Web Player Settings
     enable_web_player: bool = True  # Whether to serve the web player UI
@@ -62,6 +106,8 @@ class Settings(BaseSettings):
     max_temp_dir_size_mb: int = 2048  # Maximum size of temp directory (2GB)
     max_temp_dir_age_hours: int = 1  # Remove temp files older than 1 hour
     max_temp_dir_count: int = 3  # Maximum number of temp files to keep
+    temp_janitor_interval_s: float = 60.0  # How often expired temp files are removed in the background
+    temp_file_flush_bytes: int = 1048576  # Download bytes buffered in memory before each disk write
 
     class Config:
         env_file = ".env"
@@ -337,30 +337,6 @@ async def verify_model_path(model_path: str) -> bool:
     return await aiofiles.os.path.exists(model_path)
 
 
-async def cleanup_temp_files() -> None:
-    """Clean up old temp files on startup"""
-    try:
-        if not await aiofiles.os.path.exists(settings.temp_file_dir):
-            await aiofiles.os.makedirs(settings.temp_file_dir, exist_ok=True)
-            return
-
-        entries = await aiofiles.os.scandir(settings.temp_file_dir)
-        for entry in entries:
-            if entry.is_file():
-                stat = await aiofiles.os.stat(entry.path)
-                max_age = stat.st_mtime + (settings.max_temp_dir_age_hours * 3600)
-                if max_age < stat.st_mtime:
-                    try:
-                        await aiofiles.os.remove(entry.path)
-                        logger.info(f"Cleaned up old temp file: {entry.name}")
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to delete old temp file {entry.name}: {e}"
-                        )
-    except Exception as e:
-        logger.warning(f"Error cleaning temp files: {e}")
-
-
 async def get_temp_file_path(filename: str) -> str:
     """Get path to temporary audio file.
 
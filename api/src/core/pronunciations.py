@@ -0,0 +1,221 @@
+"""Shared pronunciation dictionary store.
+
+The pronunciation dictionary is loaded from disk once and shared by every
+consumer (the text pre-pass and each KPipeline lexicon). Consumers subscribe to
+the store and are notified with the new entries whenever the dictionary changes,
+either through the API or because the file on disk was edited.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional
+
+from loguru import logger
+
+from .config import settings
+
+PronunciationSubscriber = Callable[[Mapping[str, str], int], None]
+
+
+class PronunciationStore:
+    """Version-stamped pronunciation dictionary with change notifications."""
+
+    def __init__(self, path: str):
+        """Initialize store.
+
+        Args:
+            path: Path to the pronunciation JSON file
+        """
+        self.path = path
+        self._entries: Dict[str, str] = {}
+        self._version = 0
+        self._mtime: Optional[float] = None
+        self._loaded = False
+        self._subscribers: List[PronunciationSubscriber] = []
+        self._lock = threading.RLock()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @property
+    def version(self) -> int:
+        """Version number, incremented on every change."""
+        self._ensure_loaded()
+        return self._version
+
+    @property
+    def entries(self) -> Mapping[str, str]:
+        """Read-only view of the current dictionary."""
+        self._ensure_loaded()
+        return MappingProxyType(self._entries)
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def _stat_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def load(self) -> bool:
+        """Load the dictionary from disk.
+
+        Returns:
+            True if the entries changed
+        """
+        with self._lock:
+            mtime = self._stat_mtime()
+            entries: Dict[str, str] = {}
+            if mtime is not None:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        entries = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Failed to load pronunciations from {self.path}: {e}")
+                    entries = {}
+
+            self._mtime = mtime
+            self._loaded = True
+            if entries == self._entries:
+                return False
+
+            self._entries = entries
+            self._version += 1
+            logger.info(
+                f"Loaded {len(entries)} pronunciations (version {self._version})"
+            )
+            self._notify()
+            return True
+
+    def check_for_updates(self) -> bool:
+        """Reload the dictionary if the file's mtime changed.
+
+        Returns:
+            True if the entries changed
+        """
+        if not self._loaded:
+            return self.load()
+        if self._stat_mtime() == self._mtime:
+            return False
+        return self.load()
+
+    def save(self) -> None:
+        """Persist the dictionary to disk."""
+        with self._lock:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+            # Our own write must not be picked up as an external change
+            self._mtime = self._stat_mtime()
+
+    def update(self, word: str, phonemes: str) -> None:
+        """Add or update a word pronunciation and save.
+
+        Args:
+            word: Word to update (stored lowercased)
+            phonemes: Phoneme representation of the word
+
+        Raises:
+            ValueError: If word or phonemes are empty
+        """
+        if not word or not phonemes:
+            raise ValueError("Word and phonemes must be provided")
+        with self._lock:
+            self._ensure_loaded()
+            self._entries = {**self._entries, word.lower(): phonemes}
+            self._version += 1
+            self.save()
+            self._notify()
+
+    def delete(self, word: str) -> None:
+        """Remove a word pronunciation and save.
+
+        Args:
+            word: Word to remove
+
+        Raises:
+            ValueError: If word is empty
+        """
+        if not word:
+            raise ValueError("Word must be provided")
+        with self._lock:
+            self._ensure_loaded()
+            lowered = word.lower()
+            if lowered not in self._entries:
+                return
+            self._entries = {k: v for k, v in self._entries.items() if k != lowered}
+            self._version += 1
+            self.save()
+            self._notify()
+
+    def subscribe(self, callback: PronunciationSubscriber) -> Callable[[], None]:
+        """Register a callback for dictionary changes.
+
+        The callback is invoked immediately with the current entries and then
+        again after every change.
+
+        Args:
+            callback: Called with (entries, version)
+
+        Returns:
+            Function that removes the subscription
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._subscribers.append(callback)
+            callback(MappingProxyType(self._entries), self._version)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def _notify(self) -> None:
+        entries = MappingProxyType(self._entries)
+        for callback in list(self._subscribers):
+            try:
+                callback(entries, self._version)
+            except Exception as e:
+                logger.error(f"Pronunciation subscriber failed: {e}")
+
+    async def _watch(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Stat, read and notify off the event loop; subscribers only
+                # swap in newly built objects, so they are safe on any thread
+                await asyncio.to_thread(self.check_for_updates)
+            except Exception as e:
+                logger.warning(f"Error polling pronunciations file: {e}")
+
+    def start_watching(self, interval: Optional[float] = None) -> None:
+        """Start polling the file's mtime on the running event loop.
+
+        Args:
+            interval: Seconds between polls, defaults to settings value
+        """
+        if self._watch_task is not None and not self._watch_task.done():
+            return
+        interval = interval or settings.pronunciations_poll_interval_s
+        if interval <= 0:
+            return
+        self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def stop_watching(self) -> None:
+        """Stop the mtime polling task."""
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+        self._watch_task = None
+
+
+# Global instance
+pronunciation_store = PronunciationStore(settings.pronunciations_dict_path)
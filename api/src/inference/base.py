@@ -1,19 +1,87 @@
 """Base interface for Kokoro inference."""
 
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, List, Optional, Tuple, Union
+from typing import AsyncGenerator, Iterable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import torch
 
 
+class WordTimestamps:
+    """Word-level timestamps as a word list and parallel time arrays
+
+    Kept in this form until the response boundary, so offsetting a chunk's
+    timestamps is one array add instead of one model update per word.
+    """
+
+    __slots__ = ("words", "start_times", "end_times")
+
+    def __init__(
+        self,
+        words: Optional[List[str]] = None,
+        start_times: Optional[Sequence[float]] = None,
+        end_times: Optional[Sequence[float]] = None,
+    ):
+        self.words = list(words) if words else []
+        self.start_times = np.asarray(
+            start_times if start_times is not None else [], dtype=np.float64
+        )
+        self.end_times = np.asarray(
+            end_times if end_times is not None else [], dtype=np.float64
+        )
+
+    @classmethod
+    def concat(cls, timestamps: Iterable[Optional["WordTimestamps"]]) -> "WordTimestamps":
+        """Join timestamps in order, skipping None"""
+        parts = [t for t in timestamps if t]
+        if not parts:
+            return cls()
+        return cls(
+            [word for part in parts for word in part.words],
+            np.concatenate([part.start_times for part in parts]),
+            np.concatenate([part.end_times for part in parts]),
+        )
+
+    def shift(self, seconds: float) -> None:
+        """Offset all times in place"""
+        self.start_times += seconds
+        self.end_times += seconds
+
+    def to_dicts(self) -> List[dict]:
+        """Convert to dicts matching the WordTimestamp schema"""
+        return [
+            {"word": word, "start_time": start, "end_time": end}
+            for word, start, end in zip(
+                self.words, self.start_times.tolist(), self.end_times.tolist()
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __add__(self, other: Optional["WordTimestamps"]) -> "WordTimestamps":
+        return WordTimestamps.concat((self, other))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, WordTimestamps):
+            return NotImplemented
+        return (
+            self.words == other.words
+            and np.array_equal(self.start_times, other.start_times)
+            and np.array_equal(self.end_times, other.end_times)
+        )
+
+    def __repr__(self) -> str:
+        return f"WordTimestamps({self.to_dicts()!r})"
+
+
 class AudioChunk:
     """Class for audio chunks returned by model backends"""
 
     def __init__(
         self,
         audio: np.ndarray,
-        word_timestamps: Optional[List] = [],
+        word_timestamps: Optional[WordTimestamps] = None,
         output: Optional[Union[bytes, np.ndarray]] = b"",
     ):
         self.audio = audio
@@ -23,15 +91,14 @@ class AudioChunk:
     @staticmethod
     def combine(audio_chunk_list: List):
         output = AudioChunk(
-            audio_chunk_list[0].audio, audio_chunk_list[0].word_timestamps
+            np.concatenate(
+                [audio_chunk.audio for audio_chunk in audio_chunk_list], dtype=np.int16
+            )
         )
-
-        for audio_chunk in audio_chunk_list[1:]:
-            output.audio = np.concatenate(
-                (output.audio, audio_chunk.audio), dtype=np.int16
+        if any(audio_chunk.word_timestamps is not None for audio_chunk in audio_chunk_list):
+            output.word_timestamps = WordTimestamps.concat(
+                audio_chunk.word_timestamps for audio_chunk in audio_chunk_list
             )
-            if output.word_timestamps is not None:
-                output.word_timestamps += audio_chunk.word_timestamps
 
         return output
 
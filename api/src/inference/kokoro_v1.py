@@ -1,7 +1,7 @@
 """Clean Kokoro implementation with controlled resource management."""
 
 import os
-from typing import AsyncGenerator, Dict, Optional, Tuple, Union
+from typing import AsyncGenerator, Dict, Mapping, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -11,12 +11,11 @@ from loguru import logger
 from ..core import paths
 from ..core.config import settings
 from ..core.model_config import model_config
-from ..structures.schemas import WordTimestamp
-from .base import AudioChunk, BaseModelBackend
+from ..core.pronunciations import pronunciation_store
+from .base import AudioChunk, BaseModelBackend, WordTimestamps
 
-import json
-
-PRONUNCIATIONS_DICT_PATH = os.getenv("PRONUNCIATIONS_DICT_PATH", "/app/api/pronunciations.json")
+# Entries always added to the English lexicon
+BASE_PRONUNCIATIONS = {"CEM": "C P Q"}
 
 class KokoroV1(BaseModelBackend):
     """Kokoro backend with controlled resource management."""
@@ -28,6 +27,14 @@ class KokoroV1(BaseModelBackend):
         self._device = settings.get_device()
         self._model: Optional[KModel] = None
         self._pipelines: Dict[str, KPipeline] = {}  # Store pipelines by lang_code
+        # Lexicon golds as shipped, before dictionary entries, per lang_code
+        self._original_golds: Dict[str, Dict[str, object]] = {}
+        self._pronunciations: Mapping[str, str] = {}
+        # Device mapped copies of voice files, by source path: (mtime, copy path)
+        self._device_voices: Dict[str, Tuple[float, str]] = {}
+        self._unsubscribe_pronunciations = pronunciation_store.subscribe(
+            self._on_pronunciations_changed
+        )
 
     async def load_model(self, path: str) -> None:
         """Load pre-baked model.
@@ -50,6 +57,11 @@ class KokoroV1(BaseModelBackend):
             logger.info(f"Config path: {config_path}")
             logger.info(f"Model path: {model_path}")
 
+            if self._unsubscribe_pronunciations is None:
+                self._unsubscribe_pronunciations = pronunciation_store.subscribe(
+                    self._on_pronunciations_changed
+                )
+
             # Load model and let KModel handle device mapping
             self._model = KModel(config=config_path, model=model_path).eval()
             # For MPS, manually move ISTFT layers to CPU while keeping rest on MPS
@@ -85,17 +97,72 @@ class KokoroV1(BaseModelBackend):
             self._pipelines[lang_code] = KPipeline(
                 lang_code=lang_code, model=self._model, device=self._device
             )
-            #DJ
-            # Open and read the JSON file
-            with open(PRONUNCIATIONS_DICT_PATH, 'r') as file:
-                phoneme_json = json.load(file)
-
-            self._pipelines[lang_code].g2p.lexicon.golds['CEM'] = 'C P Q'
-            for item, phoneme in phoneme_json.items():
-                self._pipelines[lang_code].g2p.lexicon.golds[item] = phoneme
+            self._apply_pronunciations(lang_code)
 
         return self._pipelines[lang_code]
 
+    def _on_pronunciations_changed(
+        self, entries: Mapping[str, str], version: int
+    ) -> None:
+        """Push a new pronunciation dictionary version into every lexicon."""
+        self._pronunciations = entries
+        for lang_code in list(self._pipelines):
+            self._apply_pronunciations(lang_code)
+        if self._pipelines:
+            logger.debug(
+                f"Applied pronunciations version {version} to {len(self._pipelines)} pipelines"
+            )
+
+    def _apply_pronunciations(self, lang_code: str) -> None:
+        """Sync a pipeline's lexicon with the current pronunciation dictionary.
+
+        The lexicon gets a new golds dict built from the original one, swapped
+        in with a single assignment, so lookups running on worker threads never
+        see a partly applied version. Words dropped from the dictionary get
+        their original lexicon value back.
+        """
+        lexicon = getattr(self._pipelines[lang_code].g2p, "lexicon", None)
+        if lexicon is None:
+            return  # Only misaki's English G2P has a gold lexicon
+        original = self._original_golds.setdefault(lang_code, lexicon.golds)
+        lexicon.golds = {**original, **BASE_PRONUNCIATIONS, **self._pronunciations}
+
+    async def _get_device_voice_path(self, voice_path: str) -> str:
+        """Get a copy of a voice file saved with device mapping.
+
+        The copy is made once per voice file and reused until the file changes,
+        so chunks of the same stream or session do not reload the voice.
+
+        Args:
+            voice_path: Path to voice file
+
+        Returns:
+            Path to the device mapped copy
+        """
+        try:
+            mtime = os.path.getmtime(voice_path)
+        except OSError:
+            mtime = None  # Left to load_voice_tensor to report
+        cached = self._device_voices.get(voice_path)
+        if cached and cached[0] == mtime and os.path.exists(cached[1]):
+            return cached[1]
+
+        # Load voice tensor with proper device mapping
+        voice_tensor = await paths.load_voice_tensor(voice_path, device=self._device)
+        # Save back to a temporary file with proper device mapping
+        import tempfile
+
+        temp_dir = tempfile.gettempdir()
+        temp_path = os.path.join(temp_dir, f"temp_voice_{os.path.basename(voice_path)}")
+        await paths.save_voice_tensor(voice_tensor, temp_path)
+
+        # Pipelines cache voices by path, so drop the stale tensor
+        for pipeline in self._pipelines.values():
+            pipeline.voices.pop(temp_path, None)
+        if mtime is not None:
+            self._device_voices[voice_path] = (mtime, temp_path)
+        return temp_path
+
     async def generate_from_tokens(
         self,
         tokens: str,
@@ -145,19 +212,7 @@ class KokoroV1(BaseModelBackend):
                 voice_path = voice
                 voice_name = os.path.splitext(os.path.basename(voice_path))[0]
 
-            # Load voice tensor with proper device mapping
-            voice_tensor = await paths.load_voice_tensor(
-                voice_path, device=self._device
-            )
-            # Save back to a temporary file with proper device mapping
-            import tempfile
-
-            temp_dir = tempfile.gettempdir()
-            temp_path = os.path.join(
-                temp_dir, f"temp_voice_{os.path.basename(voice_path)}"
-            )
-            await paths.save_voice_tensor(voice_tensor, temp_path)
-            voice_path = temp_path
+            voice_path = await self._get_device_voice_path(voice_path)
 
             # Use provided lang_code, settings voice code override, or first letter of voice name
             if lang_code:  # api is given priority
@@ -244,19 +299,7 @@ class KokoroV1(BaseModelBackend):
                 voice_path = voice
                 voice_name = os.path.splitext(os.path.basename(voice_path))[0]
 
-            # Load voice tensor with proper device mapping
-            voice_tensor = await paths.load_voice_tensor(
-                voice_path, device=self._device
-            )
-            # Save back to a temporary file with proper device mapping
-            import tempfile
-
-            temp_dir = tempfile.gettempdir()
-            temp_path = os.path.join(
-                temp_dir, f"temp_voice_{os.path.basename(voice_path)}"
-            )
-            await paths.save_voice_tensor(voice_tensor, temp_path)
-            voice_path = temp_path
+            voice_path = await self._get_device_voice_path(voice_path)
 
             # Use provided lang_code, settings voice code override, or first letter of voice name
             pipeline_lang_code = (
@@ -284,14 +327,12 @@ class KokoroV1(BaseModelBackend):
                         and hasattr(result, "tokens")
                         and result.tokens
                     ):
-                        word_timestamps = []
-                        current_offset = 0.0
+                        words, start_times, end_times = [], [], []
                         logger.debug(
                             f"Processing chunk timestamps with {len(result.tokens)} tokens"
                         )
                         if result.pred_dur is not None:
                             try:
-                                # Add timestamps with offset
                                 for token in result.tokens:
                                     if not all(
                                         hasattr(token, attr)
@@ -305,23 +346,18 @@ class KokoroV1(BaseModelBackend):
                                     if not token.text or not token.text.strip():
                                         continue
 
-                                    start_time = float(token.start_ts) + current_offset
-                                    end_time = float(token.end_ts) + current_offset
-                                    word_timestamps.append(
-                                        WordTimestamp(
-                                            word=str(token.text).strip(),
-                                            start_time=start_time,
-                                            end_time=end_time,
-                                        )
-                                    )
-                                    logger.debug(
-                                        f"Added timestamp for word '{token.text}': {start_time:.3f}s - {end_time:.3f}s"
-                                    )
+                                    start_time = float(token.start_ts)
+                                    end_time = float(token.end_ts)
+                                    words.append(str(token.text).strip())
+                                    start_times.append(start_time)
+                                    end_times.append(end_time)
 
                             except Exception as e:
                                 logger.error(
                                     f"Failed to process timestamps for chunk: {e}"
                                 )
+                        word_timestamps = WordTimestamps(words, start_times, end_times)
+                        logger.debug(f"Added timestamps for {len(words)} words")
 
                     yield AudioChunk(
                         result.audio.numpy(), word_timestamps=word_timestamps
@@ -367,6 +403,11 @@ class KokoroV1(BaseModelBackend):
         for pipeline in self._pipelines.values():
             del pipeline
         self._pipelines.clear()
+        self._original_golds.clear()
+        self._device_voices.clear()
+        if self._unsubscribe_pronunciations is not None:
+            self._unsubscribe_pronunciations()
+            self._unsubscribe_pronunciations = None
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
             torch.cuda.synchronize()
@@ -2,6 +2,7 @@
 FastAPI OpenAI Compatible API
 """
 
+import asyncio
 import os
 import sys
 from contextlib import asynccontextmanager
@@ -18,6 +19,7 @@ from .routers.debug import router as debug_router
 from .routers.development import router as dev_router
 from .routers.openai_compatible import router as openai_router
 from .routers.web_player import router as web_router
+from .routers.websocket import router as websocket_router
 
 
 def setup_logger():
@@ -47,12 +49,25 @@ setup_logger()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for model initialization"""
+    from .core.pronunciations import pronunciation_store
     from .inference.model_manager import get_manager
     from .inference.voice_manager import get_manager as get_voice_manager
-    from .services.temp_manager import cleanup_temp_files
+    from .routers.openai_compatible import get_tts_service
+    from .services.jobs import get_job_runner
+    from .services.temp_manager import cleanup_temp_files, temp_file_index
+    from .services.text_processing.normalizer import warm_verbalization_cache
 
-    # Clean old temp files on startup
+    # Index and clean old temp files on startup, then keep them within limits
     await cleanup_temp_files()
+    temp_file_index.start_janitor()
+
+    # Pick up edits to the pronunciation dictionary without a restart
+    pronunciation_store.start_watching()
+
+    # Fill the number verbalization caches off the event loop, the worker
+    # thread uses its own inflect engine so requests can run meanwhile
+    if settings.verbalization_cache_warmup:
+        asyncio.get_running_loop().run_in_executor(None, warm_verbalization_cache)
 
     logger.info("Loading TTS model and voice packs...")
 
@@ -105,8 +120,16 @@ async def lifespan(app: FastAPI):
     startup_msg += f"\n{boundary}\n"
     logger.info(startup_msg)
 
+    # Resume queued and interrupted long-document jobs
+    job_runner = get_job_runner()
+    await job_runner.start(get_tts_service)
+
     yield
 
+    await job_runner.stop()
+    await temp_file_index.stop_janitor()
+    await pronunciation_store.stop_watching()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -129,6 +152,7 @@ if settings.cors_enabled:
 
 # Include routers
 app.include_router(openai_router, prefix="/v1")
+app.include_router(websocket_router, prefix="/v1")  # Streaming text input
 app.include_router(dev_router)  # Development endpoints
 app.include_router(debug_router)  # Debug endpoints
 if settings.enable_web_player:
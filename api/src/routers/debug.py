@@ -211,6 +211,16 @@ async def get_session_pool_info():
 
 
 
+@router.get("/debug/phonemizer_pools")
+async def get_phonemizer_pool_info():
+    """Get usage and wait-time metrics of the phonemizer pools."""
+    from ..services.text_processing.phonemizer import phonemizer_pools
+
+    return {
+        language: pool.stats() for language, pool in list(phonemizer_pools.items())
+    }
+
+
 # @router.post("/debug/reinitialize")
 async def reinitialize_model():
     """Unload and reinitialize the Kokoro V1 model."""
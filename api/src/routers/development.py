@@ -13,7 +13,7 @@ from kokoro import KPipeline
 from loguru import logger
 
 from ..core.config import settings
-from ..inference.base import AudioChunk
+from ..inference.base import AudioChunk, WordTimestamps
 from ..services.audio import AudioNormalizer, AudioService
 from ..services.streaming_audio_writer import StreamingAudioWriter
 from ..services.temp_manager import TempFileWriter
@@ -24,10 +24,15 @@ from ..services.text_processing.pronunciation_dict import (
     delete_pronunciation,
 )
 
-from ..routers.debug import reinitialize_model
 from ..services.tts_service import TTSService
-from ..structures import CaptionedSpeechRequest, CaptionedSpeechResponse, WordTimestamp
-from ..structures.custom_responses import JSONStreamingResponse
+from ..structures import CaptionedSpeechRequest, WordTimestamp
+from ..structures.custom_responses import (
+    CAPTION_FRAMES_MEDIA_TYPE,
+    JSONStreamingResponse,
+    encode_audio_frame,
+    encode_timestamps_frame,
+    json_dumps,
+)
 from ..structures.text_schemas import (
     GenerateFromPhonemesRequest,
     PhonemeRequest,
@@ -177,7 +182,6 @@ async def add_pronunciation(entry: PronunciationUpdateRequest):
     """Add or update a word pronunciation in the runtime dictionary"""
     try:
         update_pronunciation(entry.word, entry.phonemes)
-        await reinitialize_model()
         return {"status": "ok"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -193,8 +197,6 @@ async def remove_pronunciation(word: str):
     """Delete a word pronunciation from the runtime dictionary"""
     try:
         delete_pronunciation(word)
-        await reinitialize_model()
-
         return {"status": "ok"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -224,6 +226,11 @@ async def create_captioned_speech(
         }.get(request.response_format, f"audio/{request.response_format}")
 
         writer = StreamingAudioWriter(request.response_format, sample_rate=24000)
+        # Binary frames carry the encoded audio as is, so there is no base64
+        use_frames = CAPTION_FRAMES_MEDIA_TYPE in client_request.headers.get(
+            "accept", ""
+        )
+
         # Check if streaming is requested (default for OpenAI client)
         if request.stream:
             # Create generator but don't start it yet
@@ -231,126 +238,77 @@ async def create_captioned_speech(
                 tts_service, request, client_request, writer
             )
 
+            headers = {
+                "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
+                "X-Accel-Buffering": "no",
+                "Cache-Control": "no-cache",
+                "Transfer-Encoding": "chunked",
+            }
+
             # If download link requested, wrap generator with temp file writer
+            temp_writer = None
             if request.return_download_link:
-                from ..services.temp_manager import TempFileWriter
-
                 temp_writer = TempFileWriter(request.response_format)
                 await temp_writer.__aenter__()  # Initialize temp file
 
                 # Get download path immediately after temp file creation
-                download_path = temp_writer.download_path
-
-                # Create response headers with download path
-                headers = {
-                    "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
-                    "X-Accel-Buffering": "no",
-                    "Cache-Control": "no-cache",
-                    "Transfer-Encoding": "chunked",
-                    "X-Download-Path": download_path,
-                }
-
-                # Create async generator for streaming
-                async def dual_output():
-                    try:
-                        # Write chunks to temp file and stream
-                        async for chunk_data in generator:
-                            # The timestamp acumulator is only used when word level time stamps are generated but no audio is returned.
-                            timestamp_acumulator = []
-
-                            if chunk_data.output:  # Skip empty chunks
-                                await temp_writer.write(chunk_data.output)
-                                base64_chunk = base64.b64encode(
-                                    chunk_data.output
-                                ).decode("utf-8")
-
-                                # Add any chunks that may be in the acumulator into the return word_timestamps
-                                if chunk_data.word_timestamps is not None:
-                                    chunk_data.word_timestamps = (
-                                        timestamp_acumulator + chunk_data.word_timestamps
-                                    )
-                                    timestamp_acumulator = []
-                                else:
-                                    chunk_data.word_timestamps = []
-
-                                yield CaptionedSpeechResponse(
-                                    audio=base64_chunk,
-                                    audio_format=content_type,
-                                    timestamps=chunk_data.word_timestamps,
-                                )
-                            else:
-                                if (
-                                    chunk_data.word_timestamps is not None
-                                    and len(chunk_data.word_timestamps) > 0
-                                ):
-                                    timestamp_acumulator += chunk_data.word_timestamps
-
-                        # Finalize the temp file
-                        await temp_writer.finalize()
-                    except Exception as e:
-                        logger.error(f"Error in dual output streaming: {e}")
-                        await temp_writer.__aexit__(type(e), e, e.__traceback__)
-                        raise
-                    finally:
-                        # Ensure temp writer is closed
-                        if not temp_writer._finalized:
-                            await temp_writer.__aexit__(None, None, None)
-                        writer.close()
-
-                # Stream with temp file writing
-                return JSONStreamingResponse(
-                    dual_output(), media_type="application/json", headers=headers
-                )
+                headers["X-Download-Path"] = temp_writer.download_path
 
-            async def single_output():
+            async def captioned_output():
                 try:
                     # The timestamp acumulator is only used when word level time stamps are generated but no audio is returned.
-                    timestamp_acumulator = []
+                    timestamp_acumulator = WordTimestamps()
 
                     # Stream chunks
                     async for chunk_data in generator:
                         if chunk_data.output:  # Skip empty chunks
-                            # Encode the chunk bytes into base 64
-                            base64_chunk = base64.b64encode(chunk_data.output).decode(
-                                "utf-8"
-                            )
+                            if temp_writer is not None:
+                                await temp_writer.write(chunk_data.output)
 
                             # Add any chunks that may be in the acumulator into the return word_timestamps
-                            if chunk_data.word_timestamps is not None:
-                                chunk_data.word_timestamps = (
-                                    timestamp_acumulator + chunk_data.word_timestamps
-                                )
-                            else:
-                                chunk_data.word_timestamps = []
-                            timestamp_acumulator = []
-
-                            yield CaptionedSpeechResponse(
-                                audio=base64_chunk,
-                                audio_format=content_type,
-                                timestamps=chunk_data.word_timestamps,
+                            timestamps = (
+                                timestamp_acumulator + chunk_data.word_timestamps
                             )
-                        else:
-                            if (
-                                chunk_data.word_timestamps is not None
-                                and len(chunk_data.word_timestamps) > 0
-                            ):
-                                timestamp_acumulator += chunk_data.word_timestamps
+                            timestamp_acumulator = WordTimestamps()
 
+                            if use_frames:
+                                yield encode_audio_frame(chunk_data.output)
+                                yield encode_timestamps_frame(timestamps)
+                            else:
+                                # Encode the chunk bytes into base 64. Plain dicts in the
+                                # CaptionedSpeechResponse shape skip pydantic per chunk.
+                                yield {
+                                    "audio": base64.b64encode(chunk_data.output).decode(
+                                        "utf-8"
+                                    ),
+                                    "audio_format": content_type,
+                                    "timestamps": timestamps.to_dicts(),
+                                }
+                        elif chunk_data.word_timestamps:
+                            timestamp_acumulator += chunk_data.word_timestamps
+
+                    # Finalize the temp file
+                    if temp_writer is not None:
+                        await temp_writer.finalize()
                 except Exception as e:
-                    logger.error(f"Error in single output streaming: {e}")
-                    writer.close()
+                    logger.error(f"Error in captioned output streaming: {e}")
+                    if temp_writer is not None:
+                        await temp_writer.__aexit__(type(e), e, e.__traceback__)
                     raise
+                finally:
+                    # Ensure temp writer is closed
+                    if temp_writer is not None and not temp_writer._finalized:
+                        await temp_writer.__aexit__(None, None, None)
+                    writer.close()
 
-            # Standard streaming without download link
+            if use_frames:
+                return StreamingResponse(
+                    captioned_output(),
+                    media_type=CAPTION_FRAMES_MEDIA_TYPE,
+                    headers=headers,
+                )
             return JSONStreamingResponse(
-                single_output(),
-                media_type="application/json",
-                headers={
-                    "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
-                    "X-Accel-Buffering": "no",
-                    "Cache-Control": "no-cache",
-                    "Transfer-Encoding": "chunked",
-                },
+                captioned_output(), media_type="application/json", headers=headers
             )
         else:
             # Generate complete audio using public interface
@@ -381,18 +339,31 @@ async def create_captioned_speech(
             )
             output = audio_data.output + final.output
 
+            if use_frames:
+                writer.close()
+                return Response(
+                    content=encode_audio_frame(output)
+                    + encode_timestamps_frame(audio_data.word_timestamps),
+                    media_type=CAPTION_FRAMES_MEDIA_TYPE,
+                    headers={
+                        "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
+                        "Cache-Control": "no-cache",  # Prevent caching
+                    },
+                )
+
             base64_output = base64.b64encode(output).decode("utf-8")
 
-            content = CaptionedSpeechResponse(
-                audio=base64_output,
-                audio_format=content_type,
-                timestamps=audio_data.word_timestamps,
-            ).model_dump()
+            timestamps = audio_data.word_timestamps
+            content = {
+                "audio": base64_output,
+                "audio_format": content_type,
+                "timestamps": timestamps.to_dicts() if timestamps is not None else None,
+            }
 
             writer.close()
 
-            return JSONResponse(
-                content=content,
+            return Response(
+                content=json_dumps(content),
                 media_type="application/json",
                 headers={
                     "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
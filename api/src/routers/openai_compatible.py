@@ -1,5 +1,6 @@
 """OpenAI-compatible router for text-to-speech"""
 
+import asyncio
 import io
 import json
 import os
@@ -11,7 +12,7 @@ from urllib import response
 import aiofiles
 import numpy as np
 import torch
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from fastapi.responses import FileResponse, StreamingResponse
 from loguru import logger
 
@@ -19,10 +20,23 @@ from pydantic import BaseModel, Field
 
 from ..core.config import settings
 from ..inference.base import AudioChunk
-from ..services.audio import AudioService
-from ..services.streaming_audio_writer import StreamingAudioWriter
+from ..services.batch_synthesis import (
+    ResolvedVoices,
+    archive_results,
+    ndjson_results,
+    synthesize_batch,
+)
+from ..services.jobs import get_job_runner, job_progress
+from ..services.stream_buffer import get_stream_buffer
+from ..services.streaming_audio_writer import BackgroundEncoder, StreamingAudioWriter
 from ..services.tts_service import TTSService
-from ..structures import OpenAISpeechRequest
+from ..structures import (
+    BatchSpeechRequest,
+    OpenAISpeechRequest,
+    SpeechJobRequest,
+    TTSStatus,
+)
+from ..structures.custom_responses import HashedFileResponse, etag_matches
 from ..structures.schemas import CaptionedSpeechRequest, NormalizationOptions
 
 
@@ -58,8 +72,13 @@ class SpeechConfig(BaseModel):
 
     model: str = "kokoro"
     voice: str = "af_heart"
-    response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] = "mp3"
-    download_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] | None = "mp3"
+    response_format: Literal[
+        "mp3", "opus", "aac", "flac", "wav", "pcm", "ulaw", "alaw"
+    ] = "mp3"
+    download_format: Literal[
+        "mp3", "opus", "aac", "flac", "wav", "pcm", "ulaw", "alaw"
+    ] | None = "mp3"
+    sample_rate: Literal[8000, 16000, 24000, 48000] | None = None
     speed: float = 1.0
     stream: bool = True
     return_download_link: bool = False
@@ -74,8 +93,13 @@ class SpeechBaseUpdate(BaseModel):
 
 
 class SpeechAdvancedUpdate(BaseModel):
-    response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] | None = None
-    download_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] | None = None
+    response_format: Literal[
+        "mp3", "opus", "aac", "flac", "wav", "pcm", "ulaw", "alaw"
+    ] | None = None
+    download_format: Literal[
+        "mp3", "opus", "aac", "flac", "wav", "pcm", "ulaw", "alaw"
+    ] | None = None
+    sample_rate: Literal[8000, 16000, 24000, 48000] | None = None
     stream: bool | None = None
     return_download_link: bool | None = None
     lang_code: str | None = None
@@ -186,8 +210,13 @@ async def stream_audio_chunks(
     request: Union[OpenAISpeechRequest, CaptionedSpeechRequest],
     client_request: Request,
     writer: StreamingAudioWriter,
+    stop_on_disconnect: bool = True,
 ) -> AsyncGenerator[AudioChunk, None]:
-    """Stream audio chunks as they're generated with client disconnect handling"""
+    """Stream audio chunks as they're generated with client disconnect handling
+
+    Buffered streams pass stop_on_disconnect=False, so generation continues
+    for a client that reconnects.
+    """
     voice_name = await process_and_validate_voices(request.voice, tts_service)
     unique_properties = {"return_timestamps": False}
     if hasattr(request, "return_timestamps"):
@@ -205,12 +234,13 @@ async def stream_audio_chunks(
             return_timestamps=unique_properties["return_timestamps"],
         ):
             # Check if client is still connected
-            is_disconnected = client_request.is_disconnected
-            if callable(is_disconnected):
-                is_disconnected = await is_disconnected()
-            if is_disconnected:
-                logger.info("Client disconnected, stopping audio generation")
-                break
+            if stop_on_disconnect:
+                is_disconnected = client_request.is_disconnected
+                if callable(is_disconnected):
+                    is_disconnected = await is_disconnected()
+                if is_disconnected:
+                    logger.info("Client disconnected, stopping audio generation")
+                    break
 
             yield chunk_data
     except Exception as e:
@@ -219,6 +249,27 @@ async def stream_audio_chunks(
         raise
 
 
+def buffered_response(
+    content: AsyncGenerator[bytes, None], media_type: str, headers: Dict[str, str]
+) -> StreamingResponse:
+    """Stream content through the resume buffer when it is enabled.
+
+    The response carries an X-Stream-Id header, which a client that loses the
+    connection can pass to GET /v1/audio/speech/streams/{stream_id} with the
+    number of bytes it received to get the rest without re-synthesis.
+    """
+    if not settings.stream_resume_enabled:
+        return StreamingResponse(content, media_type=media_type, headers=headers)
+
+    stream = get_stream_buffer().create(media_type)
+    stream.start(content)
+    return StreamingResponse(
+        stream.read(),
+        media_type=media_type,
+        headers={**headers, "X-Stream-Id": stream.stream_id},
+    )
+
+
 @router.post("/audio/speech")
 async def create_speech(
     request: OpenAISpeechRequest,
@@ -260,20 +311,32 @@ async def create_speech(
             "flac": "audio/flac",
             "wav": "audio/wav",
             "pcm": "audio/pcm",
+            "ulaw": "audio/basic",
+            "alaw": "audio/x-alaw-basic",
         }.get(request.response_format, f"audio/{request.response_format}")
 
-        writer = StreamingAudioWriter(request.response_format, sample_rate=24000)
+        writer = StreamingAudioWriter(
+            request.response_format,
+            sample_rate=24000,
+            output_sample_rate=request.sample_rate,
+            low_latency=request.low_latency,
+            frame_duration_ms=request.frame_duration_ms,
+        )
 
         # Check if streaming is requested (default for OpenAI client)
         if request.stream:
             # Create generator but don't start it yet
             generator = stream_audio_chunks(
-                tts_service, request, client_request, writer
+                tts_service,
+                request,
+                client_request,
+                writer,
+                stop_on_disconnect=not settings.stream_resume_enabled,
             )
 
             # If download link requested, wrap generator with temp file writer
             if request.return_download_link:
-                from ..services.temp_manager import TempFileWriter
+                from ..services.temp_manager import DownloadEncoder, TempFileWriter
 
                 # Use download_format if specified, otherwise use response_format
                 output_format = request.download_format or request.response_format
@@ -285,7 +348,7 @@ async def create_speech(
 
                 # Create response headers with download path
                 headers = {
-                    "Content-Disposition": f"attachment; filename=speech.{output_format}",
+                    "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
                     "X-Accel-Buffering": "no",
                     "Cache-Control": "no-cache",
                     "Transfer-Encoding": "chunked",
@@ -298,32 +361,46 @@ async def create_speech(
 
                 # Create async generator for streaming
                 async def dual_output():
+                    # A different download format is encoded from the same
+                    # audio alongside the stream
+                    download_encoder = None
+                    if output_format != request.response_format:
+                        download_encoder = DownloadEncoder(
+                            temp_writer, output_format, request.sample_rate
+                        )
                     try:
                         # Write chunks to temp file and stream
                         async for chunk_data in generator:
+                            if download_encoder is not None:
+                                await download_encoder.submit(chunk_data.audio)
                             if chunk_data.output:  # Skip empty chunks
-                                await temp_writer.write(chunk_data.output)
-                                # if return_json:
-                                #    yield chunk, chunk_data
-                                # else:
+                                if download_encoder is None:
+                                    await temp_writer.write(chunk_data.output)
                                 yield chunk_data.output
 
                         # Finalize the temp file
-                        await temp_writer.finalize()
+                        if download_encoder is not None:
+                            await download_encoder.finalize()
+                            download_encoder = None
+                        else:
+                            await temp_writer.finalize()
                     except Exception as e:
                         logger.error(f"Error in dual output streaming: {e}")
+                        if download_encoder is not None:
+                            await download_encoder.close()
+                            download_encoder = None
                         await temp_writer.__aexit__(type(e), e, e.__traceback__)
                         raise
                     finally:
                         # Ensure temp writer is closed
+                        if download_encoder is not None:
+                            await download_encoder.close()
                         if not temp_writer._finalized:
                             await temp_writer.__aexit__(None, None, None)
                         writer.close()
 
                 # Stream with temp file writing
-                return StreamingResponse(
-                    dual_output(), media_type=content_type, headers=headers
-                )
+                return buffered_response(dual_output(), content_type, headers)
 
             async def single_output():
                 try:
@@ -337,10 +414,10 @@ async def create_speech(
                     raise
 
             # Standard streaming without download link
-            return StreamingResponse(
+            return buffered_response(
                 single_output(),
-                media_type=content_type,
-                headers={
+                content_type,
+                {
                     "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
                     "X-Accel-Buffering": "no",
                     "Cache-Control": "no-cache",
@@ -353,61 +430,69 @@ async def create_speech(
                 "Cache-Control": "no-cache",  # Prevent caching
             }
 
-            # Generate complete audio using public interface
-            audio_data = await tts_service.generate_audio(
-                text=request.input,
-                voice=voice_name,
-                writer=writer,
-                speed=request.speed,
-                normalization_options=request.normalization_options,
-                lang_code=request.lang_code,
-            )
-
-            audio_data = await AudioService.convert_audio(
-                audio_data,
-                request.response_format,
-                writer,
-                is_last_chunk=False,
-                trim_audio=False,
-            )
-
-            # Convert to requested format with proper finalization
-            final = await AudioService.convert_audio(
-                AudioChunk(np.array([], dtype=np.int16)),
-                request.response_format,
-                writer,
-                is_last_chunk=True,
-            )
-            output = audio_data.output + final.output
-
-            if request.return_download_link:
-                from ..services.temp_manager import TempFileWriter
-
-                # Use download_format if specified, otherwise use response_format
-                output_format = request.download_format or request.response_format
-                temp_writer = TempFileWriter(output_format)
-                await temp_writer.__aenter__()  # Initialize temp file
-
-                # Get download path immediately after temp file creation
-                download_path = temp_writer.download_path
-                headers["X-Download-Path"] = download_path
-
-                try:
-                    # Write chunks to temp file
+            # Encode chunks on a worker thread while later chunks are
+            # synthesized, keeping only the encoded bytes
+            encoded: List[bytes] = []
+
+            async def collect(data: bytes) -> None:
+                encoded.append(data)
+
+            encoder = BackgroundEncoder(writer, collect)
+            temp_writer = None
+            download_encoder = None
+            try:
+                if request.return_download_link:
+                    from ..services.temp_manager import DownloadEncoder, TempFileWriter
+
+                    # Use download_format if specified, otherwise use response_format
+                    output_format = request.download_format or request.response_format
+                    temp_writer = TempFileWriter(output_format)
+                    await temp_writer.__aenter__()  # Initialize temp file
+
+                    # Get download path immediately after temp file creation
+                    headers["X-Download-Path"] = temp_writer.download_path
+
+                    if output_format != request.response_format:
+                        # Encode the download from the same audio as it is generated
+                        download_encoder = DownloadEncoder(
+                            temp_writer, output_format, request.sample_rate
+                        )
+
+                async for chunk_data in tts_service.generate_audio_stream(
+                    text=request.input,
+                    voice=voice_name,
+                    writer=writer,
+                    speed=request.speed,
+                    output_format=None,
+                    normalization_options=request.normalization_options,
+                    lang_code=request.lang_code,
+                ):
+                    await encoder.submit(chunk_data.audio)
+                    if download_encoder is not None:
+                        await download_encoder.submit(chunk_data.audio)
+
+                await encoder.finish()
+                output = b"".join(encoded)
+
+                if download_encoder is not None:
+                    await download_encoder.finalize()
+                elif temp_writer is not None:
                     logger.info("Writing chunks to tempory file for download")
                     await temp_writer.write(output)
-                    # Finalize the temp file
                     await temp_writer.finalize()
 
-                except Exception as e:
-                    logger.error(f"Error in dual output: {e}")
+            except Exception as e:
+                logger.error(f"Error in non-streaming output: {e}")
+                await encoder.close()
+                if download_encoder is not None:
+                    await download_encoder.close()
+                if temp_writer is not None:
                     await temp_writer.__aexit__(type(e), e, e.__traceback__)
-                    raise
-                finally:
-                    # Ensure temp writer is closed
-                    if not temp_writer._finalized:
-                        await temp_writer.__aexit__(None, None, None)
-                    writer.close()
+                raise
+            finally:
+                # Ensure temp writer is closed
+                if temp_writer is not None and not temp_writer._finalized:
+                    await temp_writer.__aexit__(None, None, None)
 
             return Response(
                 content=output,
@@ -468,28 +553,244 @@ async def create_speech(
         )
 
 
-@router.get("/download/{filename}")
-async def download_audio_file(filename: str):
-    """Download a generated audio file from temp storage"""
+@router.get("/audio/speech/streams/{stream_id}")
+async def resume_speech_stream(stream_id: str, offset: int = Query(0, ge=0)):
+    """Resume a dropped speech stream from a byte offset.
+
+    Sends buffered audio after offset immediately, then any chunks still
+    being generated.
+    """
+    stream = get_stream_buffer().get(stream_id)
+    if stream is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "stream_not_found",
+                "message": f"Stream {stream_id} has expired or does not exist",
+                "type": "invalid_request_error",
+            },
+        )
+    if stream.finished and offset > stream.size:
+        raise HTTPException(
+            status_code=416,
+            detail={
+                "error": "invalid_offset",
+                "message": f"Offset {offset} is past the end of the stream ({stream.size} bytes)",
+                "type": "invalid_request_error",
+            },
+        )
+    return StreamingResponse(
+        stream.read(offset),
+        media_type=stream.media_type,
+        headers={
+            "X-Accel-Buffering": "no",
+            "Cache-Control": "no-cache",
+            "X-Stream-Id": stream_id,
+            "X-Stream-Offset": str(offset),
+        },
+    )
+
+
+@router.post("/audio/speech/batch")
+async def create_speech_batch(request: BatchSpeechRequest):
+    """Synthesize many prompts in one request.
+
+    Each distinct voice is resolved once and items are scheduled together
+    rather than paying per-request overhead. Results stream back as items
+    complete, as NDJSON or as a zip/tar archive.
+    """
+    if request.model not in _openai_mappings["models"]:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "invalid_model",
+                "message": f"Unsupported model: {request.model}",
+                "type": "invalid_request_error",
+            },
+        )
+    if len(request.items) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "validation_error",
+                "message": f"Batch has {len(request.items)} items, the limit is {settings.batch_max_items}",
+                "type": "invalid_request_error",
+            },
+        )
+
+    tts_service = await get_tts_service()
+
+    # Resolve each voice once; items with a bad voice fail individually
+    voices: ResolvedVoices = {}
+    for voice in {item.voice for item in request.items}:
+        try:
+            voice_name = await process_and_validate_voices(voice, tts_service)
+            voices[voice] = await tts_service._get_voices_path(voice_name)
+        except (ValueError, RuntimeError) as e:
+            voices[voice] = e
+
+    results = synthesize_batch(
+        tts_service, request.items, voices, settings.batch_concurrency
+    )
+    if request.output == "ndjson":
+        return StreamingResponse(
+            ndjson_results(results),
+            media_type="application/x-ndjson",
+            headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"},
+        )
+    return StreamingResponse(
+        archive_results(results, request.output),
+        media_type="application/zip" if request.output == "zip" else "application/x-tar",
+        headers={
+            "Content-Disposition": f"attachment; filename=speech_batch.{request.output}",
+            "X-Accel-Buffering": "no",
+            "Cache-Control": "no-cache",
+        },
+    )
+
+
+@router.post("/audio/jobs", status_code=202)
+async def create_speech_job(request: SpeechJobRequest):
+    """Queue a long document to render in the background.
+
+    The job renders when no interactive requests are in progress and survives
+    restarts. Poll GET /v1/audio/jobs/{id} for progress and fetch the audio
+    from /v1/audio/jobs/{id}/audio once it is completed.
+    """
+    if request.model not in _openai_mappings["models"]:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "invalid_model",
+                "message": f"Unsupported model: {request.model}",
+                "type": "invalid_request_error",
+            },
+        )
+
+    tts_service = await get_tts_service()
     try:
-        from ..core.paths import _find_file, get_content_type
+        voice_name = await process_and_validate_voices(request.voice, tts_service)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "validation_error",
+                "message": str(e),
+                "type": "invalid_request_error",
+            },
+        )
+
+    runner = get_job_runner()
+    job_id = await asyncio.to_thread(runner.store.create, request, voice_name)
+    runner.notify()
+    return job_progress(await asyncio.to_thread(runner.store.get, job_id))
+
 
-        # Search for file in temp directory
-        file_path = await _find_file(
-            filename=filename, search_paths=[settings.temp_file_dir]
+async def get_job_or_404(job_id: str) -> dict:
+    job = await asyncio.to_thread(get_job_runner().store.get, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "not_found",
+                "message": f"Speech job {job_id} not found",
+                "type": "invalid_request_error",
+            },
         )
+    return job
 
+
+@router.get("/audio/jobs/{job_id}")
+async def get_speech_job(job_id: str):
+    """Report a job's status, chunk progress and estimated time remaining"""
+    return job_progress(await get_job_or_404(job_id))
+
+
+@router.get("/audio/jobs/{job_id}/audio")
+async def download_speech_job(job_id: str):
+    """Download the finished audio of a completed job"""
+    job = await get_job_or_404(job_id)
+    if job["status"] != TTSStatus.COMPLETED.value:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error": "job_not_completed",
+                "message": f"Speech job {job_id} is {job['status']}",
+                "type": "invalid_request_error",
+            },
+        )
+    response_format = SpeechJobRequest.model_validate_json(
+        job["request"]
+    ).response_format
+    filename = f"speech_{job_id}.{response_format}"
+    return FileResponse(
+        get_job_runner().store.audio_path(job_id, response_format),
+        media_type={
+            "mp3": "audio/mpeg",
+            "opus": "audio/opus",
+            "aac": "audio/aac",
+            "flac": "audio/flac",
+            "wav": "audio/wav",
+            "pcm": "audio/pcm",
+        }.get(response_format, f"audio/{response_format}"),
+        filename=filename,
+    )
+
+
+@router.delete("/audio/jobs/{job_id}")
+async def delete_speech_job(job_id: str):
+    """Cancel a job if it is still rendering and remove its files"""
+    await get_job_or_404(job_id)
+    await get_job_runner().delete(job_id)
+    return {"id": job_id, "status": TTSStatus.DELETED.value}
+
+
+@router.get("/download/{filename}")
+async def download_audio_file(filename: str, client_request: Request):
+    """Download a generated audio file from temp storage.
+
+    Files are looked up in the temp file index. Responses carry a content
+    hash ETag, answer If-None-Match with 304 and serve byte ranges, so
+    players can seek and replay without downloading the file again.
+    """
+    from ..core.paths import get_content_type
+    from ..services.temp_manager import temp_file_index
+
+    entry = await temp_file_index.lookup(filename)
+    if entry is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "not_found",
+                "message": f"File not found: {filename}",
+                "type": "invalid_request_error",
+            },
+        )
+
+    try:
         # Get content type from path helper
-        content_type = await get_content_type(file_path)
+        content_type = await get_content_type(entry.path)
 
-        return FileResponse(
-            file_path,
+        # Files still being written change, so they are never cached
+        if entry.etag is None:
+            return FileResponse(
+                entry.path,
+                media_type=content_type,
+                filename=filename,
+                headers={"Cache-Control": "no-store"},
+            )
+
+        headers = {"Cache-Control": "no-cache"}
+        if etag_matches(client_request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers={**headers, "ETag": entry.etag})
+
+        return HashedFileResponse(
+            entry.path,
+            etag=entry.etag,
+            stat_result=entry.stat,
             media_type=content_type,
             filename=filename,
-            headers={
-                "Cache-Control": "no-cache",
-                "Content-Disposition": f"attachment; filename={filename}",
-            },
+            headers=headers,
         )
 
     except Exception as e:
@@ -0,0 +1,377 @@
+"""WebSocket router for synthesizing text as it is streamed in"""
+
+import asyncio
+import struct
+from typing import AsyncGenerator, Dict, Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from loguru import logger
+from pydantic import ValidationError
+
+from ..services.audio import AudioNormalizer
+from ..services.streaming_audio_writer import StreamingAudioWriter
+from ..services.text_processing.text_processor import TextStreamBuffer
+from ..services.tts_service import TTSService
+from ..structures import StreamingSpeechConfig
+from ..structures.custom_responses import json_dumps
+from . import openai_compatible
+
+router = APIRouter(tags=["Streaming TTS"])
+
+# Config fields that fall back to the global speech config when not sent
+SHARED_DEFAULTS = ("model", "voice", "speed", "lang_code", "normalization_options")
+
+
+def parse_config(message: dict) -> StreamingSpeechConfig:
+    """Build a session config, filling unset fields from the speech config"""
+    fields = {k: v for k, v in message.items() if k != "type"}
+    defaults = openai_compatible.speech_config.model_dump()
+    for key in SHARED_DEFAULTS:
+        if key not in fields and defaults.get(key) is not None:
+            fields[key] = defaults[key]
+    config = StreamingSpeechConfig(**fields)
+    if config.model not in openai_compatible._openai_mappings["models"]:
+        raise ValueError(f"Unsupported model: {config.model}")
+    return config
+
+
+async def synthesize_segments(
+    websocket: WebSocket,
+    tts_service: TTSService,
+    voice_name: str,
+    config: StreamingSpeechConfig,
+    segments: "asyncio.Queue[Optional[str]]",
+) -> None:
+    """Synthesize queued text segments into one audio stream on the socket.
+
+    Stops once None is taken from the queue and the stream is finalized.
+    """
+    writer = StreamingAudioWriter(
+        config.response_format,
+        sample_rate=24000,
+        output_sample_rate=config.sample_rate,
+        low_latency=config.low_latency,
+        frame_duration_ms=config.frame_duration_ms,
+    )
+
+    async def texts() -> AsyncGenerator[str, None]:
+        while (segment := await segments.get()) is not None:
+            yield segment
+
+    try:
+        async for chunk_data in tts_service.generate_audio_stream(
+            text=texts(),
+            voice=voice_name,
+            writer=writer,
+            speed=config.speed,
+            output_format=config.response_format,
+            lang_code=config.lang_code,
+            normalization_options=config.normalization_options,
+            return_timestamps=config.return_timestamps,
+        ):
+            if chunk_data.output:
+                await websocket.send_bytes(chunk_data.output)
+            if config.return_timestamps and chunk_data.word_timestamps:
+                await websocket.send_text(
+                    json_dumps(
+                        {
+                            "type": "timestamps",
+                            "timestamps": chunk_data.word_timestamps.to_dicts(),
+                        }
+                    ).decode("utf-8")
+                )
+    finally:
+        writer.close()
+
+
+@router.websocket("/audio/speech/stream")
+async def stream_speech(websocket: WebSocket):
+    """Synthesize text sent as deltas, streaming audio back as it is ready.
+
+    Client messages (JSON):
+        {"type": "config", ...}: Optional StreamingSpeechConfig, before any text
+        {"type": "text", "text": "..."}: Text delta, e.g. an LLM token
+        {"type": "flush"}: Synthesize buffered text without waiting for a boundary
+        {"type": "close"}: Flush, finish the audio stream and close
+
+    Server messages:
+        Binary frames of encoded audio
+        {"type": "timestamps", "timestamps": [...]}: If return_timestamps is set
+        {"type": "error", "message": "..."}: Sent before closing on errors
+        {"type": "done"}: All audio has been sent after a close message
+    """
+    await websocket.accept()
+
+    config: Optional[StreamingSpeechConfig] = None
+    buffer: Optional[TextStreamBuffer] = None
+    segments: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    synthesis: Optional[asyncio.Task] = None
+
+    try:
+        while True:
+            message = await websocket.receive_json()
+            message_type = message.get("type")
+
+            if message_type == "config":
+                if synthesis is not None:
+                    raise ValueError("Config must be sent before any text")
+                config = parse_config(message)
+                continue
+
+            if synthesis is None:
+                config = config or parse_config({})
+                tts_service = await openai_compatible.get_tts_service()
+                voice_name = await openai_compatible.process_and_validate_voices(
+                    config.voice, tts_service
+                )
+                buffer = TextStreamBuffer(config.lang_code or voice_name[:1].lower())
+                synthesis = asyncio.create_task(
+                    synthesize_segments(
+                        websocket, tts_service, voice_name, config, segments
+                    )
+                )
+
+            if message_type == "text":
+                segment = await buffer.push(str(message.get("text", "")))
+            elif message_type in ("flush", "close"):
+                segment = buffer.flush()
+            else:
+                raise ValueError(f"Unknown message type: {message_type}")
+
+            if segment:
+                segments.put_nowait(segment)
+
+            if message_type == "close":
+                segments.put_nowait(None)
+                await synthesis
+                await websocket.send_json({"type": "done"})
+                await websocket.close()
+                return
+
+            # Surface synthesis failures instead of silently buffering
+            if synthesis.done():
+                synthesis.result()
+
+    except WebSocketDisconnect:
+        logger.info("Streaming speech client disconnected")
+    except (ValueError, ValidationError) as e:
+        logger.warning(f"Invalid streaming speech message: {e}")
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1008)
+    except Exception as e:
+        logger.error(f"Error in streaming speech: {e}")
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1011)
+    finally:
+        if synthesis is not None and not synthesis.done():
+            synthesis.cancel()
+
+
+class SpeechSession:
+    """Voice, format and pipeline state shared by the utterances of a session"""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        tts_service: TTSService,
+        config: StreamingSpeechConfig,
+        voice_name: str,
+        voice_path: str,
+    ):
+        self.websocket = websocket
+        self.tts_service = tts_service
+        self.config = config
+        self.voice_name = voice_name
+        self.voice_path = voice_path
+        self.lang_code = config.lang_code or voice_name[:1].lower()
+        self.normalizer = AudioNormalizer()
+        self.utterances: Dict[str, asyncio.Task] = {}
+        self.closed = False
+        # Utterance tasks share the socket, so sends must not interleave
+        self._send_lock = asyncio.Lock()
+
+    @classmethod
+    async def open(
+        cls, websocket: WebSocket, config: StreamingSpeechConfig
+    ) -> "SpeechSession":
+        """Validate and resolve the session voice once"""
+        tts_service = await openai_compatible.get_tts_service()
+        voice_name = await openai_compatible.process_and_validate_voices(
+            config.voice, tts_service
+        )
+        try:
+            voice_name, voice_path = await tts_service._get_voices_path(voice_name)
+        except RuntimeError as e:
+            raise ValueError(str(e)) from e
+        return cls(websocket, tts_service, config, voice_name, voice_path)
+
+    async def send_audio(self, utterance_id: str, audio: bytes) -> None:
+        """Send audio as a binary frame prefixed with its utterance id"""
+        tag = utterance_id.encode()
+        async with self._send_lock:
+            if not self.closed:
+                await self.websocket.send_bytes(
+                    struct.pack(">H", len(tag)) + tag + audio
+                )
+
+    async def send_json(self, message: dict) -> None:
+        async with self._send_lock:
+            if not self.closed:
+                await self.websocket.send_text(json_dumps(message).decode("utf-8"))
+
+    def start(self, utterance_id: str, text: str) -> None:
+        """Start synthesizing an utterance alongside any in progress"""
+        task = asyncio.create_task(self.synthesize(utterance_id, text))
+        self.utterances[utterance_id] = task
+        task.add_done_callback(lambda _: self._forget(utterance_id, task))
+
+    def _forget(self, utterance_id: str, task: asyncio.Task) -> None:
+        if self.utterances.get(utterance_id) is task:
+            del self.utterances[utterance_id]
+
+    def cancel(self, utterance_id: str) -> bool:
+        """Cancel an utterance, returning whether it was still in progress"""
+        task = self.utterances.get(utterance_id)
+        if task is None:
+            return False
+        return task.cancel()
+
+    async def synthesize(self, utterance_id: str, text: str) -> None:
+        """Stream one utterance, reporting its outcome by id"""
+        writer = StreamingAudioWriter(
+            self.config.response_format,
+            sample_rate=24000,
+            output_sample_rate=self.config.sample_rate,
+            low_latency=self.config.low_latency,
+            frame_duration_ms=self.config.frame_duration_ms,
+        )
+        try:
+            async for chunk_data in self.tts_service.generate_audio_stream(
+                text=text,
+                voice=self.voice_name,
+                writer=writer,
+                speed=self.config.speed,
+                output_format=self.config.response_format,
+                lang_code=self.lang_code,
+                normalization_options=self.config.normalization_options,
+                return_timestamps=self.config.return_timestamps,
+                voice_path=self.voice_path,
+                normalizer=self.normalizer,
+            ):
+                if chunk_data.output:
+                    await self.send_audio(utterance_id, chunk_data.output)
+                if self.config.return_timestamps and chunk_data.word_timestamps:
+                    await self.send_json(
+                        {
+                            "type": "timestamps",
+                            "id": utterance_id,
+                            "timestamps": chunk_data.word_timestamps.to_dicts(),
+                        }
+                    )
+            await self.send_json({"type": "utterance_done", "id": utterance_id})
+        except asyncio.CancelledError:
+            await self.send_json({"type": "cancelled", "id": utterance_id})
+            raise
+        except Exception as e:
+            logger.error(f"Error synthesizing utterance '{utterance_id}': {e}")
+            await self.send_json(
+                {"type": "error", "id": utterance_id, "message": str(e)}
+            )
+        finally:
+            writer.close()
+
+    async def wait(self) -> None:
+        """Wait for all utterances in progress to finish"""
+        await asyncio.gather(*self.utterances.values(), return_exceptions=True)
+
+    def cancel_all(self) -> None:
+        """Stop all utterances without sending anything further"""
+        self.closed = True
+        for task in list(self.utterances.values()):
+            task.cancel()
+
+
+@router.websocket("/audio/speech/session")
+async def speech_session(websocket: WebSocket):
+    """Synthesize many utterances over one session with a fixed voice and format.
+
+    The voice is validated and resolved once, so each utterance only pays for
+    synthesis. Utterances run concurrently and their audio is interleaved.
+
+    Client messages (JSON):
+        {"type": "config", ...}: Optional StreamingSpeechConfig, before any utterance
+        {"type": "utterance", "id": "...", "text": "..."}: Synthesize text
+        {"type": "cancel", "id": "..."}: Stop an utterance in progress
+        {"type": "close"}: Finish utterances in progress and close
+
+    Server messages:
+        Binary frames: 2 byte big-endian id length, utf-8 utterance id, audio
+        {"type": "ready", "voice": "..."}: Session opened with the resolved voice
+        {"type": "timestamps", "id": "...", "timestamps": [...]}: If enabled
+        {"type": "utterance_done", "id": "..."}: All audio for an utterance sent
+        {"type": "cancelled", "id": "..."}: Utterance stopped by a cancel message
+        {"type": "error", "message": "...", "id": "..."}: id is set for utterance
+            errors, which leave the session open
+        {"type": "done"}: Sent after a close message once all audio is sent
+    """
+    await websocket.accept()
+
+    config: Optional[StreamingSpeechConfig] = None
+    session: Optional[SpeechSession] = None
+
+    try:
+        while True:
+            message = await websocket.receive_json()
+            message_type = message.get("type")
+
+            if message_type == "config":
+                if session is not None:
+                    raise ValueError("Config must be sent before any utterance")
+                config = parse_config(message)
+                continue
+
+            if session is None:
+                session = await SpeechSession.open(
+                    websocket, config or parse_config({})
+                )
+                await session.send_json({"type": "ready", "voice": session.voice_name})
+
+            if message_type == "utterance":
+                utterance_id = str(message.get("id", ""))
+                if not utterance_id or utterance_id in session.utterances:
+                    await session.send_json(
+                        {
+                            "type": "error",
+                            "id": utterance_id,
+                            "message": "Utterance id must be set and not in progress",
+                        }
+                    )
+                else:
+                    session.start(utterance_id, str(message.get("text", "")))
+            elif message_type == "cancel":
+                session.cancel(str(message.get("id", "")))
+            elif message_type == "close":
+                await session.wait()
+                await session.send_json({"type": "done"})
+                await websocket.close()
+                return
+            else:
+                raise ValueError(f"Unknown message type: {message_type}")
+
+    except WebSocketDisconnect:
+        logger.info("Speech session client disconnected")
+    except (ValueError, ValidationError) as e:
+        logger.warning(f"Invalid speech session message: {e}")
+        if session is not None:
+            session.cancel_all()
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1008)
+    except Exception as e:
+        logger.error(f"Error in speech session: {e}")
+        if session is not None:
+            session.cancel_all()
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1011)
+    finally:
+        if session is not None:
+            session.cancel_all()
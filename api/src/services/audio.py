@@ -4,7 +4,7 @@ import math
 import struct
 import time
 from io import BytesIO
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 import scipy.io.wavfile as wavfile
@@ -112,11 +112,72 @@ class AudioNormalizer:
         return audio_data
 
 
+class ChunkCrossfader:
+    """Joins the chunks of a single stream with an equal-power crossfade
+
+    The end of each chunk is held back and mixed with the start of the next,
+    so joins do not click even when chunks are trimmed tightly. Each join
+    shortens the stream by the overlap.
+    """
+
+    def __init__(self, overlap_ms: float = None, sample_rate: int = 24000):
+        """Initialize crossfader
+
+        Args:
+            overlap_ms: Overlap between chunks, defaults to settings.crossfade_ms
+            sample_rate: Sample rate of the audio
+        """
+        if overlap_ms is None:
+            overlap_ms = settings.crossfade_ms
+        self.overlap = int(overlap_ms * sample_rate / 1000)
+        self._tail = np.array([], dtype=np.int16)
+
+    @staticmethod
+    def _fades(length: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Gains sum to constant power across the overlap
+        phase = (np.arange(length, dtype=np.float32) + 0.5) * (np.pi / (2 * length))
+        return np.cos(phase), np.sin(phase)
+
+    def process(self, audio: np.ndarray, is_last_chunk: bool = False) -> np.ndarray:
+        """Mix the held tail into a chunk and hold back the chunk's own tail
+
+        Args:
+            audio: Trimmed int16 audio of the next chunk
+            is_last_chunk: Whether to release the tail instead of holding it
+
+        Returns:
+            Audio ready to be written
+        """
+        overlap = min(len(self._tail), len(audio))
+        if overlap:
+            fade_out, fade_in = self._fades(overlap)
+            mixed = self._tail[-overlap:] * fade_out + audio[:overlap] * fade_in
+            audio = np.concatenate(
+                [
+                    self._tail[:-overlap],
+                    np.clip(np.rint(mixed), -32768, 32767).astype(np.int16),
+                    audio[overlap:],
+                ]
+            )
+        elif len(self._tail):
+            audio = self._tail
+
+        if is_last_chunk or not self.overlap:
+            self._tail = np.array([], dtype=np.int16)
+            return audio
+        self._tail = audio[-self.overlap :]
+        return audio[: -self.overlap]
+
+    def flush(self) -> np.ndarray:
+        """Release the held tail, e.g. before a pause"""
+        return self.process(np.array([], dtype=np.int16), is_last_chunk=True)
+
+
 class AudioService:
     """Service for audio format conversions with streaming support"""
 
     # Supported formats
-    SUPPORTED_FORMATS = {"wav", "mp3", "opus", "flac", "aac", "pcm"}
+    SUPPORTED_FORMATS = {"wav", "mp3", "opus", "flac", "aac", "pcm", "ulaw", "alaw"}
 
     # Default audio format settings balanced for speed and compression
     DEFAULT_SETTINGS = {
@@ -145,6 +206,7 @@ class AudioService:
         is_last_chunk: bool = False,
         trim_audio: bool = True,
         normalizer: AudioNormalizer = None,
+        crossfader: Optional[ChunkCrossfader] = None,
     ) -> AudioChunk:
         """Convert audio data to specified format with streaming support
 
@@ -157,6 +219,7 @@ class AudioService:
             is_last_chunk: Whether this is the last chunk
             trim_audio: Whether audio should be trimmed
             normalizer: Optional AudioNormalizer instance for consistent normalization
+            crossfader: Optional ChunkCrossfader of the stream, applied after trimming
 
         Returns:
             Bytes of the converted audio chunk
@@ -175,16 +238,17 @@ class AudioService:
 
             if trim_audio == True:
                 audio_chunk = AudioService.trim_audio(
-                    audio_chunk, chunk_text, speed, is_last_chunk, normalizer
+                    audio_chunk, chunk_text, speed, is_last_chunk, normalizer, crossfader
                 )
 
             # Write audio data first
+            chunk_data = b""
             if len(audio_chunk.audio) > 0:
                 chunk_data = writer.write_chunk(audio_chunk.audio)
 
             # Then finalize if this is the last chunk
             if is_last_chunk:
-                final_data = writer.write_chunk(finalize=True)
+                final_data = chunk_data + writer.write_chunk(finalize=True)
 
                 if final_data:
                     audio_chunk.output = final_data
@@ -207,6 +271,7 @@ class AudioService:
         speed: float = 1,
         is_last_chunk: bool = False,
         normalizer: AudioNormalizer = None,
+        crossfader: Optional[ChunkCrossfader] = None,
     ) -> AudioChunk:
         """Trim silence from start and end
 
@@ -216,6 +281,7 @@ class AudioService:
             speed: The speaking speed of the voice
             is_last_chunk: Whether this is the last chunk
             normalizer: Optional AudioNormalizer instance for consistent normalization
+            crossfader: Optional ChunkCrossfader of the stream, applied after trimming
 
         Returns:
             Trimmed audio data
@@ -242,7 +308,10 @@ class AudioService:
         trimed_samples += start_index
 
         if audio_chunk.word_timestamps is not None:
-            for timestamp in audio_chunk.word_timestamps:
-                timestamp.start_time -= trimed_samples / 24000
-                timestamp.end_time -= trimed_samples / 24000
+            audio_chunk.word_timestamps.shift(-trimed_samples / 24000)
+
+        # The chunk starts where the held tail of the previous one does, so
+        # timestamps need no further shift
+        if crossfader is not None:
+            audio_chunk.audio = crossfader.process(audio_chunk.audio, is_last_chunk)
         return audio_chunk
@@ -0,0 +1,236 @@
+"""Jointly scheduled synthesis of many short prompts.
+
+Voices are resolved once per batch and items are ordered so each voice runs as
+a group, longest prompts first. A fixed number of workers then synthesize and
+encode items, with encoding in threads so it overlaps with synthesis. Results
+are yielded as they complete, either as NDJSON lines or archive members.
+"""
+
+import asyncio
+import base64
+import io
+import re
+import tarfile
+import time
+import zipfile
+from typing import AsyncGenerator, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+from ..structures.custom_responses import json_dumps
+from ..structures.schemas import BatchSpeechItem, TTSStatus
+from .streaming_audio_writer import StreamingAudioWriter
+from .tts_service import TTSService
+
+# Resolved (voice name, voice path) per requested voice, or why it failed
+ResolvedVoices = Dict[str, Union[Tuple[str, str], Exception]]
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one batch item"""
+
+    index: int
+    item: BatchSpeechItem
+    audio: Optional[bytes]
+    error: Optional[str] = None
+
+    @property
+    def filename(self) -> str:
+        """Archive member name, unique through the item index"""
+        name = f"{self.index:05d}"
+        if self.item.id:
+            name += "_" + re.sub(r"[^\w.-]", "_", self.item.id)
+        return f"{name}.{self.item.response_format}"
+
+    def summary(self) -> dict:
+        """Result metadata without audio"""
+        summary = {
+            "index": self.index,
+            "id": self.item.id,
+            "status": (TTSStatus.FAILED if self.error else TTSStatus.COMPLETED).value,
+            "response_format": self.item.response_format,
+        }
+        if self.error:
+            summary["error"] = self.error
+        return summary
+
+
+def plan_batch(items: List[BatchSpeechItem], voices: ResolvedVoices) -> List[int]:
+    """Order item indices so voices run as groups, longest prompts first
+
+    Args:
+        items: Batch items
+        voices: Resolved voices by requested voice
+
+    Returns:
+        Item indices in scheduling order
+    """
+
+    def key(index: int):
+        voice = voices.get(items[index].voice)
+        voice_name = voice[0] if isinstance(voice, tuple) else ""
+        return voice_name, -len(items[index].input)
+
+    return sorted(range(len(items)), key=key)
+
+
+def encode_audio(audio: np.ndarray, output_format: str) -> bytes:
+    """Encode complete int16 audio into a single file"""
+    writer = StreamingAudioWriter(output_format, sample_rate=24000)
+    try:
+        return writer.write_chunk(audio) + writer.write_chunk(finalize=True)
+    finally:
+        writer.close()
+
+
+async def synthesize_item(
+    tts_service: TTSService,
+    index: int,
+    item: BatchSpeechItem,
+    voices: ResolvedVoices,
+) -> BatchResult:
+    """Synthesize and encode one item, capturing any failure in the result"""
+    voice = voices[item.voice]
+    if isinstance(voice, Exception):
+        return BatchResult(index, item, None, str(voice))
+
+    voice_name, voice_path = voice
+    try:
+        audio_data = await tts_service.generate_audio(
+            text=item.input,
+            voice=voice_name,
+            writer=None,
+            speed=item.speed,
+            normalization_options=item.normalization_options,
+            lang_code=item.lang_code,
+            voice_path=voice_path,
+        )
+        # Encoding runs in a thread so it overlaps with the next synthesis
+        audio = await asyncio.to_thread(
+            encode_audio, audio_data.audio, item.response_format
+        )
+        return BatchResult(index, item, audio)
+    except Exception as e:
+        logger.error(f"Failed to synthesize batch item {index}: {e}")
+        return BatchResult(index, item, None, str(e))
+
+
+async def synthesize_batch(
+    tts_service: TTSService,
+    items: List[BatchSpeechItem],
+    voices: ResolvedVoices,
+    concurrency: int,
+) -> AsyncGenerator[BatchResult, None]:
+    """Synthesize items with a fixed number of workers
+
+    Args:
+        tts_service: Service used for synthesis
+        items: Batch items
+        voices: Resolved voices by requested voice
+        concurrency: Number of items in progress at once
+
+    Yields:
+        Results in completion order
+    """
+    pending: asyncio.Queue = asyncio.Queue()
+    for index in plan_batch(items, voices):
+        pending.put_nowait(index)
+    completed: asyncio.Queue = asyncio.Queue()
+
+    async def worker() -> None:
+        while not pending.empty():
+            index = pending.get_nowait()
+            completed.put_nowait(
+                await synthesize_item(tts_service, index, items[index], voices)
+            )
+
+    start = time.perf_counter()
+    workers = [
+        asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(items))))
+    ]
+    try:
+        for _ in range(len(items)):
+            yield await completed.get()
+        logger.info(
+            f"Synthesized batch of {len(items)} items in {time.perf_counter() - start:.2f}s"
+        )
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+async def ndjson_results(
+    results: AsyncGenerator[BatchResult, None],
+) -> AsyncGenerator[bytes, None]:
+    """Render each result as a JSON line with base64 encoded audio"""
+    async for result in results:
+        line = result.summary()
+        if result.audio is not None:
+            line["audio"] = base64.b64encode(result.audio).decode("utf-8")
+        yield json_dumps(line) + b"\n"
+
+
+class _ArchiveBuffer(io.RawIOBase):
+    """Write-only sink drained after each archive member is written"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def archive_results(
+    results: AsyncGenerator[BatchResult, None], archive_format: str
+) -> AsyncGenerator[bytes, None]:
+    """Stream results as a zip or tar archive, ending with manifest.json
+
+    Audio is stored without compression since it is already encoded.
+    """
+    buffer = _ArchiveBuffer()
+    summaries = []
+
+    if archive_format == "zip":
+        archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED)
+
+        def add(name: str, data: bytes) -> None:
+            archive.writestr(
+                zipfile.ZipInfo(name, date_time=time.localtime()[:6]), data
+            )
+
+    else:
+        archive = tarfile.open(fileobj=buffer, mode="w|")
+
+        def add(name: str, data: bytes) -> None:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            archive.addfile(info, io.BytesIO(data))
+
+    async for result in results:
+        summary = result.summary()
+        if result.audio is not None:
+            summary["file"] = result.filename
+            add(result.filename, result.audio)
+            yield buffer.drain()
+        summaries.append(summary)
+
+    summaries.sort(key=lambda summary: summary["index"])
+    add("manifest.json", json_dumps(summaries))
+    archive.close()
+    yield buffer.drain()
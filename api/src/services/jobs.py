@@ -0,0 +1,473 @@
+"""Background rendering of long documents with resumable checkpoints.
+
+Jobs are queued in a sqlite database under settings.jobs_dir. When a job first
+runs, its smart_split chunk plan is stored alongside it, and each rendered
+chunk is saved as raw int16 PCM before being marked done. After a restart,
+interrupted jobs are requeued and only render the chunks that are missing.
+Jobs render one chunk at a time and wait while interactive streams are in
+progress, so they only use otherwise idle capacity. Chunk checkpoints are
+removed once a job's audio is assembled, and finished jobs are deleted after
+settings.jobs_max_age_hours.
+
+Store calls block on sqlite and the filesystem, so the runner and the job
+endpoints make them through asyncio.to_thread.
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from array import array
+from typing import List, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+import numpy as np
+from loguru import logger
+
+from ..core.config import settings
+from ..structures.schemas import SpeechJobRequest, TTSStatus
+from .audio import AudioNormalizer
+from .streaming_audio_writer import StreamingAudioWriter
+from .text_processing.text_processor import smart_split
+from .tts_service import TTSService
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    request TEXT NOT NULL,
+    voice TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    chunks_total INTEGER,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    tokens_total INTEGER,
+    tokens_done INTEGER NOT NULL DEFAULT 0,
+    render_seconds REAL NOT NULL DEFAULT 0,
+    audio_seconds REAL NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    tokens BLOB NOT NULL,
+    pause_s REAL,
+    done INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+# (index, text, tokens, pause seconds) of a planned chunk
+PlannedChunk = Tuple[int, str, array, Optional[float]]
+
+
+class JobStore:
+    """sqlite queue of jobs and their chunk plans"""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._db = sqlite3.connect(
+            os.path.join(directory, "jobs.sqlite3"), check_same_thread=False
+        )
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def job_dir(self, job_id: str) -> str:
+        """Directory holding a job's chunk PCM and finished audio"""
+        return os.path.join(self.directory, job_id)
+
+    def chunk_path(self, job_id: str, index: int) -> str:
+        return os.path.join(self.job_dir(job_id), f"{index:06d}.pcm")
+
+    def audio_path(self, job_id: str, response_format: str) -> str:
+        return os.path.join(self.job_dir(job_id), f"speech.{response_format}")
+
+    def create(self, request: SpeechJobRequest, voice: str) -> str:
+        """Queue a job for a validated voice, returning its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, request, voice, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    TTSStatus.PENDING.value,
+                    request.model_dump_json(),
+                    voice,
+                    now,
+                    now,
+                ),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def next_pending(self) -> Optional[dict]:
+        """Oldest job waiting to run"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (TTSStatus.PENDING.value,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def requeue_interrupted(self) -> int:
+        """Return jobs left processing by a previous run to the queue"""
+        with self._lock, self._db:
+            return self._db.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (TTSStatus.PENDING.value, time.time(), TTSStatus.PROCESSING.value),
+            ).rowcount
+
+    def set_status(
+        self, job_id: str, status: TTSStatus, error: Optional[str] = None
+    ) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status.value, error, time.time(), job_id),
+            )
+
+    def save_plan(
+        self, job_id: str, chunks: List[Tuple[str, array, Optional[float]]]
+    ) -> None:
+        """Store the chunk plan, so a resumed job renders the same chunks"""
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO chunks (job_id, idx, text, tokens, pause_s)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [
+                    (job_id, index, text, array("h", tokens).tobytes(), pause_s)
+                    for index, (text, tokens, pause_s) in enumerate(chunks)
+                ],
+            )
+            self._db.execute(
+                "UPDATE jobs SET chunks_total = ?, tokens_total = ?, updated_at = ?"
+                " WHERE id = ?",
+                (
+                    len(chunks),
+                    sum(len(tokens) for _, tokens, _ in chunks),
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def pending_chunks(self, job_id: str) -> List[PlannedChunk]:
+        """Planned chunks that have not been rendered yet, in order"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT idx, text, tokens, pause_s FROM chunks"
+                " WHERE job_id = ? AND done = 0 ORDER BY idx",
+                (job_id,),
+            ).fetchall()
+        chunks = []
+        for row in rows:
+            tokens = array("h")
+            tokens.frombytes(row["tokens"])
+            chunks.append((row["idx"], row["text"], tokens, row["pause_s"]))
+        return chunks
+
+    def chunk_done(
+        self,
+        job_id: str,
+        index: int,
+        tokens: int,
+        render_seconds: float,
+        audio_seconds: float,
+    ) -> None:
+        """Mark a chunk rendered and record its cost for the ETA"""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE chunks SET done = 1 WHERE job_id = ? AND idx = ?",
+                (job_id, index),
+            )
+            self._db.execute(
+                "UPDATE jobs SET chunks_done = chunks_done + 1,"
+                " tokens_done = tokens_done + ?, render_seconds = render_seconds + ?,"
+                " audio_seconds = audio_seconds + ?, updated_at = ? WHERE id = ?",
+                (tokens, render_seconds, audio_seconds, time.time(), job_id),
+            )
+
+    def discard_checkpoints(self, job_id: str, chunks_total: int) -> None:
+        """Drop a finished job's chunk plan and PCM, keeping its audio"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM chunks WHERE job_id = ?", (job_id,))
+        for index in range(chunks_total):
+            try:
+                os.remove(self.chunk_path(job_id, index))
+            except FileNotFoundError:
+                pass
+
+    def expired(self, max_age_s: float) -> List[str]:
+        """Ids of completed and failed jobs not updated for max_age_s"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (
+                    TTSStatus.COMPLETED.value,
+                    TTSStatus.FAILED.value,
+                    time.time() - max_age_s,
+                ),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def delete(self, job_id: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM chunks WHERE job_id = ?", (job_id,))
+            self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+
+
+def job_progress(job: dict) -> dict:
+    """Public view of a job with progress and ETA.
+
+    The ETA is the measured real-time factor applied to the audio the
+    remaining tokens are expected to produce.
+    """
+    progress = {
+        "id": job["id"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "chunks_total": job["chunks_total"],
+        "chunks_done": job["chunks_done"],
+        "rtf": None,
+        "eta_seconds": None,
+    }
+    if job["audio_seconds"] > 0:
+        rtf = job["render_seconds"] / job["audio_seconds"]
+        progress["rtf"] = round(rtf, 4)
+        if job["tokens_done"] and job["tokens_total"] is not None:
+            remaining_audio = (
+                job["audio_seconds"]
+                / job["tokens_done"]
+                * (job["tokens_total"] - job["tokens_done"])
+            )
+            progress["eta_seconds"] = round(rtf * remaining_audio, 1)
+    if job["status"] == TTSStatus.COMPLETED.value:
+        progress["eta_seconds"] = 0.0
+    if job["error"]:
+        progress["error"] = job["error"]
+    return progress
+
+
+class JobRunner:
+    """Runs queued jobs one at a time in the background"""
+
+    def __init__(self, store: JobStore):
+        self.store = store
+        self._service_factory = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._current: Optional[Tuple[str, asyncio.Task]] = None
+
+    async def start(self, service_factory) -> None:
+        """Requeue interrupted jobs and start working through the queue
+
+        Args:
+            service_factory: Coroutine function returning the TTSService
+        """
+        self._service_factory = service_factory
+        self._wake = asyncio.Event()
+        requeued = await asyncio.to_thread(self.store.requeue_interrupted)
+        if requeued:
+            logger.info(f"Resuming {requeued} interrupted speech jobs")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the runner, leaving any job in progress to resume on restart"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self) -> None:
+        """Wake the runner after a job is queued"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def delete(self, job_id: str) -> None:
+        """Stop a job if it is running and remove it with its files"""
+        if self._current is not None and self._current[0] == job_id:
+            task = self._current[1]
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.to_thread(self.store.delete, job_id)
+
+    async def expire(self) -> None:
+        """Delete completed and failed jobs older than settings.jobs_max_age_hours"""
+        if settings.jobs_max_age_hours <= 0:
+            return
+        max_age_s = settings.jobs_max_age_hours * 3600
+        for job_id in await asyncio.to_thread(self.store.expired, max_age_s):
+            logger.info(f"Deleting expired speech job {job_id}")
+            await asyncio.to_thread(self.store.delete, job_id)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.expire()
+            except Exception as e:
+                logger.warning(f"Error deleting expired speech jobs: {e}")
+            job = await asyncio.to_thread(self.store.next_pending)
+            if job is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wake.wait(), settings.jobs_cleanup_interval_s
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            tts_service = await self._service_factory()
+            task = asyncio.create_task(self.process(job["id"], tts_service))
+            self._current = (job["id"], task)
+            try:
+                await task
+            except asyncio.CancelledError:
+                # Deleted jobs cancel only their own task
+                if not task.cancelled():
+                    raise
+            except Exception as e:
+                logger.error(f"Speech job {job['id']} failed: {e}")
+                await asyncio.to_thread(
+                    self.store.set_status, job["id"], TTSStatus.FAILED, str(e)
+                )
+            finally:
+                self._current = None
+
+    async def _wait_for_interactive(self) -> None:
+        while TTSService.active_streams > 0:
+            await asyncio.sleep(settings.jobs_idle_poll_s)
+
+    async def process(self, job_id: str, tts_service: TTSService) -> None:
+        """Render a job's remaining chunks and assemble the finished audio"""
+        job = await asyncio.to_thread(self.store.get, job_id)
+        request = SpeechJobRequest.model_validate_json(job["request"])
+        await asyncio.to_thread(self.store.set_status, job_id, TTSStatus.PROCESSING)
+        try:
+            voice_name, voice_path = await tts_service._get_voices_path(job["voice"])
+            lang_code = request.lang_code or voice_name[:1].lower()
+
+            if job["chunks_total"] is None:
+                plan = [
+                    chunk
+                    async for chunk in smart_split(
+                        request.input,
+                        lang_code=lang_code,
+                        normalization_options=request.normalization_options,
+                    )
+                ]
+                await asyncio.to_thread(self.store.save_plan, job_id, plan)
+                logger.info(f"Planned speech job {job_id} as {len(plan)} chunks")
+
+            await aiofiles.os.makedirs(self.store.job_dir(job_id), exist_ok=True)
+            normalizer = AudioNormalizer()
+            pending = await asyncio.to_thread(self.store.pending_chunks, job_id)
+            for index, text, tokens, pause_s in pending:
+                await self._wait_for_interactive()
+                start = time.perf_counter()
+                if pause_s is not None and pause_s > 0:
+                    audio = np.zeros(int(pause_s * 24000), dtype=np.int16)
+                else:
+                    audio = await tts_service.generate_chunk_audio(
+                        text,
+                        tokens,
+                        voice_name,
+                        voice_path,
+                        speed=request.speed,
+                        lang_code=lang_code,
+                        normalizer=normalizer,
+                    )
+                render_seconds = time.perf_counter() - start
+
+                # Write then rename, so a chunk file is never left half written
+                path = self.store.chunk_path(job_id, index)
+                async with aiofiles.open(path + ".tmp", "wb") as f:
+                    await f.write(audio.astype(np.int16).tobytes())
+                await aiofiles.os.replace(path + ".tmp", path)
+
+                # Pauses are free to render, so they are left out of the RTF
+                if pause_s is None:
+                    cost = (len(tokens), render_seconds, len(audio) / 24000)
+                else:
+                    cost = (0, 0.0, 0.0)
+                await asyncio.to_thread(self.store.chunk_done, job_id, index, *cost)
+
+            chunks_total = await self._assemble(job_id, request.response_format)
+            await asyncio.to_thread(self.store.set_status, job_id, TTSStatus.COMPLETED)
+            # Completed before discarding, so a crash in between cannot
+            # requeue a job whose checkpoints are gone
+            await asyncio.to_thread(
+                self.store.discard_checkpoints, job_id, chunks_total
+            )
+            logger.info(f"Completed speech job {job_id}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Speech job {job_id} failed: {e}")
+            await asyncio.to_thread(
+                self.store.set_status, job_id, TTSStatus.FAILED, str(e)
+            )
+
+    async def _assemble(self, job_id: str, response_format: str) -> int:
+        """Encode the chunk PCM in plan order into the finished audio file
+
+        Returns:
+            Number of chunks assembled
+        """
+        job = await asyncio.to_thread(self.store.get, job_id)
+        path = self.store.audio_path(job_id, response_format)
+        writer = StreamingAudioWriter(response_format, sample_rate=24000)
+        try:
+            async with aiofiles.open(path + ".tmp", "wb") as out:
+                for index in range(job["chunks_total"]):
+                    async with aiofiles.open(
+                        self.store.chunk_path(job_id, index), "rb"
+                    ) as f:
+                        audio = np.frombuffer(await f.read(), dtype=np.int16)
+                    if len(audio):
+                        await out.write(
+                            await asyncio.to_thread(writer.write_chunk, audio)
+                        )
+                await out.write(
+                    await asyncio.to_thread(writer.write_chunk, finalize=True)
+                )
+        finally:
+            writer.close()
+        await aiofiles.os.replace(path + ".tmp", path)
+        return job["chunks_total"]
+
+
+_job_runner: Optional[JobRunner] = None
+
+
+def get_job_runner() -> JobRunner:
+    """Get the global job runner, opening the job store on first use"""
+    global _job_runner
+    if _job_runner is None:
+        _job_runner = JobRunner(JobStore(settings.jobs_dir))
+    return _job_runner
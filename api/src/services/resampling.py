@@ -0,0 +1,92 @@
+"""Streaming sample rate conversion for output profiles such as telephony"""
+
+from math import gcd
+
+import numpy as np
+from scipy.signal import firwin
+
+
+class StreamingResampler:
+    """Polyphase FIR resampler that keeps its history across chunks.
+
+    The filter is centered on each output sample, so the output stays aligned
+    with the input. Samples near the end of a chunk wait for the next one, so
+    chunk boundaries produce no clicks. Call with final=True to flush.
+    """
+
+    def __init__(self, from_rate: int, to_rate: int, taps_per_phase: int = 16):
+        """Initialize resampler
+
+        Args:
+            from_rate: Input sample rate
+            to_rate: Output sample rate
+            taps_per_phase: Filter length relative to the rate ratio, trading
+                CPU for a sharper anti-aliasing cutoff
+        """
+        divisor = gcd(from_rate, to_rate)
+        self.up = to_rate // divisor
+        self.down = from_rate // divisor
+
+        # Low pass at the lower Nyquist frequency, on the upsampled signal
+        num_taps = taps_per_phase * max(self.up, self.down) + 1
+        taps = firwin(num_taps, 1 / max(self.up, self.down), window=("kaiser", 8.0))
+        taps *= self.up
+        self.delay = (num_taps - 1) // 2
+
+        # phases[p, k] holds taps[p + k * up], the taps applied to input
+        # sample m0 - k for outputs falling on phase p
+        self.taps_per_phase = -(-num_taps // self.up)
+        padded = np.zeros(self.taps_per_phase * self.up)
+        padded[:num_taps] = taps
+        self.phases = padded.reshape(self.taps_per_phase, self.up).T.copy()
+
+        # Input history, starting at global sample index _buffer_start.
+        # Samples before the stream start are silence.
+        self._buffer = np.zeros(self.taps_per_phase, dtype=np.float64)
+        self._buffer_start = -self.taps_per_phase
+        self._input_samples = 0
+        self._output_samples = 0
+
+    def process(self, audio: np.ndarray, final: bool = False) -> np.ndarray:
+        """Resample a chunk of int16 audio
+
+        Args:
+            audio: Input samples, may be empty
+            final: Whether this is the last chunk, flushing buffered samples
+
+        Returns:
+            Resampled int16 samples available so far
+        """
+        if len(audio):
+            self._buffer = np.concatenate([self._buffer, audio.astype(np.float64)])
+            self._input_samples += len(audio)
+
+        if final:
+            # Output length matches the input duration; pad past the end with silence
+            end = -(-self._input_samples * self.up // self.down)
+            lookahead = (self.delay // self.up) + 2
+            self._buffer = np.concatenate([self._buffer, np.zeros(lookahead)])
+        else:
+            # Outputs whose filter window lies within the buffered input
+            available = self._input_samples * self.up - 1 - self.delay
+            end = available // self.down + 1 if available >= 0 else 0
+
+        if end <= self._output_samples:
+            return np.array([], dtype=np.int16)
+
+        positions = np.arange(self._output_samples, end) * self.down + self.delay
+        newest = positions // self.up - self._buffer_start
+        window = newest[:, None] - np.arange(self.taps_per_phase)[None, :]
+        samples = np.einsum(
+            "nk,nk->n", self.phases[positions % self.up], self._buffer[window]
+        )
+        self._output_samples = end
+
+        # Keep only the history the next output needs
+        next_newest = (end * self.down + self.delay) // self.up
+        drop = next_newest - (self.taps_per_phase - 1) - self._buffer_start
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start += drop
+
+        return np.clip(np.rint(samples), -32768, 32767).astype(np.int16)
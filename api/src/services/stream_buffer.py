@@ -0,0 +1,238 @@
+"""Replay buffer that lets streaming clients reconnect without re-synthesis.
+
+Each buffered stream is produced by a background task, so generation carries
+on when a client drops. A reconnecting client passes the stream id and the
+number of bytes it received, and is sent the rest of the buffered audio
+followed by chunks as they are generated. Streams without a reader for
+stream_resume_ttl_s are dropped, which also stops their generation. When the
+buffers together exceed stream_resume_max_mb, the least recently used streams
+without a reader are evicted. Streams that still have a reader are never cut
+off: their already delivered bytes are dropped instead, and they can no
+longer be resumed.
+"""
+
+import asyncio
+import time
+import uuid
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import AsyncGenerator, AsyncIterator, Dict, List, Optional
+
+from loguru import logger
+
+from ..core.config import settings
+
+
+class StreamEvictedError(RuntimeError):
+    """Raised to readers of a stream dropped from the buffer"""
+
+
+class BufferedStream:
+    """Chunks of one streamed response, numbered by their byte offsets"""
+
+    def __init__(self, registry: "StreamBuffer", stream_id: str, media_type: str):
+        self.stream_id = stream_id
+        self.media_type = media_type
+        self.chunks: List[bytes] = []
+        self.offsets: List[int] = []  # Byte offset where each chunk starts
+        self.size = 0
+        self.base = 0  # Offset of the first byte still buffered
+        self.resumable = True
+        self.finished = False
+        self.evicted = False
+        self.error: Optional[str] = None
+        self.readers = 0
+        self.last_active = time.monotonic()
+        self._registry = registry
+        self._task: Optional[asyncio.Task] = None
+        self._updated = asyncio.Event()
+        self._positions: Dict[object, int] = {}  # Bytes delivered to each reader
+
+    @property
+    def buffered(self) -> int:
+        """Number of bytes held in memory"""
+        return self.size - self.base
+
+    def start(self, source: AsyncIterator[bytes]) -> None:
+        """Fill the buffer from source in a task that outlives any reader"""
+        self._task = asyncio.create_task(self._fill(source))
+
+    async def _fill(self, source: AsyncIterator[bytes]) -> None:
+        try:
+            async for data in source:
+                if self.evicted:
+                    break
+                if self.expired(self._registry.ttl_s):
+                    logger.info(f"Stopping abandoned stream {self.stream_id}")
+                    break
+                if data:
+                    self.append(data)
+        except Exception as e:
+            logger.error(f"Error producing buffered stream {self.stream_id}: {e}")
+            self.error = str(e)
+        finally:
+            if hasattr(source, "aclose"):
+                await source.aclose()
+            self.finished = True
+            self._notify()
+
+    def append(self, data: bytes) -> None:
+        self.offsets.append(self.size)
+        self.chunks.append(data)
+        self.size += len(data)
+        self._registry._grow(len(data))
+        self._notify()
+
+    def _notify(self) -> None:
+        # Wake current readers and give later waits a fresh event
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def evict(self) -> None:
+        """Drop buffered chunks and stop generation"""
+        self.evicted = True
+        self.chunks = []
+        self.offsets = []
+        # Generation can reach this through its own append, which stops on evicted
+        if (
+            self._task is not None
+            and not self.finished
+            and self._task is not asyncio.current_task()
+        ):
+            self._task.cancel()
+        self._notify()
+
+    def drop_delivered(self) -> int:
+        """Free chunks every reader has received, ending resumability
+
+        Returns:
+            Number of bytes freed
+        """
+        delivered = min(self._positions.values(), default=self.size)
+        count = bisect_right(self.offsets, delivered)
+        # The last chunk may be partly delivered
+        while count and self.offsets[count - 1] + len(self.chunks[count - 1]) > delivered:
+            count -= 1
+        if not count:
+            return 0
+        freed = sum(len(chunk) for chunk in self.chunks[:count])
+        del self.chunks[:count]
+        del self.offsets[:count]
+        self.base += freed
+        self.resumable = False
+        return freed
+
+    def expired(self, ttl_s: float) -> bool:
+        """Whether no reader has been attached for longer than ttl_s"""
+        return self.readers == 0 and time.monotonic() - self.last_active > ttl_s
+
+    async def read(self, offset: int = 0) -> AsyncGenerator[bytes, None]:
+        """Yield the stream from a byte offset, waiting for chunks in progress
+
+        Args:
+            offset: Number of bytes the client already received
+
+        Raises:
+            StreamEvictedError: If the stream is dropped while being read
+            RuntimeError: If generation failed, after all audio produced so far
+        """
+        self.readers += 1
+        reader = object()
+        self._positions[reader] = offset
+        try:
+            while True:
+                if self.evicted:
+                    raise StreamEvictedError(f"Stream {self.stream_id} was evicted")
+                if offset < self.base:
+                    raise StreamEvictedError(
+                        f"Stream {self.stream_id} no longer buffers offset {offset}"
+                    )
+                # Look the chunk up each time, earlier chunks may have been dropped
+                index = bisect_right(self.offsets, offset) - 1
+                if index >= 0 and offset < self.offsets[index] + len(self.chunks[index]):
+                    start = self.offsets[index]
+                    chunk = self.chunks[index]
+                    yield chunk[offset - start :] if offset > start else chunk
+                    offset = start + len(chunk)
+                    self._positions[reader] = offset
+                    continue
+                if self.finished:
+                    break
+                await self._updated.wait()
+            if self.error:
+                raise RuntimeError(self.error)
+        finally:
+            del self._positions[reader]
+            self.readers -= 1
+            self.last_active = time.monotonic()
+
+
+class StreamBuffer:
+    """Bounded, time-limited registry of buffered streams"""
+
+    def __init__(self, max_bytes: int, ttl_s: float):
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.total_bytes = 0
+        self._streams: "OrderedDict[str, BufferedStream]" = OrderedDict()
+
+    def create(self, media_type: str) -> BufferedStream:
+        self._evict_expired()
+        stream = BufferedStream(self, uuid.uuid4().hex, media_type)
+        self._streams[stream.stream_id] = stream
+        return stream
+
+    def get(self, stream_id: str) -> Optional[BufferedStream]:
+        """Look up a stream that can still be resumed"""
+        self._evict_expired()
+        stream = self._streams.get(stream_id)
+        if stream is None or not stream.resumable:
+            return None
+        self._streams.move_to_end(stream_id)
+        return stream
+
+    def _grow(self, nbytes: int) -> None:
+        self.total_bytes += nbytes
+        # Evict least recently used streams nobody is reading
+        while self.total_bytes > self.max_bytes:
+            stream_id = next(
+                (sid for sid, stream in self._streams.items() if stream.readers == 0),
+                None,
+            )
+            if stream_id is None:
+                break
+            logger.info(f"Evicting buffered stream {stream_id} to stay within memory limit")
+            self._remove(stream_id)
+        # Live streams keep playing but give up what they already delivered
+        for stream in self._streams.values():
+            if self.total_bytes <= self.max_bytes:
+                break
+            freed = stream.drop_delivered()
+            if freed:
+                logger.info(
+                    f"Stream {stream.stream_id} is no longer resumable, memory limit reached"
+                )
+                self.total_bytes -= freed
+
+    def _evict_expired(self) -> None:
+        for stream_id, stream in list(self._streams.items()):
+            if stream.expired(self.ttl_s):
+                self._remove(stream_id)
+
+    def _remove(self, stream_id: str) -> None:
+        stream = self._streams.pop(stream_id)
+        self.total_bytes -= stream.buffered
+        stream.evict()
+
+
+_stream_buffer: Optional[StreamBuffer] = None
+
+
+def get_stream_buffer() -> StreamBuffer:
+    """Get the global stream buffer"""
+    global _stream_buffer
+    if _stream_buffer is None:
+        _stream_buffer = StreamBuffer(
+            settings.stream_resume_max_mb * 1024 * 1024, settings.stream_resume_ttl_s
+        )
+    return _stream_buffer
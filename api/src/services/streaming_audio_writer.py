@@ -1,8 +1,10 @@
 """Audio conversion service with proper streaming support"""
 
+import asyncio
 import struct
+from functools import lru_cache
 from io import BytesIO
-from typing import Optional
+from typing import Awaitable, Callable, Iterator, Optional
 
 import av
 import numpy as np
@@ -10,16 +12,98 @@ import soundfile as sf
 from loguru import logger
 from pydub import AudioSegment
 
+from .resampling import StreamingResampler
+
+
+def _g711_tables():
+    """Lookup tables from every int16 sample, as uint16, to μ-law and A-law bytes"""
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32)
+
+    # μ-law: bias the 14 bit magnitude, then segment and 4 bit mantissa
+    magnitude = np.minimum(np.abs(samples >> 2), 8159) + 33
+    segment = np.searchsorted(
+        [0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF], magnitude
+    )
+    ulaw = np.where(
+        segment < 8, (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F), 0x7F
+    )
+    ulaw ^= np.where(samples < 0, 0x7F, 0xFF)
+
+    # A-law: 13 bit magnitude, with linear steps in the first two segments
+    value = samples >> 3
+    magnitude = np.where(value >= 0, value, -value - 1)
+    segment = np.searchsorted(
+        [0x1F, 0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF], magnitude
+    )
+    shift = np.where(segment < 2, 1, segment)
+    alaw = (segment << 4) | ((magnitude >> shift) & 0x0F)
+    alaw ^= np.where(value >= 0, 0xD5, 0x55)
+
+    return ulaw.astype(np.uint8), alaw.astype(np.uint8)
+
+
+ULAW_TABLE, ALAW_TABLE = _g711_tables()
+
+# Headerless telephony formats and the table encoding them
+G711_TABLES = {"ulaw": ULAW_TABLE, "alaw": ALAW_TABLE}
+
+# Sample rate used for telephony formats when none is requested
+TELEPHONY_SAMPLE_RATE = 8000
+
+# Opus frame duration in low latency mode when none is requested
+DEFAULT_OPUS_FRAME_MS = 20
+
+# Pauses are written in blocks of at most this many samples, all views of one
+# shared read-only block, so a pause of any length allocates no audio
+SILENCE_BLOCK_SAMPLES = 24000
+_SILENCE = np.zeros(SILENCE_BLOCK_SAMPLES, dtype=np.int16)
+_SILENCE.flags.writeable = False
+
+
+def silence_blocks(samples: int) -> Iterator[np.ndarray]:
+    """Split samples of silence into views of the shared silent block"""
+    for start in range(0, samples, SILENCE_BLOCK_SAMPLES):
+        yield _SILENCE[: min(SILENCE_BLOCK_SAMPLES, samples - start)]
+
 
 class StreamingAudioWriter:
     """Handles streaming audio format conversions"""
 
-    def __init__(self, format: str, sample_rate: int, channels: int = 1):
+    def __init__(
+        self,
+        format: str,
+        sample_rate: int,
+        channels: int = 1,
+        output_sample_rate: Optional[int] = None,
+        low_latency: bool = False,
+        frame_duration_ms: Optional[int] = None,
+    ):
+        """Initialize writer
+
+        Args:
+            format: Output format
+            sample_rate: Sample rate of the audio passed to write_chunk
+            channels: Number of channels
+            output_sample_rate: Sample rate to encode at, resampling the input
+                if it differs. Defaults to 8 kHz for ulaw and alaw, and to
+                sample_rate otherwise.
+            low_latency: Flush an Ogg page per Opus frame and use the low
+                delay Opus mode, instead of buffering a second of pages
+            frame_duration_ms: Opus frame duration in milliseconds
+        """
         self.format = format.lower()
         self.sample_rate = sample_rate
         self.channels = channels
         self.bytes_written = 0
         self.pts = 0
+        self._silence_frame: Optional[av.AudioFrame] = None
+
+        if output_sample_rate is None and self.format in G711_TABLES:
+            output_sample_rate = TELEPHONY_SAMPLE_RATE
+        self.output_sample_rate = output_sample_rate or sample_rate
+        self.resampler = None
+        if self.output_sample_rate != sample_rate:
+            self.resampler = StreamingResampler(sample_rate, self.output_sample_rate)
 
         codec_map = {
             "wav": "pcm_s16le",
@@ -29,8 +113,8 @@ class StreamingAudioWriter:
             "aac": "aac",
         }
         # Format-specific setup
-        if self.format in ["wav", "flac", "mp3", "pcm", "aac", "opus"]:
-            if self.format != "pcm":
+        if self.format in ["wav", "flac", "mp3", "pcm", "aac", "opus", "ulaw", "alaw"]:
+            if self.format not in ("pcm", "ulaw", "alaw"):
                 self.output_buffer = BytesIO()
                 container_options = {}
                 # Try disabling Xing VBR header for MP3 to fix iOS timeline reading issues
@@ -38,6 +122,10 @@ class StreamingAudioWriter:
                     # Disable Xing VBR header
                     container_options = {'write_xing': '0'}
                     logger.debug("Disabling Xing VBR header for MP3 encoding.")
+                elif self.format == "opus" and low_latency:
+                    # Close each Ogg page after one frame rather than ~1s of audio
+                    frame_ms = frame_duration_ms or DEFAULT_OPUS_FRAME_MS
+                    container_options = {"page_duration": str(frame_ms * 1000)}
 
                 self.container = av.open(
                     self.output_buffer,
@@ -47,12 +135,19 @@ class StreamingAudioWriter:
                 )
                 self.stream = self.container.add_stream(
                     codec_map[self.format],
-                    rate=self.sample_rate,
+                    rate=self.output_sample_rate,
                     layout="mono" if self.channels == 1 else "stereo",
                 )
                 # Set bit_rate only for codecs where it's applicable and useful
                 if self.format in ['mp3', 'aac', 'opus']:
                     self.stream.bit_rate = 128000
+                if self.format == "opus":
+                    codec_options = {}
+                    if frame_duration_ms:
+                        codec_options["frame_duration"] = str(frame_duration_ms)
+                    if low_latency:
+                        codec_options["application"] = "lowdelay"
+                    self.stream.codec_context.options = codec_options
         else:
             raise ValueError(f"Unsupported format: {self.format}") # Use self.format here
 
@@ -73,8 +168,20 @@ class StreamingAudioWriter:
             finalize: Whether this is the final write to close the stream
         """
 
+        if self.resampler is not None:
+            audio_data = self.resampler.process(
+                audio_data if audio_data is not None else np.array([], np.int16),
+                final=finalize,
+            )
+
         if finalize:
-            if self.format != "pcm":
+            if self.format in ("pcm", "ulaw", "alaw"):
+                # Headerless formats end with the resampler tail, if any
+                return self._encode_raw(audio_data) if audio_data is not None else b""
+            else:
+                if audio_data is not None and len(audio_data) > 0:
+                    self._encode_frame(audio_data)
+
                 # Flush stream encoder
                 packets = self.stream.encode(None)
                 for packet in packets:
@@ -84,6 +191,10 @@ class StreamingAudioWriter:
                 # No explicit flush method is available or needed here.
                 logger.debug("Muxed final packets.")
 
+                if self.format == "opus":
+                    # The Ogg muxer appends its last pages on close
+                    self.container.close()
+
                 # Get the final bytes from the buffer *before* closing it
                 data = self.output_buffer.getvalue()
                 self.close() # Close container and buffer
@@ -92,25 +203,169 @@ class StreamingAudioWriter:
         if audio_data is None or len(audio_data) == 0:
             return b""
 
+        if self.format in ("pcm", "ulaw", "alaw"):
+            return self._encode_raw(audio_data)
+        else:
+            self._encode_frame(audio_data)
+            return self._drain()
+
+    def write_silence(self, samples: int) -> bytes:
+        """Write samples of silence and return bytes in the target format.
+
+        Headerless formats copy a cached encoding of the silent block. Other
+        formats encode a frame made once per writer, only advancing its
+        timestamp, since their encoders carry state between frames.
+
+        Args:
+            samples: Number of silent samples at the input sample rate
+        """
+        if self.resampler is not None:
+            # The resampler tail of preceding audio runs into the silence
+            return b"".join(self.write_chunk(block) for block in silence_blocks(samples))
+
+        if self.format in ("pcm", "ulaw", "alaw"):
+            encoded = _encoded_silence(self.format)
+            width = len(encoded) // SILENCE_BLOCK_SAMPLES
+            return b"".join(
+                encoded[: len(block) * width] for block in silence_blocks(samples)
+            )
+
+        for block in silence_blocks(samples):
+            if len(block) < SILENCE_BLOCK_SAMPLES:
+                self._encode_frame(block)
+                continue
+            if self._silence_frame is None:
+                self._silence_frame = self._make_frame(block)
+            self._mux_frame(self._silence_frame)
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self.output_buffer.getvalue()
+        self.output_buffer.seek(0)
+        self.output_buffer.truncate(0)
+        return data
+
+    def _encode_raw(self, audio_data: np.ndarray) -> bytes:
         if self.format == "pcm":
             # Write raw bytes
             return audio_data.tobytes()
-        else:
-            frame = av.AudioFrame.from_ndarray(
-                audio_data.reshape(1, -1),
-                format="s16",
-                layout="mono" if self.channels == 1 else "stereo",
-            )
-            frame.sample_rate = self.sample_rate
+        return G711_TABLES[self.format][audio_data.view(np.uint16)].tobytes()
+
+    def _make_frame(self, audio_data: np.ndarray) -> av.AudioFrame:
+        frame = av.AudioFrame.from_ndarray(
+            audio_data.reshape(1, -1),
+            format="s16",
+            layout="mono" if self.channels == 1 else "stereo",
+        )
+        frame.sample_rate = self.output_sample_rate
+        return frame
+
+    def _encode_frame(self, audio_data: np.ndarray) -> None:
+        self._mux_frame(self._make_frame(audio_data))
+
+    def _mux_frame(self, frame: av.AudioFrame) -> None:
+        frame.pts = self.pts
+        self.pts += frame.samples
+
+        packets = self.stream.encode(frame)
+        for packet in packets:
+            self.container.mux(packet)
+
+
+class BackgroundEncoder:
+    """Encodes audio chunks in order on a worker thread.
 
-            frame.pts = self.pts
-            self.pts += frame.samples
+    Encoding a chunk overlaps with synthesizing the next one. At most
+    max_pending chunks wait in the queue, after which submit waits for the
+    worker, so synthesis is held back when encoding falls behind. Encoded
+    bytes are passed to sink as they are produced.
+    """
+
+    def __init__(
+        self,
+        writer: StreamingAudioWriter,
+        sink: Callable[[bytes], Awaitable[None]],
+        max_pending: int = 8,
+    ):
+        """Initialize background encoder
+
+        Args:
+            writer: Writer encoding the chunks, closed when encoding ends
+            sink: Coroutine function receiving encoded bytes
+            max_pending: Number of chunks that can wait to be encoded
+        """
+        self.writer = writer
+        self._sink = sink
+        self._queue: "asyncio.Queue[Optional[np.ndarray]]" = asyncio.Queue(
+            maxsize=max_pending
+        )
+        self._aborted = False
+        self._task = asyncio.create_task(self._encode())
+
+    async def _encode(self) -> None:
+        while (audio := await self._queue.get()) is not None:
+            data = await asyncio.to_thread(self.writer.write_chunk, audio)
+            if data:
+                await self._sink(data)
+        if self._aborted:
+            return
+        data = await asyncio.to_thread(self.writer.write_chunk, finalize=True)
+        if data:
+            await self._sink(data)
+
+    async def _put(self, item: Optional[np.ndarray]) -> None:
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+            return
+        put = asyncio.ensure_future(self._queue.put(item))
+        try:
+            await asyncio.wait({put, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            put.cancel()
+            raise
+        if not put.done():
+            # The worker stopped, so the queue will never have room
+            put.cancel()
+            await self._task
+
+    async def submit(self, audio: np.ndarray) -> None:
+        """Queue int16 audio for encoding, waiting while the queue is full
+
+        Raises:
+            Exception: The encoding error, if the worker failed
+        """
+        if len(audio) > 0:
+            await self._put(audio)
+
+    async def finish(self) -> None:
+        """Encode the remaining audio and finalize the writer"""
+        try:
+            await self._put(None)
+            await self._task
+        finally:
+            self.writer.close()
+
+    async def close(self) -> None:
+        """Stop encoding, e.g. when synthesis fails
+
+        Waits for a chunk already on the worker thread, since the writer
+        cannot be closed while it is encoding.
+        """
+        self._aborted = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+        try:
+            await self._task
+        except Exception as e:
+            logger.warning(f"Error stopping background encoder: {e}")
+        finally:
+            self.writer.close()
 
-            packets = self.stream.encode(frame)
-            for packet in packets:
-                self.container.mux(packet)
 
-            data = self.output_buffer.getvalue()
-            self.output_buffer.seek(0)
-            self.output_buffer.truncate(0)
-            return data
+@lru_cache(maxsize=None)
+def _encoded_silence(format: str) -> bytes:
+    """The silent block in a headerless format"""
+    if format == "pcm":
+        return _SILENCE.tobytes()
+    return G711_TABLES[format][_SILENCE.view(np.uint16)].tobytes()
@@ -1,76 +1,214 @@
 """Temporary file writer for audio downloads"""
 
+import asyncio
+import hashlib
 import os
 import tempfile
-from typing import List, Optional
+import time
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Set
 
 import aiofiles
+import aiofiles.os
 from fastapi import HTTPException
 from loguru import logger
 
 from ..core.config import settings
+from .streaming_audio_writer import BackgroundEncoder, StreamingAudioWriter
 
 
-async def cleanup_temp_files() -> None:
-    """Clean up old temp files"""
-    try:
-        if not await aiofiles.os.path.exists(settings.temp_file_dir):
-            await aiofiles.os.makedirs(settings.temp_file_dir, exist_ok=True)
-            return
+def _new_hash():
+    return hashlib.blake2b(digest_size=16)
 
-        # Get all temp files with stats
-        files = []
-        total_size = 0
 
-        # Use os.scandir for sync iteration, but aiofiles.os.stat for async stats
-        for entry in os.scandir(settings.temp_file_dir):
+def _hash_file(path: str) -> str:
+    content_hash = _new_hash()
+    with open(path, "rb") as f:
+        while block := f.read(1024 * 1024):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+
+class TempFileEntry(NamedTuple):
+    """Manifest entry of a temp file"""
+
+    path: str
+    stat: os.stat_result
+    etag: Optional[str]  # None until hashed, and for files still being written
+
+
+class TempFileIndex:
+    """In-memory manifest of temp files that also enforces the temp dir limits.
+
+    The directory is scanned once at startup. After that, writers register
+    files as they finish, so serving a download needs no directory search
+    and enforcing limits only touches the files it deletes. Entries are kept
+    oldest first, so limits are applied by removing from the front.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, TempFileEntry]" = OrderedDict()
+        self._writing: Set[str] = set()
+        self._janitor: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, name: str, entry: TempFileEntry) -> TempFileEntry:
+        previous = self._entries.pop(name, None)
+        if previous is not None:
+            self.total_bytes -= previous.stat.st_size
+        self._entries[name] = entry
+        self.total_bytes += entry.stat.st_size
+        return entry
+
+    async def load(self) -> None:
+        """Index the files already in the directory, oldest first"""
+        await aiofiles.os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in await aiofiles.os.scandir(self.directory):
             if entry.is_file():
-                stat = await aiofiles.os.stat(entry.path)
-                files.append((entry.path, stat.st_mtime, stat.st_size))
-                total_size += stat.st_size
-
-        # Sort by modification time (oldest first)
-        files.sort(key=lambda x: x[1])
-
-        # Remove files if:
-        # 1. They're too old
-        # 2. We have too many files
-        # 3. Directory is too large
-        current_time = (await aiofiles.os.stat(settings.temp_file_dir)).st_mtime
-        max_age = settings.max_temp_dir_age_hours * 3600
+                files.append((entry.name, entry.path, entry.stat()))
+        for name, path, stat in sorted(files, key=lambda file: file[2].st_mtime):
+            if name not in self._writing:
+                self._insert(name, TempFileEntry(path, stat, None))
+
+    def start_writing(self, path: str) -> None:
+        self._writing.add(os.path.basename(path))
+
+    def add(self, path: str, content_hash: str) -> TempFileEntry:
+        """Index a finished file
+
+        Args:
+            path: Path to the file in the temp directory
+            content_hash: Hex digest of the file content
+        """
+        name = os.path.basename(path)
+        self._writing.discard(name)
+        return self._insert(name, TempFileEntry(path, os.stat(path), f'"{content_hash}"'))
+
+    def remove(self, name: str) -> None:
+        self._writing.discard(name)
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self.total_bytes -= entry.stat.st_size
 
-        for path, mtime, size in files:
-            should_delete = False
+    async def lookup(self, name: str) -> Optional[TempFileEntry]:
+        """Find a temp file by name
 
-            # Check age
-            if current_time - mtime > max_age:
-                should_delete = True
-                logger.info(f"Deleting old temp file: {path}")
+        Args:
+            name: File name, without any directory
 
-            # Check count limit
-            elif len(files) > settings.max_temp_dir_count:
-                should_delete = True
-                logger.info(f"Deleting excess temp file: {path}")
+        Returns:
+            The manifest entry, or None if there is no such file
+        """
+        if os.path.basename(name) != name or name.startswith("."):
+            return None
+        entry = self._entries.get(name)
+        if entry is not None and entry.etag is not None:
+            return entry
+
+        path = os.path.join(self.directory, name)
+        try:
+            stat = await aiofiles.os.stat(path)
+        except OSError:
+            self.remove(name)
+            return None
+        if name in self._writing:
+            # Partial files are served as they are, without caching
+            return TempFileEntry(path, stat, None)
+        # Files indexed at startup or written by another worker are hashed once
+        content_hash = await asyncio.to_thread(_hash_file, path)
+        return self.add(path, content_hash)
+
+    async def enforce_limits(self) -> int:
+        """Delete the oldest files until age, count and size limits are met
 
-            # Check size limit
-            elif total_size > settings.max_temp_dir_size_mb * 1024 * 1024:
-                should_delete = True
-                logger.info(f"Deleting to reduce directory size: {path}")
+        Returns:
+            Number of files deleted
+        """
+        max_age = settings.max_temp_dir_age_hours * 3600
+        max_bytes = settings.max_temp_dir_size_mb * 1024 * 1024
+        now = time.time()
+        deleted = 0
+        while self._entries:
+            name, entry = next(iter(self._entries.items()))
+            if now - entry.stat.st_mtime > max_age:
+                reason = "old"
+            elif len(self._entries) > settings.max_temp_dir_count:
+                reason = "excess"
+            elif self.total_bytes > max_bytes:
+                reason = "oversized"
+            else:
+                break
+            self.remove(name)
+            try:
+                await aiofiles.os.remove(entry.path)
+                deleted += 1
+                logger.info(f"Deleted {reason} temp file: {entry.path}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Failed to delete temp file {entry.path}: {e}")
+        return deleted
+
+    async def _run_janitor(self) -> None:
+        while True:
+            await asyncio.sleep(settings.temp_janitor_interval_s)
+            try:
+                await self.enforce_limits()
+            except Exception as e:
+                logger.warning(f"Error during temp file cleanup: {e}")
+
+    def start_janitor(self) -> None:
+        """Start enforcing the age limit periodically in the background"""
+        if self._janitor is None:
+            self._janitor = asyncio.create_task(self._run_janitor())
+
+    async def stop_janitor(self) -> None:
+        if self._janitor is not None:
+            self._janitor.cancel()
+            try:
+                await self._janitor
+            except asyncio.CancelledError:
+                pass
+            self._janitor = None
+
+
+temp_file_index = TempFileIndex(settings.temp_file_dir)
 
-            if should_delete:
-                try:
-                    await aiofiles.os.remove(path)
-                    total_size -= size
-                    logger.info(f"Deleted temp file: {path}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete temp file {path}: {e}")
 
+async def cleanup_temp_files() -> None:
+    """Index the temp directory and clean up old temp files on startup"""
+    try:
+        await temp_file_index.load()
+        await temp_file_index.enforce_limits()
     except Exception as e:
         logger.warning(f"Error during temp file cleanup: {e}")
 
 
+def _write_all(fd: int, data) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _write_and_close(fd: int, data) -> None:
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
 class TempFileWriter:
-    """Handles writing audio chunks to a temp file"""
+    """Handles writing audio chunks to a temp file
+
+    Chunks are buffered in memory and written with a single os.write once
+    temp_file_flush_bytes accumulate, so most writes do no I/O. Short
+    outputs are written in one go when the file is finalized.
+    """
 
     def __init__(self, format: str):
         """Initialize temp file writer
@@ -79,27 +217,21 @@ class TempFileWriter:
             format: Audio format extension (mp3, wav, etc)
         """
         self.format = format
-        self.temp_file = None
+        self._fd: Optional[int] = None
+        self._buffer = bytearray()
         self._finalized = False
         self._write_error = False  # Flag to track if we've had a write error
+        self._hash = _new_hash()  # Content hash for the download ETag
 
     async def __aenter__(self):
         """Async context manager entry"""
         try:
-            # Clean up old files first
-            await cleanup_temp_files()
-
             # Create temp file with proper extension
             await aiofiles.os.makedirs(settings.temp_file_dir, exist_ok=True)
-            temp = tempfile.NamedTemporaryFile(
-                dir=settings.temp_file_dir,
-                delete=False,
-                suffix=f".{self.format}",
-                mode="wb",
+            self._fd, self.temp_path = tempfile.mkstemp(
+                dir=settings.temp_file_dir, suffix=f".{self.format}"
             )
-            self.temp_file = await aiofiles.open(temp.name, mode="wb")
-            self.temp_path = temp.name
-            temp.close()  # Close sync file, we'll use async version
+            temp_file_index.start_writing(self.temp_path)
 
             # Generate download path immediately
             self.download_path = f"/download/{os.path.basename(self.temp_path)}"
@@ -116,9 +248,12 @@ class TempFileWriter:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         try:
-            if self.temp_file and not self._finalized:
-                await self.temp_file.close()
+            if self._fd is not None and not self._finalized:
                 self._finalized = True
+                fd, self._fd = self._fd, None
+                await asyncio.to_thread(_write_and_close, fd, self._buffer)
+                # Index the partial file so the limits still clean it up
+                temp_file_index.add(self.temp_path, self._hash.hexdigest())
         except Exception as e:
             logger.error(f"Error closing temp file: {e}")
             self._write_error = True
@@ -133,12 +268,17 @@ class TempFileWriter:
             raise RuntimeError("Cannot write to finalized temp file")
 
         # Skip writing if we've already encountered an error
-        if self._write_error or not self.temp_file:
+        if self._write_error or self._fd is None:
+            return
+
+        self._buffer += chunk
+        self._hash.update(chunk)
+        if len(self._buffer) < settings.temp_file_flush_bytes:
             return
 
+        data, self._buffer = self._buffer, bytearray()
         try:
-            await self.temp_file.write(chunk)
-            await self.temp_file.flush()
+            await asyncio.to_thread(_write_all, self._fd, data)
         except Exception as e:
             # Handle permission issues or other errors gracefully
             logger.error(f"Failed to write to temp file: {e}")
@@ -154,17 +294,58 @@ class TempFileWriter:
             raise RuntimeError("Temp file already finalized")
 
         # Skip finalizing if we've already encountered an error
-        if self._write_error or not self.temp_file:
+        if self._write_error or self._fd is None:
             self._finalized = True
             return self.download_path
 
         try:
-            await self.temp_file.close()
             self._finalized = True
+            fd, self._fd = self._fd, None
+            await asyncio.to_thread(_write_and_close, fd, self._buffer)
+            self._buffer = bytearray()
+            temp_file_index.add(self.temp_path, self._hash.hexdigest())
+            await temp_file_index.enforce_limits()
         except Exception as e:
             # Handle permission issues or other errors gracefully
             logger.error(f"Failed to finalize temp file: {e}")
             self._write_error = True
-            self._finalized = True
 
         return self.download_path
+
+
+class DownloadEncoder(BackgroundEncoder):
+    """Encodes streamed audio into a download copy in its own format.
+
+    Chunks are queued and encoded in order on a worker thread, so the copy is
+    made alongside the stream from the same audio without a second synthesis.
+    """
+
+    def __init__(
+        self,
+        temp_writer: TempFileWriter,
+        output_format: str,
+        output_sample_rate: Optional[int] = None,
+    ):
+        """Initialize download encoder
+
+        Args:
+            temp_writer: Entered temp file writer for the download
+            output_format: Format to encode the download in
+            output_sample_rate: Sample rate to encode at, see StreamingAudioWriter
+        """
+        self.temp_writer = temp_writer
+        super().__init__(
+            StreamingAudioWriter(
+                output_format, sample_rate=24000, output_sample_rate=output_sample_rate
+            ),
+            temp_writer.write,
+        )
+
+    async def finalize(self) -> str:
+        """Encode the remaining audio and finalize the download
+
+        Returns:
+            Path to use for downloading the temp file
+        """
+        await self.finish()
+        return await self.temp_writer.finalize()
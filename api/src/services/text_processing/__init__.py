@@ -1,12 +1,14 @@
 """Text processing pipeline."""
 
+from array import array
+
 from .normalizer import normalize_text
 from .phonemizer import phonemize
 from .text_processor import process_text_chunk, smart_split
 from .vocabulary import tokenize
 
 
-def process_text(text: str) -> list[int]:
+def process_text(text: str) -> array:
     """Process text into token IDs (for backward compatibility)."""
     return process_text_chunk(text)
 
@@ -6,14 +6,16 @@ Converts them into a format suitable for text-to-speech processing.
 
 import math
 import re
+import threading
 from functools import lru_cache
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
 import inflect
 from numpy import number
 # from text_to_num import text2num
 from torch import mul
 
+from ...core.config import settings
 from ...structures.schemas import NormalizationOptions
 
 # Constants
@@ -187,8 +189,178 @@ NUMBER_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+PHONE_PATTERN = re.compile(
+    r"(\+?\d{1,2})?([ .-]?)(\(?\d{3}\)?)[\s.-](\d{3})[\s.-](\d{4})"
+)
+
+DECIMAL_PATTERN = re.compile(r"\d*\.\d+")
+THOUSANDS_SEPARATOR_PATTERN = re.compile(r"(?<=\d),(?=\d)")
+DIGIT_PATTERN = re.compile(r"\d")
+# Any whitespace other than a single plain space
+IRREGULAR_WHITESPACE_PATTERN = re.compile(r"[^\S ]|  ")
+POSSESSIVE_PATTERN = re.compile(r"(?<=[BCDFGHJ-NP-TV-Z])'?s\b")
+X_POSSESSIVE_PATTERN = re.compile(r"(?<=X')S\b")
+
+# Cheap test for anything URL_PATTERN could match
+URL_HINT_PATTERN = re.compile(
+    r"localhost|\.(?:" + "|".join(VALID_TLDS) + r")|\d\.\d", re.IGNORECASE
+)
+
+# Single-character replacements, each applied in one scan
+PUNCTUATION_REPLACEMENTS = {
+    chr(8216): "'",
+    chr(8217): "'",
+    "«": '"',
+    "»": '"',
+    chr(8220): '"',
+    chr(8221): '"',
+    **{a: b + " " for a, b in zip("、。！，：；？–", ",.!,:;?-")},
+}
+PUNCTUATION_PATTERN = re.compile(
+    "[" + re.escape("".join(PUNCTUATION_REPLACEMENTS)) + "]"
+)
+SYMBOL_PATTERN = re.compile("[" + re.escape("".join(SYMBOL_REPLACEMENTS)) + "]")
+MONEY_SYMBOLS = tuple(MONEY_UNITS.keys())
+
 INFLECT_ENGINE = inflect.engine()
 
+# number_to_words keeps per-call state on the engine (_number_args,
+# mill_count), so other threads, like the startup warmup, get their own
+_thread_engines = threading.local()
+_thread_engines.engine = INFLECT_ENGINE
+
+
+def inflect_engine() -> inflect.engine:
+    """The calling thread's inflect engine"""
+    engine = getattr(_thread_engines, "engine", None)
+    if engine is None:
+        engine = _thread_engines.engine = inflect.engine()
+    return engine
+
+
+# inflect is slow, so its results are memoized and shared across requests.
+# Numbers are keyed on their string form, which is what inflect converts them to.
+@lru_cache(maxsize=settings.verbalization_cache_size)
+def number_to_words(number: str, group: int = 0, comma: str = ",") -> str:
+    """Cached inflect number_to_words"""
+    return inflect_engine().number_to_words(number, group=group, comma=comma)
+
+
+# Typed, since inflect treats a count of 1 and 1.0 differently
+@lru_cache(maxsize=settings.verbalization_cache_size, typed=True)
+def plural(word: str, count: Union[int, float, str]) -> str:
+    """Cached inflect plural"""
+    return inflect_engine().plural(word, count=count)
+
+
+@lru_cache(maxsize=settings.verbalization_cache_size, typed=True)
+def no(word: str, count: Union[int, float, str]) -> str:
+    """Cached inflect no"""
+    return inflect_engine().no(word, count)
+
+
+def warm_verbalization_cache() -> None:
+    """Precompute verbalizations for common numbers, years and clock times
+
+    Safe to run in a worker thread while requests are served, since that
+    thread verbalizes with its own inflect engine.
+    """
+    for i in range(10000):
+        number_to_words(str(i))
+    # Zero padded halves of split years (19|05) and clock times (10:05)
+    for i in range(100):
+        number_to_words(f"{i:02d}")
+    for i in range(60):
+        plural("second", i)
+    for bill, coin in MONEY_UNITS.values():
+        for i in range(100):
+            plural(bill, float(i))
+            plural(coin, i)
+
+
+class FusedRules:
+    """Applies an ordered list of regex rules with a single combined scan.
+
+    The rules are joined into one alternation and each match is dispatched to
+    its rule's handler by group name. This matches running the rules one after
+    another as long as they never overlap and every replacement keeps its first
+    character. The only remaining interaction is a match starting exactly where
+    another one ended, where a sequential pass would see the rewritten text; in
+    that rare case the rules are re-applied sequentially.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[str, Callable[[str], str]]],
+        lookahead: Optional[str] = None,
+    ):
+        """Initialize fused rules
+
+        Args:
+            rules: Ordered (pattern, handler) pairs, handlers get the matched text
+            lookahead: Optional pattern every match starts with, used to skip
+                positions quickly
+        """
+        self._patterns = [re.compile(pattern) for pattern, _ in rules]
+        self._handlers = {f"r{i}": handler for i, (_, handler) in enumerate(rules)}
+        combined = "|".join(
+            f"(?P<r{i}>{pattern})" for i, (pattern, _) in enumerate(rules)
+        )
+        if lookahead:
+            combined = f"(?={lookahead})(?:{combined})"
+        self._combined = re.compile(combined)
+
+    def sub(self, text: str) -> str:
+        """Apply all rules to text"""
+        last_end = -1
+        adjacent = False
+
+        def dispatch(m: re.Match[str]) -> str:
+            nonlocal last_end, adjacent
+            if m.start() == last_end:
+                adjacent = True
+            last_end = m.end()
+            return self._handlers[m.lastgroup](m.group())
+
+        result = self._combined.sub(dispatch, text)
+        if not adjacent:
+            return result
+
+        for pattern, handler in zip(self._patterns, self._handlers.values()):
+            text = pattern.sub(lambda m: handler(m.group()), text)
+        return text
+
+
+# Titles, abbreviations and common words
+TITLE_RULES = FusedRules(
+    [
+        (r"\bD[Rr]\.(?= [A-Z])", lambda s: "Doctor"),
+        (r"\b(?:Mr\.|MR\.(?= [A-Z]))", lambda s: "Mister"),
+        (r"\b(?:Ms\.|MS\.(?= [A-Z]))", lambda s: "Miss"),
+        (r"\b(?:Mrs\.|MRS\.(?= [A-Z]))", lambda s: "Mrs"),
+        (r"\betc\.(?! [A-Z])", lambda s: "etc"),
+        (r"(?i:\byeah?\b)", lambda s: s[0] + "e'a"),
+    ],
+    lookahead=r"[DMeyY]",
+)
+
+# Ranges and plurals directly after digits
+DIGIT_FORMAT_RULES = FusedRules(
+    [
+        (r"(?<=\d)-(?=\d)", lambda s: " to "),
+        (r"(?<=\d)S", lambda s: " S"),
+    ]
+)
+
+# Dotted initials and acronyms
+ACRONYM_RULES = FusedRules(
+    [
+        (r"(?:[A-Za-z]\.){2,} [a-z]", lambda s: s.replace(".", "-")),
+        (r"(?i:(?<=[A-Z])\.(?=[A-Z]))", lambda s: "-"),
+    ],
+    lookahead=r"[A-Za-z]\.|\.",
+)
+
 
 def handle_units(u: re.Match[str]) -> str:
     """Converts units to their full form"""
@@ -205,7 +377,7 @@ def handle_units(u: re.Match[str]) -> str:
                 unit[0] = unit[0][:-3] + "byte"
 
         number = u.group(1).strip()
-        unit[0] = INFLECT_ENGINE.no(unit[0], number)
+        unit[0] = no(unit[0], number)
     return " ".join(unit)
 
 
@@ -232,7 +404,7 @@ def translate_multiplier(multiplier: str) -> str:
 def split_four_digit(number: float):
     part1 = str(conditional_int(number))[:2]
     part2 = str(conditional_int(number))[2:]
-    return f"{INFLECT_ENGINE.number_to_words(part1)} {INFLECT_ENGINE.number_to_words(part2)}"
+    return f"{number_to_words(part1)} {number_to_words(part2)}"
 
 
 def handle_numbers(n: re.Match[str]) -> str:
@@ -260,7 +432,7 @@ def handle_numbers(n: re.Match[str]) -> str:
         ):
             return split_four_digit(number)
 
-    return f"{INFLECT_ENGINE.number_to_words(number)}{multiplier}"
+    return f"{number_to_words(str(number))}{multiplier}"
 
 
 def handle_money(m: re.Match[str]) -> str:
@@ -284,11 +456,11 @@ def handle_money(m: re.Match[str]) -> str:
         multiplier = f" {multiplier}"
 
     if number % 1 == 0 or multiplier != "":
-        text_number = f"{INFLECT_ENGINE.number_to_words(conditional_int(number))}{multiplier} {INFLECT_ENGINE.plural(bill, count=number)}"
+        text_number = f"{number_to_words(str(conditional_int(number)))}{multiplier} {plural(bill, number)}"
     else:
         sub_number = int(str(number).split(".")[-1].ljust(2, "0"))
 
-        text_number = f"{INFLECT_ENGINE.number_to_words(int(math.floor(number)))} {INFLECT_ENGINE.plural(bill, count=number)} and {INFLECT_ENGINE.number_to_words(sub_number)} {INFLECT_ENGINE.plural(coin, count=sub_number)}"
+        text_number = f"{number_to_words(str(int(math.floor(number))))} {plural(bill, number)} and {number_to_words(str(sub_number))} {plural(coin, sub_number)}"
 
     return text_number
 
@@ -363,15 +535,15 @@ def handle_phone_number(p: re.Match[str]) -> str:
     country_code = ""
     if p[0] is not None:
         p[0] = p[0].replace("+", "")
-        country_code += INFLECT_ENGINE.number_to_words(p[0])
+        country_code += number_to_words(p[0])
 
-    area_code = INFLECT_ENGINE.number_to_words(
+    area_code = number_to_words(
         p[2].replace("(", "").replace(")", ""), group=1, comma=""
     )
 
-    telephone_prefix = INFLECT_ENGINE.number_to_words(p[3], group=1, comma="")
+    telephone_prefix = number_to_words(p[3], group=1, comma="")
 
-    line_number = INFLECT_ENGINE.number_to_words(p[4], group=1, comma="")
+    line_number = number_to_words(p[4], group=1, comma="")
 
     return ",".join([country_code, area_code, telephone_prefix, line_number])
 
@@ -382,9 +554,9 @@ def handle_time(t: re.Match[str]) -> str:
     time_parts = t[0].split(":")
 
     numbers = []
-    numbers.append(INFLECT_ENGINE.number_to_words(time_parts[0].strip()))
+    numbers.append(number_to_words(time_parts[0].strip()))
 
-    minute_number = INFLECT_ENGINE.number_to_words(time_parts[1].strip())
+    minute_number = number_to_words(time_parts[1].strip())
     if int(time_parts[1]) < 10:
         if int(time_parts[1]) != 0:
             numbers.append(f"oh {minute_number}")
@@ -393,8 +565,8 @@ def handle_time(t: re.Match[str]) -> str:
 
     half = ""
     if len(time_parts) > 2:
-        seconds_number = INFLECT_ENGINE.number_to_words(time_parts[2].strip())
-        second_word = INFLECT_ENGINE.plural("second", int(time_parts[2].strip()))
+        seconds_number = number_to_words(time_parts[2].strip())
+        second_word = plural("second", int(time_parts[2].strip()))
         numbers.append(f"and {seconds_number} {second_word}")
     else:
         if t[2] is not None:
@@ -407,93 +579,76 @@ def handle_time(t: re.Match[str]) -> str:
 
 
 def normalize_text(text: str, normalization_options: NormalizationOptions) -> str:
-    """Normalize text for TTS processing"""
-    
+    """Normalize text for TTS processing
+
+    Rule families are skipped entirely when the text cannot contain a match
+    (no digits, no "@", no URL-like dot and so on), so plain prose only pays
+    for a handful of scans.
+    """
+    has_digits = DIGIT_PATTERN.search(text) is not None
+
     # Handle email addresses first if enabled
-    if normalization_options.email_normalization:
+    if normalization_options.email_normalization and "@" in text:
         text = EMAIL_PATTERN.sub(handle_email, text)
 
     # Handle URLs if enabled
-    if normalization_options.url_normalization:
+    if normalization_options.url_normalization and URL_HINT_PATTERN.search(text):
         text = URL_PATTERN.sub(handle_url, text)
 
     # Pre-process numbers with units if enabled
-    if normalization_options.unit_normalization:
+    if normalization_options.unit_normalization and has_digits:
         text = UNIT_PATTERN.sub(handle_units, text)
 
     # Replace optional pluralization
     if normalization_options.optional_pluralization_normalization:
-        text = re.sub(r"\(s\)", "s", text)
+        text = text.replace("(s)", "s")
 
     # Replace phone numbers:
-    if normalization_options.phone_normalization:
-        text = re.sub(
-            r"(\+?\d{1,2})?([ .-]?)(\(?\d{3}\)?)[\s.-](\d{3})[\s.-](\d{4})",
-            handle_phone_number,
-            text,
-        )
+    if normalization_options.phone_normalization and has_digits:
+        text = PHONE_PATTERN.sub(handle_phone_number, text)
 
-    # Replace quotes and brackets (additional cleanup)
-    text = text.replace(chr(8216), "'").replace(chr(8217), "'")
-    text = text.replace("«", chr(8220)).replace("»", chr(8221))
-    text = text.replace(chr(8220), '"').replace(chr(8221), '"')
-
-    # Handle CJK punctuation and some non standard chars
-    for a, b in zip("、。！，：；？–", ",.!,:;?-"):
-        text = text.replace(a, b + " ")
+    # Replace quotes and brackets, CJK punctuation and some non standard chars
+    text = PUNCTUATION_PATTERN.sub(lambda m: PUNCTUATION_REPLACEMENTS[m.group()], text)
 
     # Handle simple time in the format of HH:MM:SS (am/pm)
-    text = TIME_PATTERN.sub(
-        handle_time,
-        text,
-    )
+    if has_digits:
+        text = TIME_PATTERN.sub(handle_time, text)
+
+    # Clean up whitespace and replace newlines with spaces
+    if IRREGULAR_WHITESPACE_PATTERN.search(text):
+        text = re.sub(r"[^\S \n]", " ", text)
+        text = re.sub(r"  +", " ", text)
+        text = re.sub(r"(?<=\n) +(?=\n)", "", text)
+        text = text.replace("\n", " ")
 
-    # Clean up whitespace
-    text = re.sub(r"[^\S \n]", " ", text)
-    text = re.sub(r"  +", " ", text)
-    text = re.sub(r"(?<=\n) +(?=\n)", "", text)
-
-    # Handle special characters that might cause audio artifacts first
-    # Replace newlines with spaces (or pauses if needed)
-    text = text.replace('\n', ' ')
-    text = text.replace('\r', ' ')
-    
-    # Handle titles and abbreviations
-    text = re.sub(r"\bD[Rr]\.(?= [A-Z])", "Doctor", text)
-    text = re.sub(r"\b(?:Mr\.|MR\.(?= [A-Z]))", "Mister", text)
-    text = re.sub(r"\b(?:Ms\.|MS\.(?= [A-Z]))", "Miss", text)
-    text = re.sub(r"\b(?:Mrs\.|MRS\.(?= [A-Z]))", "Mrs", text)
-    text = re.sub(r"\betc\.(?! [A-Z])", "etc", text)
-
-    # Handle common words
-    text = re.sub(r"(?i)\b(y)eah?\b", r"\1e'a", text)
+    # Handle titles, abbreviations and common words
+    text = TITLE_RULES.sub(text)
 
     # Handle numbers and money BEFORE replacing special characters
-    text = re.sub(r"(?<=\d),(?=\d)", "", text)
+    if has_digits:
+        text = THOUSANDS_SEPARATOR_PATTERN.sub("", text)
 
-    text = MONEY_PATTERN.sub(
-        handle_money,
-        text,
-    )
+        if any(symbol in text for symbol in MONEY_SYMBOLS):
+            text = MONEY_PATTERN.sub(handle_money, text)
 
-    text = NUMBER_PATTERN.sub(handle_numbers, text)
+        text = NUMBER_PATTERN.sub(handle_numbers, text)
 
-    text = re.sub(r"\d*\.\d+", handle_decimal, text)
+        has_digits = DIGIT_PATTERN.search(text) is not None
+        if has_digits:
+            text = DECIMAL_PATTERN.sub(handle_decimal, text)
 
     # Handle other problematic symbols AFTER money/number processing
     if normalization_options.replace_remaining_symbols:
-        for symbol, replacement in SYMBOL_REPLACEMENTS.items():
-            text = text.replace(symbol, replacement)
+        text = SYMBOL_PATTERN.sub(lambda m: SYMBOL_REPLACEMENTS[m.group()], text)
 
     # Handle various formatting
-    text = re.sub(r"(?<=\d)-(?=\d)", " to ", text)
-    text = re.sub(r"(?<=\d)S", " S", text)
-    text = re.sub(r"(?<=[BCDFGHJ-NP-TV-Z])'?s\b", "'S", text)
-    text = re.sub(r"(?<=X')S\b", "s", text)
-    text = re.sub(
-        r"(?:[A-Za-z]\.){2,} [a-z]", lambda m: m.group().replace(".", "-"), text
-    )
-    text = re.sub(r"(?i)(?<=[A-Z])\.(?=[A-Z])", "-", text)
+    if has_digits:
+        text = DIGIT_FORMAT_RULES.sub(text)
+    text = POSSESSIVE_PATTERN.sub("'S", text)
+    if "X'" in text:
+        text = X_POSSESSIVE_PATTERN.sub("s", text)
+    if "." in text:
+        text = ACRONYM_RULES.sub(text)
 
     text = re.sub(r"\s{2,}", " ", text)
 
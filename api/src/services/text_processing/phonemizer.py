@@ -1,12 +1,20 @@
+import queue
 import re
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
 
 import phonemizer
 
+from ...core.config import settings
 from .normalizer import normalize_text
 from ...structures.schemas import NormalizationOptions
 
-phonemizers = {}
+# Don't split a batch across workers below this many texts per worker
+MIN_TEXTS_PER_WORKER = 8
 
 
 class PhonemizerBackend(ABC):
@@ -24,6 +32,17 @@ class PhonemizerBackend(ABC):
         """
         pass
 
+    def phonemize_batch(self, texts: List[str]) -> List[str]:
+        """Convert several texts to phonemes
+
+        Args:
+            texts: Texts to convert to phonemes
+
+        Returns:
+            Phonemized texts, one per input
+        """
+        return [self.phonemize(text) for text in texts]
+
 
 class EspeakBackend(PhonemizerBackend):
     """Espeak-based phonemizer implementation"""
@@ -52,7 +71,37 @@ class EspeakBackend(PhonemizerBackend):
         # Phonemize text
         ps = self.backend.phonemize([text])
         ps = ps[0] if ps else ""
+        return self._postprocess(ps)
 
+    def phonemize_batch(self, texts: List[str]) -> List[str]:
+        """Convert several texts to phonemes in a single espeak call
+
+        Args:
+            texts: Texts to convert to phonemes
+
+        Returns:
+            Phonemized texts, one per input
+        """
+        results = [""] * len(texts)
+        # espeak drops empty utterances and treats every line as one, so only
+        # non-empty single line texts keep their position in a batched call
+        batched = [i for i, text in enumerate(texts) if text.strip() and "\n" not in text]
+        single = [i for i, text in enumerate(texts) if text.strip() and "\n" in text]
+
+        if batched:
+            ps_list = self.backend.phonemize([texts[i] for i in batched])
+            if len(ps_list) == len(batched):
+                for i, ps in zip(batched, ps_list):
+                    results[i] = self._postprocess(ps)
+            else:
+                single.extend(batched)
+
+        for i in single:
+            results[i] = self.phonemize(texts[i])
+        return results
+
+    def _postprocess(self, ps: str) -> str:
+        """Apply Kokoro specific fixes to raw espeak output"""
         # Handle special cases
         ps = ps.replace("kəkˈoːɹoʊ", "kˈoʊkəɹoʊ").replace("kəkˈɔːɹəʊ", "kˈəʊkəɹəʊ")
         ps = ps.replace("ʲ", "j").replace("r", "ɹ").replace("x", "k").replace("ɬ", "l")
@@ -84,6 +133,147 @@ def create_phonemizer(language: str = "a") -> PhonemizerBackend:
     return EspeakBackend(lang_map[language])
 
 
+class PhonemizerPool:
+    """Fixed-size pool of phonemizer backends for one language.
+
+    Backends are not safe for concurrent use, so each call checks one out for
+    its duration. Backends are created lazily up to the pool size; when all of
+    them are busy callers block until one is returned.
+    """
+
+    def __init__(self, language: str, size: int):
+        """Initialize pool.
+
+        Args:
+            language: Language code passed to create_phonemizer
+            size: Maximum number of backends
+        """
+        self.language = language
+        self.size = max(1, size)
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # Metrics
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait_s = 0.0
+        self._max_wait_s = 0.0
+
+    def _acquire(self) -> PhonemizerBackend:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return create_phonemizer(self.language)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get()
+
+    @contextmanager
+    def checkout(self) -> Iterator[PhonemizerBackend]:
+        """Borrow a backend for the duration of the context."""
+        start = time.perf_counter()
+        backend = self._acquire()
+        wait = time.perf_counter() - start
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait_s += wait
+            self._max_wait_s = max(self._max_wait_s, wait)
+            if wait > 0.001:
+                self._waits += 1
+        try:
+            yield backend
+        finally:
+            self._idle.put(backend)
+
+    def phonemize_batch(self, texts: List[str]) -> List[str]:
+        """Phonemize texts, fanning out over the pool's backends.
+
+        Args:
+            texts: Texts to convert to phonemes
+
+        Returns:
+            Phonemized texts, one per input
+        """
+        workers = min(self.size, len(texts) // MIN_TEXTS_PER_WORKER)
+        if workers <= 1:
+            with self.checkout() as backend:
+                return backend.phonemize_batch(texts)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.size,
+                    thread_name_prefix=f"phonemizer-{self.language}",
+                )
+
+        # Contiguous slices so results concatenate back in input order
+        step = -(-len(texts) // workers)
+        slices = [texts[i : i + step] for i in range(0, len(texts), step)]
+
+        def run(part: List[str]) -> List[str]:
+            with self.checkout() as backend:
+                return backend.phonemize_batch(part)
+
+        results = []
+        for part in self._executor.map(run, slices):
+            results.extend(part)
+        return results
+
+    def stats(self) -> Dict[str, float]:
+        """Get pool usage and checkout wait-time metrics."""
+        with self._lock:
+            return {
+                "language": self.language,
+                "size": self.size,
+                "created": self._created,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "total_wait_ms": self._total_wait_s * 1000,
+                "avg_wait_ms": (
+                    self._total_wait_s * 1000 / self._checkouts
+                    if self._checkouts
+                    else 0.0
+                ),
+                "max_wait_ms": self._max_wait_s * 1000,
+            }
+
+
+phonemizer_pools: Dict[str, PhonemizerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_phonemizer_pool(language: str = "a") -> PhonemizerPool:
+    """Get the shared backend pool for a language
+
+    Args:
+        language: Language code ('a' for US English, 'b' for British English)
+
+    Returns:
+        Phonemizer pool for the language
+    """
+    pool = phonemizer_pools.get(language)
+    if pool is None:
+        with _pools_lock:
+            pool = phonemizer_pools.get(language)
+            if pool is None:
+                pool = PhonemizerPool(language, settings.phonemizer_pool_size)
+                phonemizer_pools[language] = pool
+    return pool
+
+
 def phonemize(text: str, language: str = "a") -> str:
     """Convert text to phonemes
 
@@ -94,14 +284,25 @@ def phonemize(text: str, language: str = "a") -> str:
     Returns:
         Phonemized text
     """
-    global phonemizers
-    
     # Strip input text first to remove problematic leading/trailing spaces
     text = text.strip()
-    
-    if language not in phonemizers:
-        phonemizers[language] = create_phonemizer(language)
-    
-    result = phonemizers[language].phonemize(text)
+
+    with get_phonemizer_pool(language).checkout() as backend:
+        result = backend.phonemize(text)
     # Final strip to ensure no leading/trailing spaces in phonemes
     return result.strip()
+
+
+def phonemize_batch(texts: List[str], language: str = "a") -> List[str]:
+    """Convert several texts to phonemes, spread over the language's pool
+
+    Args:
+        texts: Texts to convert to phonemes
+        language: Language code ('a' for US English, 'b' for British English)
+
+    Returns:
+        Phonemized texts, one per input
+    """
+    texts = [text.strip() for text in texts]
+    pool = get_phonemizer_pool(language)
+    return [ps.strip() for ps in pool.phonemize_batch(texts)]
@@ -1,67 +1,68 @@
-import json
-import os
 import re
+from typing import Mapping, Optional, Tuple
 
-PRONUNCIATIONS_DICT_PATH = os.getenv("PRONUNCIATION_DICT_PATH", "/app/api/pronunciations.json")
+from ...core.pronunciations import pronunciation_store
 
-_pronunciations: dict[str, str] = {}
+# Matcher for the current dictionary words and the entries it was built from,
+# replaced as one tuple whenever the store changes
+_matcher: Optional[Tuple[re.Pattern[str], Mapping[str, str]]] = None
+
+
+def _on_pronunciations_changed(entries: Mapping[str, str], version: int) -> None:
+    """Rebuild the word matcher for a new dictionary version."""
+    global _matcher
+    words = [word for word in entries if re.fullmatch(r"\w+", word)]
+    if not words:
+        _matcher = None
+        return
+    words.sort(key=len, reverse=True)
+    pattern = re.compile(
+        r"\b(?:" + "|".join(map(re.escape, words)) + r")\b", re.IGNORECASE
+    )
+    _matcher = (pattern, entries)
 
 
 def load_pronunciations() -> None:
-    """Load pronunciation dictionary from disk if available."""
-    global _pronunciations
-    if os.path.exists(PRONUNCIATIONS_DICT_PATH):
-        try:
-            with open(PRONUNCIATIONS_DICT_PATH, "r", encoding="utf-8") as f:
-                _pronunciations = json.load(f)
-        except Exception:
-            _pronunciations = {}
-    else:
-        _pronunciations = {}
+    """Reload pronunciation dictionary from disk."""
+    pronunciation_store.load()
 
 
 def save_pronunciations() -> None:
     """Persist pronunciation dictionary to disk."""
-    with open(PRONUNCIATIONS_DICT_PATH, "w", encoding="utf-8") as f:
-        json.dump(_pronunciations, f, ensure_ascii=False, indent=2)
+    pronunciation_store.save()
 
 
 def get_pronunciations() -> dict[str, str]:
     """Get current pronunciation dictionary."""
-    return _pronunciations
+    return dict(pronunciation_store.entries)
 
 
 def update_pronunciation(word: str, phonemes: str) -> None:
     """Add or update a word pronunciation and save."""
-    if not word or not phonemes:
-        raise ValueError("Word and phonemes must be provided")
-    _pronunciations[word.lower()] = phonemes
-    save_pronunciations()
+    pronunciation_store.update(word, phonemes)
 
 
 def delete_pronunciation(word: str) -> None:
     """Remove a word pronunciation from the dictionary and save."""
-    if not word:
-        raise ValueError("Word must be provided")
-    lowered = word.lower()
-    if lowered in _pronunciations:
-        del _pronunciations[lowered]
-        save_pronunciations()
+    pronunciation_store.delete(word)
+
 
 def apply_pronunciations(text: str) -> str:
     """Apply dictionary pronunciations using custom phoneme syntax."""
-    if not _pronunciations:
+    matcher = _matcher
+    if matcher is None:
         return text
 
+    pattern, entries = matcher
+
     def repl(match: re.Match[str]) -> str:
         word = match.group(0)
-        phon = _pronunciations.get(word.lower())
+        phon = entries.get(word.lower())
         if phon:
             return f"[{word}](/" + phon + "/)"
         return word
 
-    return re.sub(r"\b\w+\b", repl, text)
+    return pattern.sub(repl, text)
 
 
-# Load dictionary at import
-load_pronunciations()
+pronunciation_store.subscribe(_on_pronunciations_changed)
@@ -1,17 +1,21 @@
 """Unified text processing for TTS with smart chunking."""
 
+import asyncio
 import re
 import time
-from typing import AsyncGenerator, Dict, List, Tuple, Optional
+from array import array
+from typing import AsyncGenerator, Dict, List, NamedTuple, Tuple, Optional
 
+import numpy as np
 from loguru import logger
 
 from ...core.config import settings
 from ...structures.schemas import NormalizationOptions
 from .normalizer import normalize_text
-from .phonemizer import phonemize
-from .vocabulary import tokenize
+from .phonemizer import phonemize, phonemize_batch
+from .vocabulary import VOCAB, tokenize
 from .pronunciation_dict import apply_pronunciations
+from .token_estimator import ExactTokenEstimator, TokenEstimator, get_token_estimator
 
 # Pre-compiled regex patterns for performance
 # Updated regex to be more strict and avoid matching isolated brackets
@@ -19,11 +23,30 @@ from .pronunciation_dict import apply_pronunciations
 CUSTOM_PHONEMES = re.compile(r"(\[[^\[\]]*?\])(\(\/[^\/\(\)]*?\/\))")
 # Pattern to find pause tags like [pause:0.5s]
 PAUSE_TAG_PATTERN = re.compile(r"\[pause:(\d+(?:\.\d+)?)s\]", re.IGNORECASE)
+# Placeholders standing in for custom phonemes during normalization
+CUSTOM_PHONEMES_ID_PATTERN = re.compile(r"</\|custom_phonemes_\d+\|/>")
+# Boundaries where streamed text can be released for synthesis. A period only
+# counts once whitespace follows it, and not after common titles like "Mr."
+STREAM_SENTENCE_END = re.compile(
+    r"(?<!\b[MD]r)(?<!\bMrs)(?<!\bMs)[.!?;:](?=\s)|[。！？；]", re.IGNORECASE
+)
+STREAM_CLAUSE_END = re.compile(r",(?=\s)|，")
+# espeak keeps commas and word gaps, so they mark clause/word ends in tokens
+COMMA_TOKEN = VOCAB[","]
+SPACE_TOKEN = VOCAB[" "]
+
+
+class Segment(NamedTuple):
+    """Part of a sentence and its [start, end) slice of the sentence tokens"""
+
+    text: str
+    start: int
+    end: int
 
 
 def process_text_chunk(
     text: str, language: str = "a", skip_phonemize: bool = False
-) -> List[int]:
+) -> array:
     """Process a chunk of text through normalization, phonemization, and tokenization.
 
     Args:
@@ -32,7 +55,7 @@ def process_text_chunk(
         skip_phonemize: If True, treat input as phonemes and skip normalization/phonemization
 
     Returns:
-        List of token IDs
+        Array of int16 token IDs
     """
     start_time = time.time()
     
@@ -40,7 +63,7 @@ def process_text_chunk(
     text = text.strip()
 
     if not text:
-        return []
+        return array("h")
 
     # Replace words with custom pronunciations if available
     text = apply_pronunciations(text)
@@ -73,9 +96,32 @@ def process_text_chunk(
     return tokens
 
 
+def process_text_chunks(texts: List[str], language: str = "a") -> List[array]:
+    """Process several text chunks, phonemizing them in a single batch.
+
+    Args:
+        texts: Text chunks to process
+        language: Language code for phonemization
+
+    Returns:
+        Array of int16 token IDs for each chunk, in input order
+    """
+    start_time = time.time()
+
+    texts = [apply_pronunciations(text.strip()) for text in texts]
+    phonemes = phonemize_batch(texts, language)
+    tokens = [tokenize(ps) if text else array("h") for text, ps in zip(texts, phonemes)]
+
+    total_time = time.time() - start_time
+    logger.debug(
+        f"Batch processing took {total_time * 1000:.2f}ms for {len(texts)} chunks"
+    )
+    return tokens
+
+
 async def yield_chunk(
-    text: str, tokens: List[int], chunk_count: int
-) -> Tuple[str, List[int]]:
+    text: str, tokens: array, chunk_count: int
+) -> Tuple[str, array]:
     """Yield a chunk with consistent logging."""
     logger.debug(
         f"Yielding chunk {chunk_count}: '{text[:50]}{'...' if len(text) > 50 else ''}' ({len(tokens)} tokens)"
@@ -83,7 +129,7 @@ async def yield_chunk(
     return text, tokens
 
 
-def process_text(text: str, language: str = "a") -> List[int]:
+def process_text(text: str, language: str = "a") -> array:
     """Process text into token IDs.
 
     Args:
@@ -91,22 +137,22 @@ def process_text(text: str, language: str = "a") -> List[int]:
         language: Language code for phonemization
 
     Returns:
-        List of token IDs
+        Array of int16 token IDs
     """
     if not isinstance(text, str):
         text = str(text) if text is not None else ""
 
     text = text.strip()
     if not text:
-        return []
+        return array("h")
 
     return process_text_chunk(text, language)
 
 
-def get_sentence_info(
+def split_sentences(
     text: str, custom_phenomes_list: Dict[str, str], lang_code: str = "a"
-) -> List[Tuple[str, List[int], int]]:
-    """Process all sentences and return info"""
+) -> List[str]:
+    """Split text into sentences, restoring custom phoneme placeholders"""
     # Detect Chinese text
     is_chinese = lang_code.startswith("z") or re.search(r"[\u4e00-\u9fff]", text)
     if is_chinese:
@@ -114,18 +160,15 @@ def get_sentence_info(
         sentences = re.split(r"([，。！？；])+", text)
     else:
         sentences = re.split(r"([.!?;:])(?=\s|$)", text)
-    phoneme_length, min_value = len(custom_phenomes_list), 0
 
-    results = []
+    def restore(match: re.Match[str]) -> str:
+        return custom_phenomes_list.pop(match.group(0), match.group(0))
+
+    texts = []
     for i in range(0, len(sentences), 2):
         sentence = sentences[i].strip()
-        for replaced in range(min_value, phoneme_length):
-            current_id = f"</|custom_phonemes_{replaced}|/>"
-            if current_id in sentence:
-                sentence = sentence.replace(
-                    current_id, custom_phenomes_list.pop(current_id)
-                )
-                min_value += 1
+        if custom_phenomes_list and "</|" in sentence:
+            sentence = CUSTOM_PHONEMES_ID_PATTERN.sub(restore, sentence)
         punct = sentences[i + 1] if i + 1 < len(sentences) else ""
         if not sentence:
             continue
@@ -134,9 +177,231 @@ def get_sentence_info(
         full = full.strip()
         if not full:  # Skip if empty after stripping
             continue
-        tokens = process_text_chunk(full)
-        results.append((full, tokens, len(tokens)))
-    return results
+        texts.append(full)
+    return texts
+
+
+def split_clauses(sentence: str) -> List[str]:
+    """Split a sentence on commas, keeping each comma with its clause"""
+    clauses = re.split(r"([,])", sentence)
+    full_clauses = []
+    for j in range(0, len(clauses), 2):
+        clause = clauses[j].strip()
+        comma = clauses[j + 1] if j + 1 < len(clauses) else ""
+
+        if not clause:
+            continue
+
+        full_clauses.append(clause + comma)
+    return full_clauses
+
+
+def get_sentence_info(
+    text: str, custom_phenomes_list: Dict[str, str], lang_code: str = "a"
+) -> List[Tuple[str, array, int]]:
+    """Process all sentences and return info"""
+    texts = split_sentences(text, custom_phenomes_list, lang_code)
+
+    # Phonemize every sentence of the part in one call
+    return [
+        (full, tokens, len(tokens))
+        for full, tokens in zip(texts, process_text_chunks(texts))
+    ]
+
+
+def segment_clauses(sentence: str, tokens: array) -> Optional[List[Segment]]:
+    """Locate the comma clauses of a phonemized sentence in its tokens.
+
+    The n-th comma of the text is the n-th comma token. Returns None if the
+    counts differ and the clauses can't be aligned.
+    """
+    clauses = split_clauses(sentence)
+    ids = np.frombuffer(tokens, dtype=np.int16)
+    ends = [int(i) + 1 for i in np.flatnonzero(ids == COMMA_TOKEN)]
+    if clauses and not clauses[-1].endswith(","):
+        ends.append(len(ids))
+    if not clauses or len(ends) != len(clauses):
+        return None
+
+    segments = []
+    start = 0
+    for clause, end in zip(clauses, ends):
+        while start < end and ids[start] == SPACE_TOKEN:
+            start += 1
+        segments.append(Segment(clause, start, end))
+        start = end
+    return segments
+
+
+def segment_words(segment: Segment, tokens: array) -> Optional[List[Segment]]:
+    """Split a segment into words, or None if text and phoneme words differ."""
+    words = segment.text.split()
+    ids = np.frombuffer(tokens, dtype=np.int16)[segment.start : segment.end]
+    gaps = [int(i) for i in np.flatnonzero(ids == SPACE_TOKEN)]
+    if len(gaps) + 1 != len(words):
+        return None
+
+    starts = [0] + [gap + 1 for gap in gaps]
+    ends = gaps + [len(ids)]
+    return [
+        Segment(word, segment.start + start, segment.start + end)
+        for word, start, end in zip(words, starts, ends)
+    ]
+
+
+def cut_sentence(
+    sentence: str, tokens: array, max_tokens: int, target_tokens: int
+) -> Optional[List[Tuple[str, array]]]:
+    """Cut a phonemized sentence at clause, then word, boundaries.
+
+    Slices the existing token array instead of phonemizing the pieces again.
+
+    Args:
+        sentence: Sentence text
+        tokens: Tokens of the whole sentence
+        max_tokens: Clauses longer than this are cut between words
+        target_tokens: Adjacent pieces are merged up to this size
+
+    Returns:
+        List of (text, tokens) pieces, or None if the text and its phonemes
+        can't be aligned
+    """
+    segments = segment_clauses(sentence, tokens)
+    if segments is None:
+        return None
+
+    pieces: List[Segment] = []
+    for segment in segments:
+        if segment.end - segment.start > max_tokens:
+            pieces.extend(segment_words(segment, tokens) or [segment])
+        else:
+            pieces.append(segment)
+
+    merged: List[Segment] = []
+    for piece in pieces:
+        if merged and piece.end - merged[-1].start <= target_tokens:
+            last = merged[-1]
+            merged[-1] = Segment(f"{last.text} {piece.text}", last.start, piece.end)
+        else:
+            merged.append(piece)
+    return [(segment.text, tokens[segment.start : segment.end]) for segment in merged]
+
+
+async def finalize_chunk(
+    texts: List[str],
+    max_tokens: int,
+    target_tokens: Optional[int] = None,
+    token_lists: Optional[List[array]] = None,
+) -> List[Tuple[str, array]]:
+    """Run exact G2P for a planned chunk, splitting it if estimates were too low.
+
+    Args:
+        texts: Sentences or clauses making up the planned chunk
+        max_tokens: Maximum tokens per chunk
+        target_tokens: Size to aim for when cutting an oversized sentence,
+            defaults to max_tokens
+        token_lists: Tokens of each text if already phonemized
+
+    Returns:
+        List of (chunk_text, tokens), normally a single entry
+    """
+    if token_lists is None:
+        token_lists = await asyncio.to_thread(process_text_chunks, texts)
+
+    chunks = []
+    chunk_texts: List[str] = []
+    chunk_tokens = array("h")
+    for text, tokens in zip(texts, token_lists):
+        pieces = [(text, tokens)]
+        if len(tokens) > max_tokens:
+            cut = cut_sentence(text, tokens, max_tokens, target_tokens or max_tokens)
+            clauses = split_clauses(text)
+            if cut is not None:
+                pieces = cut
+            elif len(clauses) > 1:
+                # Phonemes don't line up with the text, phonemize clauses instead
+                pieces = await finalize_chunk(clauses, max_tokens, target_tokens)
+
+        for piece_text, piece_tokens in pieces:
+            if chunk_texts and (
+                len(pieces) > 1 or len(chunk_tokens) + len(piece_tokens) > max_tokens
+            ):
+                chunks.append((" ".join(chunk_texts).strip(), chunk_tokens))
+                chunk_texts, chunk_tokens = [], array("h")
+            chunk_texts.append(piece_text)
+            chunk_tokens.extend(piece_tokens)
+
+    if chunk_texts:
+        chunks.append((" ".join(chunk_texts).strip(), chunk_tokens))
+    return chunks
+
+
+class TextStreamBuffer:
+    """Accumulates streamed text deltas and releases complete sentences.
+
+    A pending sentence that already exceeds max_tokens is released up to its
+    last clause boundary instead, matching where smart_split would cut it.
+    """
+
+    def __init__(
+        self, lang_code: str = "a", max_tokens: int = settings.absolute_max_tokens
+    ):
+        """Initialize buffer.
+
+        Args:
+            lang_code: Language code used to estimate token counts
+            max_tokens: Token count at which a sentence is released at a clause
+        """
+        self.max_tokens = max_tokens
+        self._estimator = get_token_estimator(lang_code)
+        self._buffer = ""
+
+    async def push(self, delta: str) -> Optional[str]:
+        """Add a text delta.
+
+        Args:
+            delta: Text to append
+
+        Returns:
+            Text ready for synthesis, or None if still waiting for a boundary
+        """
+        self._buffer += delta
+
+        end = 0
+        for end_match in STREAM_SENTENCE_END.finditer(self._buffer):
+            end = end_match.end()
+        if not end:
+            clause_end = 0
+            for end_match in STREAM_CLAUSE_END.finditer(self._buffer):
+                clause_end = end_match.end()
+            # Only estimate when there is a clause to release at
+            if clause_end and await self._upper_bound(self._buffer) > self.max_tokens:
+                end = clause_end
+        if not end:
+            return None
+
+        ready, self._buffer = self._buffer[:end].strip(), self._buffer[end:]
+        return ready or None
+
+    async def _upper_bound(self, text: str) -> int:
+        if self._estimator.runs_g2p:
+            return await asyncio.to_thread(self._estimator.upper_bound, text)
+        return self._estimator.upper_bound(text)
+
+    def flush(self) -> Optional[str]:
+        """Release everything buffered, boundary or not."""
+        ready, self._buffer = self._buffer.strip(), ""
+        return ready or None
+
+
+def estimate_counts(
+    estimator: TokenEstimator, sentences: List[str]
+) -> List[Tuple[int, int]]:
+    """Estimate (token count, upper bound) for each sentence"""
+    return [
+        (estimator.estimate(sentence), estimator.upper_bound(sentence))
+        for sentence in sentences
+    ]
 
 
 def handle_custom_phonemes(s: re.Match[str], phenomes_list: Dict[str, str]) -> str:
@@ -150,7 +415,7 @@ async def smart_split(
     max_tokens: int = settings.absolute_max_tokens,
     lang_code: str = "a",
     normalization_options: NormalizationOptions = NormalizationOptions(),
-) -> AsyncGenerator[Tuple[str, List[int], Optional[float]], None]:
+) -> AsyncGenerator[Tuple[str, array, Optional[float]], None]:
     """Build optimal chunks targeting 300-400 tokens, never exceeding max_tokens.
     
     Yields:
@@ -193,126 +458,130 @@ async def smart_split(
                         "Skipping text normalization as it is only supported for english"
                     )
 
-            # Process all sentences (original logic)
-            sentences = get_sentence_info(processed_text, custom_phoneme_list, lang_code=lang_code)
+            estimator = get_token_estimator(lang_code)
+            sentence_tokens: Optional[Dict[str, array]] = None
+            if isinstance(estimator, ExactTokenEstimator):
+                # Exact planning phonemizes the whole part in one batch, and
+                # the planned chunks reuse those tokens
+                info = await asyncio.to_thread(
+                    get_sentence_info, processed_text, custom_phoneme_list, lang_code
+                )
+                sentences = [full for full, _, _ in info]
+                counts = [(count, count) for _, _, count in info]
+                sentence_tokens = {full: tokens for full, tokens, _ in info}
+            else:
+                # Plan chunks from estimated token counts, exact G2P only runs
+                # on each planned chunk right before it is yielded
+                sentences = split_sentences(
+                    processed_text, custom_phoneme_list, lang_code
+                )
+                if estimator.runs_g2p:
+                    counts = await asyncio.to_thread(
+                        estimate_counts, estimator, sentences
+                    )
+                else:
+                    counts = estimate_counts(estimator, sentences)
+
+            def known_tokens(texts: List[str]) -> Optional[List[array]]:
+                if sentence_tokens is None:
+                    return None
+                return [sentence_tokens[text] for text in texts]
 
             current_chunk = []
-            current_tokens = []
             current_count = 0
+            current_bound = 0
+
+            for sentence, (count, bound) in zip(sentences, counts):
 
-            for sentence, tokens, count in sentences:
-                # Handle sentences that exceed max tokens (original logic)
-                if count > max_tokens:
+                # Handle sentences that may exceed max tokens
+                if bound > max_tokens:
                     # Yield current chunk if any
                     if current_chunk:
-                        chunk_text = " ".join(current_chunk).strip()
-                        chunk_count += 1
-                        logger.debug(
-                            f"Yielding chunk {chunk_count}: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({current_count} tokens)"
-                        )
-                        yield chunk_text, current_tokens, None
+                        for chunk_text, chunk_tokens in await finalize_chunk(
+                            current_chunk, max_tokens, token_lists=known_tokens(current_chunk)
+                        ):
+                            chunk_count += 1
+                            logger.debug(
+                                f"Yielding chunk {chunk_count}: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({len(chunk_tokens)} tokens)"
+                            )
+                            yield chunk_text, chunk_tokens, None
                         current_chunk = []
-                        current_tokens = []
                         current_count = 0
-
-                    # Split long sentence on commas (original logic)
-                    clauses = re.split(r"([,])", sentence)
-                    clause_chunk = []
-                    clause_tokens = []
-                    clause_count = 0
-
-                    for j in range(0, len(clauses), 2):
-                        clause = clauses[j].strip()
-                        comma = clauses[j + 1] if j + 1 < len(clauses) else ""
-
-                        if not clause:
-                            continue
-
-                        full_clause = clause + comma
-
-                        tokens = process_text_chunk(full_clause)
-                        count = len(tokens)
-
-                        # If adding clause keeps us under max and not optimal yet
-                        if (
-                            clause_count + count <= max_tokens
-                            and clause_count + count <= settings.target_max_tokens
-                        ):
-                            clause_chunk.append(full_clause)
-                            clause_tokens.extend(tokens)
-                            clause_count += count
-                        else:
-                            # Yield clause chunk if we have one
-                            if clause_chunk:
-                                chunk_text = " ".join(clause_chunk).strip()
-                                chunk_count += 1
-                                logger.debug(
-                                    f"Yielding clause chunk {chunk_count}: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({clause_count} tokens)"
-                                )
-                                yield chunk_text, clause_tokens, None
-                            clause_chunk = [full_clause]
-                            clause_tokens = tokens
-                            clause_count = count
-
-                    # Don't forget last clause chunk
-                    if clause_chunk:
-                        chunk_text = " ".join(clause_chunk).strip()
+                        current_bound = 0
+
+                    # Phonemize the sentence once and cut it at clause or
+                    # word boundaries by slicing its tokens
+                    for chunk_text, chunk_tokens in await finalize_chunk(
+                        [sentence],
+                        max_tokens,
+                        settings.target_max_tokens,
+                        known_tokens([sentence]),
+                    ):
                         chunk_count += 1
                         logger.debug(
-                            f"Yielding final clause chunk {chunk_count}: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({clause_count} tokens)"
+                            f"Yielding clause chunk {chunk_count}: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({len(chunk_tokens)} tokens)"
                         )
-                        yield chunk_text, clause_tokens, None
+                        yield chunk_text, chunk_tokens, None
 
-                # Regular sentence handling (original logic)
+                # Regular sentence handling
                 elif (
                     current_count >= settings.target_min_tokens
                     and current_count + count > settings.target_max_tokens
                 ):
                     # If we have a good sized chunk and adding next sentence exceeds target,
                     # yield current chunk and start new one
-                    chunk_text = " ".join(current_chunk).strip()
-                    chunk_count += 1
-                    logger.info(
-                        f"Yielding chunk {chunk_count}: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({current_count} tokens)"
-                    )
-                    yield chunk_text, current_tokens, None
+                    for chunk_text, chunk_tokens in await finalize_chunk(
+                        current_chunk, max_tokens, token_lists=known_tokens(current_chunk)
+                    ):
+                        chunk_count += 1
+                        logger.info(
+                            f"Yielding chunk {chunk_count}: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({len(chunk_tokens)} tokens)"
+                        )
+                        yield chunk_text, chunk_tokens, None
                     current_chunk = [sentence]
-                    current_tokens = tokens
                     current_count = count
-                elif current_count + count <= settings.target_max_tokens:
+                    current_bound = bound
+                elif (
+                    current_count + count <= settings.target_max_tokens
+                    and current_bound + bound <= max_tokens
+                ):
                     # Keep building chunk while under target max
                     current_chunk.append(sentence)
-                    current_tokens.extend(tokens)
                     current_count += count
+                    current_bound += bound
                 elif (
-                    current_count + count <= max_tokens
+                    current_bound + bound <= max_tokens
                     and current_count < settings.target_min_tokens
                 ):
                     # Only exceed target max if we haven't reached minimum size yet
                     current_chunk.append(sentence)
-                    current_tokens.extend(tokens)
                     current_count += count
+                    current_bound += bound
                 else:
                     # Yield current chunk and start new one
                     if current_chunk:
-                        chunk_text = " ".join(current_chunk).strip()
-                        chunk_count += 1
-                        logger.info(
-                            f"Yielding chunk {chunk_count}: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({current_count} tokens)"
-                        )
-                        yield chunk_text, current_tokens, None
+                        for chunk_text, chunk_tokens in await finalize_chunk(
+                            current_chunk, max_tokens, token_lists=known_tokens(current_chunk)
+                        ):
+                            chunk_count += 1
+                            logger.info(
+                                f"Yielding chunk {chunk_count}: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({len(chunk_tokens)} tokens)"
+                            )
+                            yield chunk_text, chunk_tokens, None
                     current_chunk = [sentence]
-                    current_tokens = tokens
                     current_count = count
+                    current_bound = bound
 
             # Don't forget the last chunk for this text part
             if current_chunk:
-                chunk_text = " ".join(current_chunk).strip()
-                chunk_count += 1
-                logger.info(
-                    f"Yielding final chunk {chunk_count} for part: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({current_count} tokens)"
-                )
-                yield chunk_text, current_tokens, None
+                for chunk_text, chunk_tokens in await finalize_chunk(
+                    current_chunk, max_tokens, token_lists=known_tokens(current_chunk)
+                ):
+                    chunk_count += 1
+                    logger.info(
+                        f"Yielding final chunk {chunk_count} for part: '{chunk_text[:50]}{'...' if len(processed_text) > 50 else ''}' ({len(chunk_tokens)} tokens)"
+                    )
+                    yield chunk_text, chunk_tokens, None
 
         # --- Handle Pause Part ---
         # Check if the next part is a pause duration string
@@ -326,7 +595,7 @@ async def smart_split(
                     if duration > 0:
                         chunk_count += 1
                         logger.info(f"Yielding pause chunk {chunk_count}: {duration}s")
-                        yield "", [], duration  # Yield pause chunk
+                        yield "", array("h"), duration  # Yield pause chunk
                 except (ValueError, TypeError):
                     # This case should be rare if re.fullmatch passed, but handle anyway
                     logger.warning(f"Could not parse valid-looking pause duration: {duration_str}")
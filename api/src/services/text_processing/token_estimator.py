@@ -0,0 +1,196 @@
+"""Token count estimation for chunk planning.
+
+smart_split only needs token counts to decide where chunks end, so instead of
+phonemizing every sentence up front it asks a TokenEstimator. The default is a
+linear model over cheap character/word counts, fitted per language with
+scripts/calibrate_token_estimator.py. Planned chunks are then phonemized
+exactly and split again if the estimate turned out too low. Estimators that
+run G2P set runs_g2p, and callers then move them off the event loop.
+"""
+
+import math
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Optional
+
+from ...core.config import settings
+from .phonemizer import phonemize
+from .pronunciation_dict import apply_pronunciations
+from .vocabulary import tokenize
+
+ASCII_LETTER_PATTERN = re.compile(r"[A-Za-z]")
+DIGIT_PATTERN = re.compile(r"[0-9]")
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+OTHER_CHAR_PATTERN = re.compile(r"[^\W\dA-Za-z_]")
+
+
+class TokenEstimator(ABC):
+    """Abstract base class for token count estimators"""
+
+    runs_g2p = False  # Whether estimates are slow enough to need a worker thread
+
+    @abstractmethod
+    def estimate(self, text: str) -> int:
+        """Estimate how many tokens text produces after G2P
+
+        Args:
+            text: Text to estimate
+
+        Returns:
+            Estimated token count
+        """
+        pass
+
+    def upper_bound(self, text: str) -> int:
+        """Token count the text is not expected to exceed
+
+        Args:
+            text: Text to estimate
+
+        Returns:
+            Upper bound on the token count
+        """
+        return self.estimate(text)
+
+
+class ExactTokenEstimator(TokenEstimator):
+    """Counts tokens by running the full G2P pipeline
+
+    Counts are cached by text, so upper_bound and repeated sentences do not
+    phonemize again.
+    """
+
+    runs_g2p = True
+
+    def __init__(self, language: str = "a", cache_size: int = 4096):
+        """Initialize estimator
+
+        Args:
+            language: Language code for phonemization
+            cache_size: Number of texts to keep counts for
+        """
+        self.language = language
+        self._count = lru_cache(maxsize=cache_size)(self._phonemize_count)
+
+    def _phonemize_count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(tokenize(phonemize(text, self.language)))
+
+    def estimate(self, text: str) -> int:
+        # Cached after pronunciations are applied, so edits to them take effect
+        return self._count(apply_pronunciations(text.strip()))
+
+    def upper_bound(self, text: str) -> int:
+        return self.estimate(text)
+
+
+class LinearTokenEstimator(TokenEstimator):
+    """Linear model of token count over character and word counts
+
+    The upper bound is ``estimate * ratio + slack``, with ratio and slack taken
+    from the worst case seen on the calibration corpus.
+    """
+
+    def __init__(
+        self,
+        letter: float,
+        word: float,
+        punctuation: float,
+        digit: float,
+        other: float,
+        intercept: float,
+        ratio: float,
+        slack: float,
+    ):
+        """Initialize estimator
+
+        Args:
+            letter: Tokens per ASCII letter
+            word: Tokens per whitespace separated word
+            punctuation: Tokens per punctuation/symbol character
+            digit: Tokens per digit
+            other: Tokens per non-ASCII letter (e.g. CJK characters)
+            intercept: Constant tokens per text
+            ratio: Multiplier applied to the estimate for the upper bound
+            slack: Tokens added to the scaled estimate for the upper bound
+        """
+        self.letter = letter
+        self.word = word
+        self.punctuation = punctuation
+        self.digit = digit
+        self.other = other
+        self.intercept = intercept
+        self.ratio = ratio
+        self.slack = slack
+
+    def _raw_estimate(self, text: str) -> float:
+        if not text or text.isspace():
+            return 0.0
+        return max(
+            0.0,
+            self.letter * len(ASCII_LETTER_PATTERN.findall(text))
+            + self.word * len(text.split())
+            + self.punctuation * len(PUNCTUATION_PATTERN.findall(text))
+            + self.digit * len(DIGIT_PATTERN.findall(text))
+            + self.other * len(OTHER_CHAR_PATTERN.findall(text))
+            + self.intercept,
+        )
+
+    def estimate(self, text: str) -> int:
+        return round(self._raw_estimate(text))
+
+    def upper_bound(self, text: str) -> int:
+        raw = self._raw_estimate(text)
+        if raw == 0.0:
+            return 0
+        return math.ceil(raw * self.ratio + self.slack)
+
+
+# Fitted on the_time_machine_hg_wells.txt by scripts/calibrate_token_estimator.py
+LINEAR_ESTIMATORS: Dict[str, LinearTokenEstimator] = {
+    "a": LinearTokenEstimator(
+        letter=0.9609,
+        word=1.3897,
+        punctuation=1.1781,
+        digit=7.0,
+        other=14.0,
+        intercept=-0.2660,
+        ratio=1.03,
+        slack=16.0,
+    ),
+}
+
+_estimators: Dict[str, TokenEstimator] = {}
+_exact_estimator: Optional[ExactTokenEstimator] = None
+
+
+def register_token_estimator(lang_code: str, estimator: TokenEstimator) -> None:
+    """Use a custom estimator for a language
+
+    Args:
+        lang_code: Language code the estimator applies to
+        estimator: Estimator instance
+    """
+    _estimators[lang_code] = estimator
+
+
+def get_token_estimator(lang_code: str = "a") -> TokenEstimator:
+    """Get the estimator used to plan chunks for a language
+
+    Args:
+        lang_code: Language code
+
+    Returns:
+        Registered estimator, or the one selected by settings.token_estimator
+    """
+    if lang_code in _estimators:
+        return _estimators[lang_code]
+    if settings.token_estimator == "exact":
+        global _exact_estimator
+        if _exact_estimator is None:
+            _exact_estimator = ExactTokenEstimator()
+        return _exact_estimator
+    # Sentences are phonemized with the US English backend for every language
+    return LINEAR_ESTIMATORS.get(lang_code, LINEAR_ESTIMATORS["a"])
@@ -1,3 +1,8 @@
+from array import array
+
+import numpy as np
+
+
 def get_vocab():
     """Get the vocabulary dictionary mapping characters to token IDs"""
     _pad = "$"
@@ -10,33 +15,46 @@ def get_vocab():
     return {symbol: i for i, symbol in enumerate(symbols)}
 
 
+def get_codepoint_table(vocab: dict[str, int]) -> np.ndarray:
+    """Build a lookup array from Unicode codepoint to token ID, -1 if unknown"""
+    table = np.full(max(map(ord, vocab)) + 1, -1, dtype=np.int16)
+    for symbol, i in vocab.items():
+        table[ord(symbol)] = i
+    return table
+
+
 # Initialize vocabulary
 VOCAB = get_vocab()
+CODEPOINT_TO_ID = get_codepoint_table(VOCAB)
+ID_TO_SYMBOL = {i: s for s, i in VOCAB.items()}
 
 
-def tokenize(phonemes: str) -> list[int]:
+def tokenize(phonemes: str) -> array:
     """Convert phonemes string to token IDs
 
     Args:
         phonemes: String of phonemes to tokenize
 
     Returns:
-        List of token IDs
+        Array of int16 token IDs
     """
     # Strip phonemes to remove leading/trailing spaces that could cause artifacts
     phonemes = phonemes.strip()
-    return [i for i in map(VOCAB.get, phonemes) if i is not None]
+    if not phonemes:
+        return array("h")
+
+    codepoints = np.frombuffer(phonemes.encode("utf-32-le"), dtype=np.uint32)
+    ids = CODEPOINT_TO_ID[codepoints[codepoints < len(CODEPOINT_TO_ID)]]
+    return array("h", ids[ids >= 0].tobytes())
 
 
 def decode_tokens(tokens: list[int]) -> str:
     """Convert token IDs back to phonemes string
 
     Args:
-        tokens: List of token IDs
+        tokens: Token IDs
 
     Returns:
         String of phonemes
     """
-    # Create reverse mapping
-    id_to_symbol = {i: s for s, i in VOCAB.items()}
-    return "".join(id_to_symbol[t] for t in tokens)
+    return "".join(ID_TO_SYMBOL[t] for t in tokens)
@@ -5,7 +5,7 @@ import os
 import re
 import tempfile
 import time
-from typing import AsyncGenerator, List, Optional, Tuple, Union
+from typing import AsyncGenerator, AsyncIterator, List, Optional, Tuple, Union
 
 import numpy as np
 import torch
@@ -13,13 +13,13 @@ from kokoro import KPipeline
 from loguru import logger
 
 from ..core.config import settings
-from ..inference.base import AudioChunk
+from ..inference.base import AudioChunk, WordTimestamps
 from ..inference.kokoro_v1 import KokoroV1
 from ..inference.model_manager import get_manager as get_model_manager
 from ..inference.voice_manager import get_manager as get_voice_manager
 from ..structures.schemas import NormalizationOptions
-from .audio import AudioNormalizer, AudioService
-from .streaming_audio_writer import StreamingAudioWriter
+from .audio import AudioNormalizer, AudioService, ChunkCrossfader
+from .streaming_audio_writer import StreamingAudioWriter, silence_blocks
 from .text_processing import tokenize
 from .text_processing.text_processor import process_text_chunk, smart_split
 
@@ -30,6 +30,9 @@ class TTSService:
     # Limit concurrent chunk processing
     _chunk_semaphore = asyncio.Semaphore(4)
 
+    # Interactive streams in progress, which background jobs yield to
+    active_streams = 0
+
     def __init__(self, output_dir: str = None):
         """Initialize service."""
         self.output_dir = output_dir
@@ -58,6 +61,7 @@ class TTSService:
         normalizer: Optional[AudioNormalizer] = None,
         lang_code: Optional[str] = None,
         return_timestamps: Optional[bool] = False,
+        crossfader: Optional[ChunkCrossfader] = None,
     ) -> AsyncGenerator[AudioChunk, None]:
         """Process tokens into audio."""
         async with self._chunk_semaphore:
@@ -66,7 +70,13 @@ class TTSService:
                 if is_last:
                     # Skip format conversion for raw audio mode
                     if not output_format:
-                        yield AudioChunk(np.array([], dtype=np.int16), output=b"")
+                        # Release the audio held back for crossfading
+                        audio = (
+                            crossfader.flush()
+                            if crossfader is not None
+                            else np.array([], dtype=np.int16)
+                        )
+                        yield AudioChunk(audio, output=b"")
                         return
                     chunk_data = await AudioService.convert_audio(
                         AudioChunk(
@@ -78,6 +88,7 @@ class TTSService:
                         "",
                         normalizer=normalizer,
                         is_last_chunk=True,
+                        crossfader=crossfader,
                     )
                     yield chunk_data
                     return
@@ -111,13 +122,14 @@ class TTSService:
                                     chunk_text,
                                     is_last_chunk=is_last,
                                     normalizer=normalizer,
+                                    crossfader=crossfader,
                                 )
                                 yield chunk_data
                             except Exception as e:
                                 logger.error(f"Failed to convert audio: {str(e)}")
                         else:
                             chunk_data = AudioService.trim_audio(
-                                chunk_data, chunk_text, speed, is_last, normalizer
+                                chunk_data, chunk_text, speed, is_last, normalizer, crossfader
                             )
                             yield chunk_data
                         chunk_index += 1
@@ -152,13 +164,14 @@ class TTSService:
                                 chunk_text,
                                 normalizer=normalizer,
                                 is_last_chunk=is_last,
+                                crossfader=crossfader,
                             )
                             yield chunk_data
                         except Exception as e:
                             logger.error(f"Failed to convert audio: {str(e)}")
                     else:
                         trimmed = AudioService.trim_audio(
-                            chunk_data, chunk_text, speed, is_last, normalizer
+                            chunk_data, chunk_text, speed, is_last, normalizer, crossfader
                         )
                         yield trimmed
             except Exception as e:
@@ -251,9 +264,24 @@ class TTSService:
             logger.error(f"Failed to get voice path: {e}")
             raise
 
+    @staticmethod
+    async def _split_text_stream(
+        segments: AsyncIterator[str],
+        lang_code: str,
+        normalization_options: Optional[NormalizationOptions],
+    ) -> AsyncGenerator[Tuple[str, List[int], Optional[float]], None]:
+        """Run smart_split over each text segment as it arrives."""
+        async for segment in segments:
+            async for chunk in smart_split(
+                segment,
+                lang_code=lang_code,
+                normalization_options=normalization_options,
+            ):
+                yield chunk
+
     async def generate_audio_stream(
         self,
-        text: str,
+        text: Union[str, AsyncIterator[str]],
         voice: str,
         writer: StreamingAudioWriter,
         speed: float = 1.0,
@@ -261,17 +289,31 @@ class TTSService:
         lang_code: Optional[str] = None,
         normalization_options: Optional[NormalizationOptions] = NormalizationOptions(),
         return_timestamps: Optional[bool] = False,
+        voice_path: Optional[str] = None,
+        normalizer: Optional[AudioNormalizer] = None,
     ) -> AsyncGenerator[AudioChunk, None]:
-        """Generate and stream audio chunks."""
-        stream_normalizer = AudioNormalizer()
+        """Generate and stream audio chunks.
+
+        text may also be an async iterator of text segments, e.g. sentences of
+        an LLM response, which are synthesized into one continuous stream.
+        Callers generating many streams for one voice can resolve voice_path
+        once with _get_voices_path and share a normalizer between them.
+        """
+        stream_normalizer = normalizer or AudioNormalizer()
+        # Crossfade state is per stream, even when the normalizer is shared
+        crossfader = ChunkCrossfader() if settings.crossfade_ms > 0 else None
         chunk_index = 0
         current_offset = 0.0
+        TTSService.active_streams += 1
         try:
             # Get backend
             backend = self.model_manager.get_backend()
 
             # Get voice path, handling combined voices
-            voice_name, voice_path = await self._get_voices_path(voice)
+            if voice_path is None:
+                voice_name, voice_path = await self._get_voices_path(voice)
+            else:
+                voice_name = voice
             logger.debug(f"Using voice path: {voice_path}")
 
             # Use provided lang_code or determine from voice name
@@ -280,34 +322,44 @@ class TTSService:
                 f"Using lang_code '{pipeline_lang_code}' for voice '{voice_name}' in audio stream"
             )
 
-            # Process text in chunks with smart splitting, handling pause tags
-            async for chunk_text, tokens, pause_duration_s in smart_split(
-                text,
-                lang_code=pipeline_lang_code,
-                normalization_options=normalization_options,
-            ):
+            # Process text in chunks with smart splitting, handling pause tags.
+            # Streamed text arrives as segments that are split as they come in.
+            if isinstance(text, str):
+                chunks = smart_split(
+                    text,
+                    lang_code=pipeline_lang_code,
+                    normalization_options=normalization_options,
+                )
+            else:
+                chunks = self._split_text_stream(
+                    text, pipeline_lang_code, normalization_options
+                )
+            async for chunk_text, tokens, pause_duration_s in chunks:
                 if pause_duration_s is not None and pause_duration_s > 0:
                     # --- Handle Pause Chunk ---
                     try:
                         logger.debug(f"Generating {pause_duration_s}s silence chunk")
+                        if crossfader is not None:
+                            # Speech held back for crossfading comes before the pause
+                            tail = crossfader.flush()
+                            if len(tail) > 0:
+                                tail_chunk = AudioChunk(audio=tail)
+                                if output_format:
+                                    tail_chunk.output = writer.write_chunk(tail)
+                                yield tail_chunk
+                                current_offset += len(tail) / 24000
                         silence_samples = int(pause_duration_s * 24000)  # 24kHz sample rate
-                        # Create proper silence as int16 zeros to avoid normalization artifacts
-                        silence_audio = np.zeros(silence_samples, dtype=np.int16)
-                        pause_chunk = AudioChunk(audio=silence_audio, word_timestamps=[])  # Empty timestamps for silence
-
-                        # Format and yield the silence chunk
-                        if output_format:
-                            formatted_pause_chunk = await AudioService.convert_audio(
-                                pause_chunk, output_format, writer, speed=speed, chunk_text="",
-                                is_last_chunk=False, trim_audio=False, normalizer=stream_normalizer,
-                            )
-                            if formatted_pause_chunk.output:
-                                yield formatted_pause_chunk
-                        else:  # Raw audio mode
-                            # For raw audio mode, silence is already in the correct format (int16)
-                            # Skip normalization to avoid any potential artifacts
-                            if len(pause_chunk.audio) > 0:
-                                yield pause_chunk
+                        # Silence comes in blocks viewing one shared zero buffer,
+                        # so long pauses allocate no audio
+                        for silence_audio in silence_blocks(silence_samples):
+                            pause_chunk = AudioChunk(audio=silence_audio, word_timestamps=WordTimestamps())  # Empty timestamps for silence
+
+                            # Format and yield the silence chunk. Encoders like Opus may
+                            # hold short silence back, but the chunk still carries its
+                            # audio for consumers such as the download encoder
+                            if output_format:
+                                pause_chunk.output = writer.write_silence(len(silence_audio))
+                            yield pause_chunk
 
                         # Update offset based on silence duration
                         current_offset += pause_duration_s
@@ -334,11 +386,10 @@ class TTSService:
                             normalizer=stream_normalizer,
                             lang_code=pipeline_lang_code,  # Pass lang_code
                             return_timestamps=return_timestamps,
+                            crossfader=crossfader,
                         ):
                             if chunk_data.word_timestamps is not None:
-                                for timestamp in chunk_data.word_timestamps:
-                                    timestamp.start_time += current_offset
-                                    timestamp.end_time += current_offset
+                                chunk_data.word_timestamps.shift(current_offset)
 
                             # Update offset based on the actual duration of the generated audio chunk
                             chunk_duration = 0
@@ -379,6 +430,7 @@ class TTSService:
                         is_last=True,  # Signal this is the last chunk
                         normalizer=stream_normalizer,
                         lang_code=pipeline_lang_code,  # Pass lang_code
+                        crossfader=crossfader,
                     ):
                         if chunk_data.output is not None:
                             yield chunk_data
@@ -388,6 +440,41 @@ class TTSService:
         except Exception as e:
             logger.error(f"Error in phoneme audio generation: {str(e)}")
             raise e
+        finally:
+            TTSService.active_streams -= 1
+
+    async def generate_chunk_audio(
+        self,
+        chunk_text: str,
+        tokens: List[int],
+        voice_name: str,
+        voice_path: str,
+        speed: float = 1.0,
+        lang_code: Optional[str] = None,
+        normalizer: Optional[AudioNormalizer] = None,
+    ) -> np.ndarray:
+        """Synthesize one chunk from a smart_split plan to trimmed int16 audio.
+
+        Used by background jobs, so it is not counted in active_streams.
+        """
+        audio = [
+            chunk_data.audio
+            async for chunk_data in self._process_chunk(
+                chunk_text,
+                tokens,
+                voice_name,
+                voice_path,
+                speed,
+                None,
+                normalizer=normalizer or AudioNormalizer(),
+                lang_code=lang_code,
+            )
+            if chunk_data.audio is not None and len(chunk_data.audio) > 0
+        ]
+        if not audio:
+            logger.warning(f"No audio generated for chunk: '{chunk_text[:100]}...'")
+            return np.array([], dtype=np.int16)
+        return np.concatenate(audio)
 
     async def generate_audio(
         self,
@@ -398,6 +485,7 @@ class TTSService:
         return_timestamps: bool = False,
         normalization_options: Optional[NormalizationOptions] = NormalizationOptions(),
         lang_code: Optional[str] = None,
+        voice_path: Optional[str] = None,
     ) -> AudioChunk:
         """Generate complete audio for text using streaming internally."""
         audio_data_chunks = []
@@ -412,6 +500,7 @@ class TTSService:
                 return_timestamps=return_timestamps,
                 lang_code=lang_code,
                 output_format=None,
+                voice_path=voice_path,
             ):
                 if len(audio_stream_data.audio) > 0:
                     audio_data_chunks.append(audio_stream_data)
@@ -1,16 +1,24 @@
 from .schemas import (
+    BatchSpeechItem,
+    BatchSpeechRequest,
     CaptionedSpeechRequest,
     CaptionedSpeechResponse,
     OpenAISpeechRequest,
+    SpeechJobRequest,
+    StreamingSpeechConfig,
     TTSStatus,
     VoiceCombineRequest,
     WordTimestamp,
 )
 
 __all__ = [
+    "BatchSpeechItem",
+    "BatchSpeechRequest",
     "OpenAISpeechRequest",
     "CaptionedSpeechRequest",
     "CaptionedSpeechResponse",
+    "SpeechJobRequest",
+    "StreamingSpeechConfig",
     "WordTimestamp",
     "TTSStatus",
     "VoiceCombineRequest",
@@ -1,11 +1,103 @@
 import json
+import struct
 import typing
-from collections.abc import AsyncIterable, Iterable
+from collections.abc import AsyncIterable, Iterable, Iterator
 
 from pydantic import BaseModel
 from starlette.background import BackgroundTask
 from starlette.concurrency import iterate_in_threadpool
-from starlette.responses import JSONResponse, StreamingResponse
+from starlette.responses import FileResponse, JSONResponse, StreamingResponse
+
+from ..inference.base import WordTimestamps
+
+try:
+    import orjson
+
+    def json_dumps(content: typing.Any) -> bytes:
+        """Serialize content to compact UTF-8 JSON"""
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+except ImportError:
+    try:
+        import msgspec
+
+        json_dumps = msgspec.json.Encoder().encode
+
+    except ImportError:
+
+        def json_dumps(content: typing.Any) -> bytes:
+            """Serialize content to compact UTF-8 JSON"""
+            return json.dumps(
+                content,
+                ensure_ascii=False,
+                allow_nan=False,
+                indent=None,
+                separators=(",", ":"),
+            ).encode("utf-8")
+
+# Captioned speech as binary frames, selected with the Accept header.
+# Each frame is a 1 byte type and 4 byte big-endian payload length, then the
+# payload: raw encoded audio, or timestamp records for the preceding audio.
+CAPTION_FRAMES_MEDIA_TYPE = "application/vnd.kokoro.caption-frames"
+AUDIO_FRAME = 1
+TIMESTAMPS_FRAME = 2
+FRAME_HEADER = struct.Struct(">BI")
+# Timestamp record: start and end seconds, word length, then the utf-8 word
+TIMESTAMP_RECORD = struct.Struct(">ddH")
+
+
+def encode_audio_frame(audio: bytes) -> bytes:
+    """Wrap encoded audio in a caption frame"""
+    return FRAME_HEADER.pack(AUDIO_FRAME, len(audio)) + audio
+
+
+def encode_timestamps_frame(timestamps: typing.Optional[WordTimestamps]) -> bytes:
+    """Pack word timestamps into a caption frame"""
+    records = []
+    if timestamps:
+        for word, start, end in zip(
+            timestamps.words,
+            timestamps.start_times.tolist(),
+            timestamps.end_times.tolist(),
+        ):
+            word = word.encode("utf-8")
+            records.append(TIMESTAMP_RECORD.pack(start, end, len(word)))
+            records.append(word)
+    payload = b"".join(records)
+    return FRAME_HEADER.pack(TIMESTAMPS_FRAME, len(payload)) + payload
+
+
+def decode_caption_frames(
+    data: bytes,
+) -> Iterator[tuple[int, bytes | WordTimestamps]]:
+    """Decode caption frames into (frame type, audio bytes or timestamps)
+
+    Args:
+        data: Complete frames, e.g. a whole captioned speech response
+
+    Yields:
+        Frame type and its decoded payload
+    """
+    offset = 0
+    while offset < len(data):
+        frame_type, length = FRAME_HEADER.unpack_from(data, offset)
+        offset += FRAME_HEADER.size
+        payload = data[offset : offset + length]
+        offset += length
+        if frame_type != TIMESTAMPS_FRAME:
+            yield frame_type, payload
+            continue
+
+        position = 0
+        words, start_times, end_times = [], [], []
+        while position < len(payload):
+            start, end, size = TIMESTAMP_RECORD.unpack_from(payload, position)
+            position += TIMESTAMP_RECORD.size
+            words.append(payload[position : position + size].decode("utf-8"))
+            start_times.append(start)
+            end_times.append(end)
+            position += size
+        yield frame_type, WordTimestamps(words, start_times, end_times)
 
 
 class JSONStreamingResponse(StreamingResponse, JSONResponse):
@@ -38,13 +130,42 @@ class JSONStreamingResponse(StreamingResponse, JSONResponse):
         self.init_headers(headers)
 
     def render(self, content: typing.Any) -> bytes:
-        return (
-            json.dumps(
-                content,
-                ensure_ascii=False,
-                allow_nan=False,
-                indent=None,
-                separators=(",", ":"),
-            )
-            + "\n"
-        ).encode("utf-8")
+        return json_dumps(content) + b"\n"
+
+
+def etag_matches(if_none_match: typing.Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag, using weak comparison"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in tags
+
+
+class HashedFileResponse(FileResponse):
+    """File response with a content hash ETag, which If-Range also accepts.
+
+    Byte ranges are served by FileResponse. The known stat result avoids a
+    stat call per request.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        etag: str,
+        stat_result,
+        headers: typing.Optional[typing.Mapping[str, str]] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(
+            path,
+            headers={**(headers or {}), "ETag": etag},
+            stat_result=stat_result,
+            **kwargs,
+        )
+
+    def _should_use_range(self, http_if_range: str, stat_result) -> bool:
+        return http_if_range == self.headers["etag"] or super()._should_use_range(
+            http_if_range, stat_result
+        )
@@ -2,7 +2,7 @@ from email.policy import default
 from enum import Enum
 from typing import List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class VoiceCombineRequest(BaseModel):
@@ -85,16 +85,24 @@ class OpenAISpeechRequest(BaseModel):
         default="af_heart",
         description="The voice to use for generation. Can be a base voice or a combined voice name.",
     )
-    response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] = Field(
+    response_format: Literal[
+        "mp3", "opus", "aac", "flac", "wav", "pcm", "ulaw", "alaw"
+    ] = Field(
         default="mp3",
-        description="The format to return audio in. Supported formats: mp3, opus, flac, wav, pcm. PCM format returns raw 16-bit samples without headers. AAC is not currently supported.",
+        description="The format to return audio in. Supported formats: mp3, opus, flac, wav, pcm, ulaw, alaw. PCM format returns raw 16-bit samples without headers, ulaw and alaw return headerless 8-bit G.711 samples. AAC is not currently supported.",
     )
-    download_format: Optional[Literal["mp3", "opus", "aac", "flac", "wav", "pcm"]] = (
+    download_format: Optional[
+        Literal["mp3", "opus", "aac", "flac", "wav", "pcm", "ulaw", "alaw"]
+    ] = (
         Field(
             default=None,
             description="Optional different format for the final download. If not provided, uses response_format.",
         )
     )
+    sample_rate: Optional[Literal[8000, 16000, 24000, 48000]] = Field(
+        default=None,
+        description="Output sample rate in Hz. Defaults to 24000, or 8000 for ulaw and alaw.",
+    )
     speed: float = Field(
         default=1.0,
         ge=0.25,
@@ -109,6 +117,14 @@ class OpenAISpeechRequest(BaseModel):
         default=False,
         description="If true, returns a download link in X-Download-Path header after streaming completes",
     )
+    low_latency: bool = Field(
+        default=False,
+        description="If true, Opus streams flush an Ogg page per codec frame and use the low delay encoder mode, so audio can play as soon as each chunk is synthesized.",
+    )
+    frame_duration_ms: Optional[Literal[10, 20, 40, 60]] = Field(
+        default=None,
+        description="Opus frame duration in milliseconds. Defaults to 20. AAC always uses 1024 sample frames.",
+    )
     lang_code: Optional[str] = Field(
         default=None,
         description="Optional language code to use for text processing. If not provided, will use first letter of voice name.",
@@ -161,3 +177,149 @@ class CaptionedSpeechRequest(BaseModel):
         default=NormalizationOptions(),
         description="Options for the normalization system",
     )
+
+
+class StreamingSpeechConfig(BaseModel):
+    """Session configuration for streaming text input over WebSocket"""
+
+    model: str = Field(
+        default="kokoro",
+        description="The model to use for generation. Supported models: tts-1, tts-1-hd, kokoro",
+    )
+    voice: str = Field(
+        default="af_heart",
+        description="The voice to use for generation. Can be a base voice or a combined voice name.",
+    )
+    response_format: Literal[
+        "mp3", "opus", "aac", "flac", "wav", "pcm", "ulaw", "alaw"
+    ] = Field(
+        default="pcm",
+        description="The format of the binary audio frames. PCM (default) sends raw 16-bit samples without headers, ulaw and alaw send headerless 8-bit G.711 samples.",
+    )
+    sample_rate: Optional[Literal[8000, 16000, 24000, 48000]] = Field(
+        default=None,
+        description="Output sample rate in Hz. Defaults to 24000, or 8000 for ulaw and alaw.",
+    )
+    low_latency: bool = Field(
+        default=False,
+        description="If true, Opus streams flush an Ogg page per codec frame and use the low delay encoder mode, so audio can play as soon as each chunk is synthesized.",
+    )
+    frame_duration_ms: Optional[Literal[10, 20, 40, 60]] = Field(
+        default=None,
+        description="Opus frame duration in milliseconds. Defaults to 20. AAC always uses 1024 sample frames.",
+    )
+    speed: float = Field(
+        default=1.0,
+        ge=0.25,
+        le=4.0,
+        description="The speed of the generated audio. Select a value from 0.25 to 4.0.",
+    )
+    return_timestamps: bool = Field(
+        default=False,
+        description="If true, sends word-level timestamps as JSON messages after the audio they belong to",
+    )
+    lang_code: Optional[str] = Field(
+        default=None,
+        description="Optional language code to use for text processing. If not provided, will use first letter of voice name.",
+    )
+    normalization_options: Optional[NormalizationOptions] = Field(
+        default=NormalizationOptions(),
+        description="Options for the normalization system",
+    )
+
+
+def require_text(value: str) -> str:
+    """Reject input that is only whitespace, which would synthesize nothing"""
+    if not value.strip():
+        raise ValueError("input must contain text, not only whitespace")
+    return value
+
+
+class SpeechJobRequest(BaseModel):
+    """Request schema for a background long-document job"""
+
+    model: str = Field(
+        default="kokoro",
+        description="The model to use for generation. Supported models: tts-1, tts-1-hd, kokoro",
+    )
+    input: str = Field(..., min_length=1, description="The text to generate audio for")
+    voice: str = Field(
+        default="af_heart",
+        description="The voice to use for generation. Can be a base voice or a combined voice name.",
+    )
+    response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] = Field(
+        default="mp3",
+        description="The format of the finished audio. Supported formats: mp3, opus, flac, wav, pcm.",
+    )
+    speed: float = Field(
+        default=1.0,
+        ge=0.25,
+        le=4.0,
+        description="The speed of the generated audio. Select a value from 0.25 to 4.0.",
+    )
+    lang_code: Optional[str] = Field(
+        default=None,
+        description="Optional language code to use for text processing. If not provided, will use first letter of voice name.",
+    )
+    normalization_options: Optional[NormalizationOptions] = Field(
+        default=NormalizationOptions(),
+        description="Options for the normalization system",
+    )
+
+    @field_validator("input")
+    @classmethod
+    def input_not_blank(cls, value: str) -> str:
+        return require_text(value)
+
+
+class BatchSpeechItem(BaseModel):
+    """One prompt of a batch speech request"""
+
+    id: Optional[str] = Field(
+        default=None,
+        description="Optional client id echoed in the result. Also used as the archive file name.",
+    )
+    input: str = Field(..., min_length=1, description="The text to generate audio for")
+    voice: str = Field(
+        default="af_heart",
+        description="The voice to use for generation. Can be a base voice or a combined voice name.",
+    )
+    response_format: Literal["mp3", "opus", "aac", "flac", "wav", "pcm"] = Field(
+        default="mp3",
+        description="The format to return audio in. Supported formats: mp3, opus, flac, wav, pcm.",
+    )
+    speed: float = Field(
+        default=1.0,
+        ge=0.25,
+        le=4.0,
+        description="The speed of the generated audio. Select a value from 0.25 to 4.0.",
+    )
+    lang_code: Optional[str] = Field(
+        default=None,
+        description="Optional language code to use for text processing. If not provided, will use first letter of voice name.",
+    )
+    normalization_options: Optional[NormalizationOptions] = Field(
+        default=NormalizationOptions(),
+        description="Options for the normalization system",
+    )
+
+    @field_validator("input")
+    @classmethod
+    def input_not_blank(cls, value: str) -> str:
+        return require_text(value)
+
+
+class BatchSpeechRequest(BaseModel):
+    """Request schema for batch speech synthesis"""
+
+    model: str = Field(
+        default="kokoro",
+        description="The model to use for generation. Supported models: tts-1, tts-1-hd, kokoro",
+    )
+    items: List[BatchSpeechItem] = Field(
+        ..., min_length=1, description="Prompts to synthesize"
+    )
+    output: Literal["ndjson", "zip", "tar"] = Field(
+        default="ndjson",
+        description="ndjson streams one JSON result per item with base64 audio as items complete. zip and tar stream an archive of audio files plus a manifest.json.",
+    )
@@ -1,13 +1,17 @@
 """Tests for AudioService"""
 
+import asyncio
 from unittest.mock import patch
 
 import numpy as np
 import pytest
 
-from api.src.inference.base import AudioChunk
-from api.src.services.audio import AudioNormalizer, AudioService
-from api.src.services.streaming_audio_writer import StreamingAudioWriter
+from api.src.inference.base import AudioChunk, WordTimestamps
+from api.src.services.audio import AudioNormalizer, AudioService, ChunkCrossfader
+from api.src.services.streaming_audio_writer import (
+    BackgroundEncoder,
+    StreamingAudioWriter,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -15,6 +19,7 @@ def mock_settings():
     """Mock settings for all tests"""
     with patch("api.src.services.audio.settings") as mock_settings:
         mock_settings.gap_trim_ms = 250
+        mock_settings.crossfade_ms = 0
         yield mock_settings
 
 
@@ -254,3 +259,179 @@ async def test_buffer_position_after_conversion(sample_audio):
     assert isinstance(audio_chunk2.output, bytes)
     assert isinstance(audio_chunk2, AudioChunk)
     assert len(audio_chunk1.output) == len(audio_chunk2.output)
+
+
+def test_trim_audio_shifts_timestamps(sample_audio):
+    """Test timestamps move back by the samples trimmed from the start"""
+    audio_data, _ = sample_audio
+    timestamps = WordTimestamps(["a", "b"], [0.5, 1.0], [0.9, 1.5])
+    normalizer = AudioNormalizer()
+
+    AudioService.trim_audio(
+        AudioChunk(np.tile(audio_data, 20), word_timestamps=timestamps),
+        normalizer=normalizer,
+    )
+    trimmed = normalizer.samples_to_trim / 24000
+    np.testing.assert_allclose(timestamps.start_times, [0.5 - trimmed, 1.0 - trimmed])
+    np.testing.assert_allclose(timestamps.end_times, [0.9 - trimmed, 1.5 - trimmed])
+
+
+def test_word_timestamps_combine():
+    """Test combined chunks keep timestamps in order, skipping chunks without"""
+    chunks = [
+        AudioChunk(np.zeros(2, np.int16), WordTimestamps()),
+        AudioChunk(np.ones(3, np.int16), WordTimestamps(["hi"], [0.1], [0.2])),
+        AudioChunk(np.ones(1, np.int16), None),
+        AudioChunk(np.ones(1, np.int16), WordTimestamps(["there"], [0.3], [0.5])),
+    ]
+    combined = AudioChunk.combine(chunks)
+    assert len(combined.audio) == 7
+    assert combined.word_timestamps == WordTimestamps(
+        ["hi", "there"], [0.1, 0.3], [0.2, 0.5]
+    )
+    assert combined.word_timestamps.to_dicts()[1] == {
+        "word": "there",
+        "start_time": 0.3,
+        "end_time": 0.5,
+    }
+
+
+def _decoded_samples(data: bytes, format: str) -> int:
+    import io
+
+    import av
+
+    with av.open(io.BytesIO(data), format=format) as container:
+        return sum(frame.samples for frame in container.decode(audio=0))
+
+
+def test_opus_stream_keeps_final_pages():
+    """Test finalizing an Opus stream returns the pages written on close"""
+    writer = StreamingAudioWriter("opus", sample_rate=24000)
+    data = writer.write_chunk(np.ones(24000, np.int16))
+    data += writer.write_chunk(finalize=True)
+    assert _decoded_samples(data, "ogg") >= 24000
+
+
+def test_opus_low_latency_emits_each_chunk():
+    """Test low latency Opus writes the pages of a chunk straight away"""
+    default = StreamingAudioWriter("opus", sample_rate=24000)
+    low_latency = StreamingAudioWriter(
+        "opus", sample_rate=24000, low_latency=True, frame_duration_ms=10
+    )
+    chunk = np.tile(np.array([0, 8000, 0, -8000], np.int16), 1200)
+
+    # A default stream holds back pages until about a second of audio
+    assert len(default.write_chunk(chunk)) < 200
+    first = low_latency.write_chunk(chunk)
+    assert len(first) > 1000
+    assert low_latency.stream.codec_context.frame_size == 240
+
+    data = first + low_latency.write_chunk(chunk)
+    data += low_latency.write_chunk(finalize=True)
+    default.close()
+    assert _decoded_samples(data, "ogg") >= 9600
+
+
+@pytest.mark.parametrize("format", ["pcm", "ulaw", "mp3", "aac", "flac"])
+def test_write_silence_matches_zeros(format):
+    """Test cached silence encodes the same audio as writing zeros"""
+    silent, zeros = (StreamingAudioWriter(format, sample_rate=24000) for _ in range(2))
+    speech = np.tile(np.array([0, 8000, 0, -8000], np.int16), 600)
+
+    outputs = []
+    for writer, write_pause in [
+        (silent, lambda: silent.write_silence(30000)),
+        (zeros, lambda: zeros.write_chunk(np.zeros(30000, np.int16))),
+    ]:
+        data = writer.write_chunk(speech) + write_pause() + writer.write_chunk(speech)
+        outputs.append(data + writer.write_chunk(finalize=True))
+
+    assert outputs[0] == outputs[1]
+
+
+def test_crossfade_joins_chunks():
+    """Test chunks overlap by the window, with constant power across joins"""
+    crossfader = ChunkCrossfader(overlap_ms=10)
+    chunks = [np.full(2400, 10000, np.int16) for _ in range(3)]
+
+    first = crossfader.process(chunks[0])
+    second = crossfader.process(chunks[1])
+    last = crossfader.process(chunks[2], is_last_chunk=True)
+
+    assert len(first) == 2400 - 240
+    assert len(second) == 2400 - 240
+    joined = np.concatenate([first, second, last])
+    assert len(joined) == 3 * 2400 - 2 * 240
+    # Equal-power gains of correlated audio peak at sqrt(2) mid-fade
+    assert joined.min() >= 10000
+    assert joined.max() <= int(10000 * np.sqrt(2)) + 1
+    assert len(crossfader.flush()) == 0
+
+
+def test_crossfade_keeps_timestamps_on_output_timeline():
+    """Test a chunk's timestamps start where its crossfade begins"""
+    from api.src.inference.base import WordTimestamps
+
+    normalizer = AudioNormalizer()
+    crossfader = ChunkCrossfader(overlap_ms=10)
+    speech = np.full(4800, 10000, np.int16)
+
+    first = AudioService.trim_audio(
+        AudioChunk(speech.copy()), normalizer=normalizer, crossfader=crossfader
+    )
+    timestamps = WordTimestamps(["b"], [0.0], [0.1])
+    second = AudioService.trim_audio(
+        AudioChunk(speech.copy(), word_timestamps=timestamps),
+        normalizer=normalizer,
+        crossfader=crossfader,
+    )
+    # The second chunk is emitted from the start of the held tail, which is
+    # where the stream offset already points, so its timestamps are unshifted
+    assert second.audio[0] == np.rint(
+        10000 * np.cos(np.pi / 960) + 10000 * np.sin(np.pi / 960)
+    )
+    assert second.word_timestamps.start_times == [0.0]
+
+
+@pytest.mark.asyncio
+async def test_background_encoder_holds_back_submit():
+    """Test submit waits once max_pending chunks are queued"""
+    release = asyncio.Event()
+    encoded = []
+
+    async def slow_sink(data):
+        await release.wait()
+        encoded.append(data)
+
+    encoder = BackgroundEncoder(
+        StreamingAudioWriter("pcm", sample_rate=24000), slow_sink, max_pending=1
+    )
+    await encoder.submit(np.ones(10, np.int16))  # Taken by the worker
+    await asyncio.sleep(0.01)
+    await encoder.submit(np.ones(10, np.int16))  # Fills the queue
+    blocked = asyncio.create_task(encoder.submit(np.ones(10, np.int16)))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, 1)
+    await encoder.finish()
+    assert b"".join(encoded) == np.ones(30, np.int16).tobytes()
+
+
+@pytest.mark.asyncio
+async def test_background_encoder_submit_raises_worker_error():
+    """Test a blocked submit fails with the worker's error instead of hanging"""
+
+    async def failing_sink(data):
+        raise OSError("disk full")
+
+    encoder = BackgroundEncoder(
+        StreamingAudioWriter("pcm", sample_rate=24000), failing_sink, max_pending=1
+    )
+    with pytest.raises(OSError, match="disk full"):
+        for _ in range(3):
+            await encoder.submit(np.ones(10, np.int16))
+            await asyncio.sleep(0.01)
+    await encoder.close()
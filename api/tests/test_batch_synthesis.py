@@ -0,0 +1,47 @@
+"""Tests for batch synthesis scheduling and result streaming"""
+
+import io
+import json
+import tarfile
+
+import pytest
+
+from api.src.services.batch_synthesis import (
+    BatchResult,
+    archive_results,
+    plan_batch,
+)
+from api.src.structures.schemas import BatchSpeechItem
+
+
+def test_plan_batch_groups_voices_longest_first():
+    """Test items are grouped by resolved voice with long prompts first"""
+    items = [
+        BatchSpeechItem(input="short", voice="b"),
+        BatchSpeechItem(input="a much longer prompt", voice="a"),
+        BatchSpeechItem(input="medium one", voice="b"),
+        BatchSpeechItem(input="tiny", voice="a"),
+        BatchSpeechItem(input="broken", voice="bad"),
+    ]
+    voices = {
+        "a": ("af_a", "/a.pt"),
+        "b": ("af_b", "/b.pt"),
+        "bad": ValueError("Voice not found"),
+    }
+    assert plan_batch(items, voices) == [4, 1, 3, 2, 0]
+
+
+@pytest.mark.asyncio
+async def test_archive_results_tar():
+    """Test tar archives hold completed audio and a manifest of every item"""
+
+    async def results():
+        yield BatchResult(1, BatchSpeechItem(input="b", response_format="wav"), b"RIFF")
+        yield BatchResult(0, BatchSpeechItem(input="a"), None, "failed to load")
+
+    data = b"".join([chunk async for chunk in archive_results(results(), "tar")])
+    archive = tarfile.open(fileobj=io.BytesIO(data))
+    assert archive.getnames() == ["00001.wav", "manifest.json"]
+    manifest = json.loads(archive.extractfile("manifest.json").read())
+    assert [entry["status"] for entry in manifest] == ["failed", "completed"]
+    assert manifest[0]["error"] == "failed to load"
@@ -1,9 +1,52 @@
 import base64
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 import requests
+from fastapi.testclient import TestClient
+
+from api.src.inference.base import AudioChunk, WordTimestamps
+from api.src.main import app
+from api.src.routers import development
+from api.src.services.tts_service import TTSService
+from api.src.structures.custom_responses import (
+    AUDIO_FRAME,
+    CAPTION_FRAMES_MEDIA_TYPE,
+    TIMESTAMPS_FRAME,
+    decode_caption_frames,
+    encode_audio_frame,
+    encode_timestamps_frame,
+)
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def mock_tts_service():
+    """Mock TTS service streaming two chunks, timestamps split across them"""
+    service = AsyncMock(spec=TTSService)
+    service.list_voices.return_value = ["af_heart"]
+
+    async def mock_stream(*args, **kwargs):
+        yield AudioChunk(
+            np.zeros(10, np.int16),
+            word_timestamps=WordTimestamps(["Hello"], [0.0], [0.4]),
+            output=b"",
+        )
+        yield AudioChunk(
+            np.zeros(10, np.int16),
+            word_timestamps=WordTimestamps(["héllo"], [0.5], [0.9]),
+            output=b"\x00\x01audio",
+        )
+        yield AudioChunk(np.array([], np.int16), output=b"\xfftail")
+
+    service.generate_audio_stream = mock_stream
+    app.dependency_overrides[development.get_tts_service] = lambda: service
+    with patch("api.src.routers.development.get_tts_service", return_value=service):
+        yield service
+    app.dependency_overrides.clear()
 
 
 def test_generate_captioned_speech():
@@ -32,3 +75,48 @@ def test_generate_captioned_speech():
         # Verify we got both audio and timestamps
         assert audio == b"mock audio data"
         assert timestamps == [{"word": "test", "start_time": 0.0, "end_time": 1.0}]
+
+
+def test_caption_frames_round_trip():
+    """Test audio and timestamp frames decode to what was encoded"""
+    timestamps = WordTimestamps(["naïve", "café"], [0.125, 0.5], [0.5, 1.0])
+    data = encode_audio_frame(b"\x00audio") + encode_timestamps_frame(timestamps)
+    assert list(decode_caption_frames(data)) == [
+        (AUDIO_FRAME, b"\x00audio"),
+        (TIMESTAMPS_FRAME, timestamps),
+    ]
+
+
+def test_captioned_speech_frames_stream(mock_tts_service):
+    """Test binary framed captioned streaming is selected by the Accept header"""
+    response = client.post(
+        "/dev/captioned_speech",
+        json={"input": "Hello hello", "voice": "af_heart", "response_format": "pcm"},
+        headers={"Accept": CAPTION_FRAMES_MEDIA_TYPE},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CAPTION_FRAMES_MEDIA_TYPE
+    frames = list(decode_caption_frames(response.content))
+    assert frames == [
+        (AUDIO_FRAME, b"\x00\x01audio"),
+        (
+            TIMESTAMPS_FRAME,
+            WordTimestamps(["Hello", "héllo"], [0.0, 0.5], [0.4, 0.9]),
+        ),
+        (AUDIO_FRAME, b"\xfftail"),
+        (TIMESTAMPS_FRAME, WordTimestamps()),
+    ]
+
+
+def test_captioned_speech_json_stream(mock_tts_service):
+    """Test captioned streaming still defaults to base64 JSON lines"""
+    response = client.post(
+        "/dev/captioned_speech",
+        json={"input": "Hello hello", "voice": "af_heart", "response_format": "pcm"},
+    )
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert base64.b64decode(lines[0]["audio"]) == b"\x00\x01audio"
+    assert [t["word"] for t in lines[0]["timestamps"]] == ["Hello", "héllo"]
+    assert base64.b64decode(lines[1]["audio"]) == b"\xfftail"
+    assert lines[1]["timestamps"] == []
@@ -0,0 +1,167 @@
+"""Tests for the background long-document job queue"""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from api.src.services.jobs import JobRunner, JobStore, job_progress
+from api.src.services.tts_service import TTSService
+from api.src.structures.schemas import SpeechJobRequest, TTSStatus
+
+TEXT = "First sentence here. [pause:0.5s] Second sentence there."
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def tts_service():
+    service = AsyncMock(spec=TTSService)
+    service._get_voices_path.return_value = ("af_heart", "/voices/af_heart.pt")
+    service.generate_chunk_audio.side_effect = lambda *args, **kwargs: np.ones(
+        2400, np.int16
+    )
+    return service
+
+
+@pytest.mark.asyncio
+async def test_job_renders_and_assembles(store, tts_service):
+    """Test a job persists its plan and chunk PCM, then writes the audio"""
+    job_id = store.create(SpeechJobRequest(input=TEXT, response_format="pcm"), "af_heart")
+    await JobRunner(store).process(job_id, tts_service)
+
+    job = store.get(job_id)
+    assert job["status"] == TTSStatus.COMPLETED.value
+    assert job["chunks_total"] == 3
+    assert job["chunks_done"] == 3
+    assert tts_service.generate_chunk_audio.await_count == 2
+
+    with open(store.audio_path(job_id, "pcm"), "rb") as f:
+        audio = np.frombuffer(f.read(), np.int16)
+    # Two text chunks around half a second of silence
+    assert len(audio) == 2400 * 2 + 12000
+    assert audio[2400:14400].max() == 0
+
+    progress = job_progress(job)
+    assert progress["eta_seconds"] == 0.0
+    assert progress["rtf"] is not None
+
+    # Only the assembled audio is kept
+    assert os.listdir(store.job_dir(job_id)) == ["speech.pcm"]
+    assert store.pending_chunks(job_id) == []
+
+
+@pytest.mark.asyncio
+async def test_job_resumes_from_checkpoints(store, tts_service):
+    """Test a restarted job only renders chunks without saved PCM"""
+    job_id = store.create(SpeechJobRequest(input=TEXT, response_format="pcm"), "af_heart")
+    store.save_plan(
+        job_id,
+        [("First.", [1, 2], None), ("", [], 0.1), ("Second.", [3, 4], None)],
+    )
+    os.makedirs(store.job_dir(job_id))
+    with open(store.chunk_path(job_id, 0), "wb") as f:
+        f.write(np.full(100, 7, np.int16).tobytes())
+    store.chunk_done(job_id, 0, 2, 0.5, 1.0)
+    store.set_status(job_id, TTSStatus.PROCESSING)
+
+    assert store.requeue_interrupted() == 1
+    assert job_progress(store.get(job_id))["eta_seconds"] == 0.5
+
+    await JobRunner(store).process(job_id, tts_service)
+
+    assert tts_service.generate_chunk_audio.await_count == 1
+    assert tts_service.generate_chunk_audio.await_args.args[0] == "Second."
+    with open(store.audio_path(job_id, "pcm"), "rb") as f:
+        audio = np.frombuffer(f.read(), np.int16)
+    assert len(audio) == 100 + 2400 + 2400
+    assert audio[0] == 7
+
+
+@pytest.mark.asyncio
+async def test_job_failure_is_recorded(store, tts_service):
+    """Test errors mark the job failed with the message"""
+    tts_service._get_voices_path.side_effect = RuntimeError("Voice not found")
+    job_id = store.create(SpeechJobRequest(input=TEXT), "missing")
+    await JobRunner(store).process(job_id, tts_service)
+
+    progress = job_progress(store.get(job_id))
+    assert progress["status"] == TTSStatus.FAILED.value
+    assert progress["error"] == "Voice not found"
+
+
+@pytest.mark.asyncio
+async def test_jobs_wait_for_interactive_streams(store, tts_service, monkeypatch):
+    """Test jobs do not render while interactive streams are active"""
+    monkeypatch.setattr(TTSService, "active_streams", 1)
+    monkeypatch.setattr("api.src.services.jobs.settings.jobs_idle_poll_s", 0.01)
+    job_id = store.create(SpeechJobRequest(input="Hello there."), "af_heart")
+
+    task = asyncio.create_task(JobRunner(store).process(job_id, tts_service))
+    await asyncio.sleep(0.05)
+    tts_service.generate_chunk_audio.assert_not_awaited()
+
+    TTSService.active_streams = 0
+    await asyncio.wait_for(task, 1)
+    assert store.get(job_id)["status"] == TTSStatus.COMPLETED.value
+
+
+@pytest.mark.asyncio
+async def test_runner_processes_queue_and_deletes(store, tts_service):
+    """Test the runner picks up queued jobs and delete removes their files"""
+
+    async def factory():
+        return tts_service
+
+    runner = JobRunner(store)
+    await runner.start(factory)
+    try:
+        job_id = store.create(SpeechJobRequest(input="Hello there."), "af_heart")
+        runner.notify()
+        for _ in range(100):
+            if store.get(job_id)["status"] == TTSStatus.COMPLETED.value:
+                break
+            await asyncio.sleep(0.01)
+        assert os.path.exists(store.audio_path(job_id, "mp3"))
+
+        await runner.delete(job_id)
+        assert store.get(job_id) is None
+        assert not os.path.exists(store.job_dir(job_id))
+    finally:
+        await runner.stop()
+
+
+@pytest.mark.asyncio
+async def test_runner_expires_finished_jobs(store, tts_service, monkeypatch):
+    """Test completed and failed jobs are deleted after the retention period"""
+    monkeypatch.setattr("api.src.services.jobs.settings.jobs_max_age_hours", 1)
+    runner = JobRunner(store)
+    old_id = store.create(SpeechJobRequest(input="Old."), "af_heart")
+    await runner.process(old_id, tts_service)
+    failed_id = store.create(SpeechJobRequest(input="Failed."), "af_heart")
+    store.set_status(failed_id, TTSStatus.FAILED, "error")
+    recent_id = store.create(SpeechJobRequest(input="Recent."), "af_heart")
+    await runner.process(recent_id, tts_service)
+    pending_id = store.create(SpeechJobRequest(input="Pending."), "af_heart")
+
+    two_hours_ago = time.time() - 7200
+    with store._db:
+        store._db.execute(
+            "UPDATE jobs SET updated_at = ? WHERE id != ?", (two_hours_ago, recent_id)
+        )
+
+    await runner.expire()
+
+    assert store.get(old_id) is None
+    assert not os.path.exists(store.job_dir(old_id))
+    assert store.get(failed_id) is None
+    assert store.get(recent_id) is not None
+    assert store.get(pending_id) is not None
@@ -1,3 +1,4 @@
+import os
 from unittest.mock import ANY, MagicMock, patch
 
 import numpy as np
@@ -163,3 +164,32 @@ async def test_generate_uses_correct_pipeline(kokoro_backend):
             call_args = mock_pipeline.call_args
             assert isinstance(call_args[1]["voice"], str)
             assert call_args[1]["voice"].startswith("/tmp/temp_voice_")
+
+
+@pytest.mark.asyncio
+async def test_device_voice_path_reused_until_file_changes(kokoro_backend, tmp_path):
+    """Test voices are only reloaded for the device when their file changes."""
+    voice_file = tmp_path / "af_test.pt"
+    voice_file.write_bytes(b"voice")
+    mock_pipeline = MagicMock()
+    mock_pipeline.voices = {}
+    kokoro_backend._pipelines["a"] = mock_pipeline
+
+    with (
+        patch("api.src.core.paths.load_voice_tensor") as mock_load_voice,
+        patch("api.src.core.paths.save_voice_tensor") as mock_save_voice,
+        patch("tempfile.gettempdir", return_value=str(tmp_path)),
+    ):
+        mock_load_voice.return_value = torch.ones(1)
+        mock_save_voice.side_effect = lambda tensor, path: open(path, "wb").close()
+
+        first = await kokoro_backend._get_device_voice_path(str(voice_file))
+        second = await kokoro_backend._get_device_voice_path(str(voice_file))
+        assert first == second == str(tmp_path / "temp_voice_af_test.pt")
+        assert mock_load_voice.call_count == 1
+
+        mock_pipeline.voices[first] = torch.zeros(1)
+        os.utime(voice_file, (0, 0))
+        await kokoro_backend._get_device_voice_path(str(voice_file))
+        assert mock_load_voice.call_count == 2
+        assert first not in mock_pipeline.voices
@@ -331,3 +331,82 @@ def test_remaining_symbol():
         )
         == "I love buying products at good store here and at other store"
     )
+
+
+def test_adjacent_rule_matches():
+    """Test back-to-back matches behave like rules applied one at a time"""
+    assert (
+        normalize_text("Mr.Ms. Smith", normalization_options=NormalizationOptions())
+        == "MisterM'S. Smith"
+    )
+    assert (
+        normalize_text(
+            "Mr.etc. and yeah", normalization_options=NormalizationOptions()
+        )
+        == "Misteretc. and ye'a"
+    )
+    assert (
+        normalize_text(
+            "See U.S.A. today and A.B. c", normalization_options=NormalizationOptions()
+        )
+        == "See U-S-A- today and A-B- c"
+    )
+
+
+def test_plain_text_fast_path():
+    """Test text without digits or URLs still gets punctuation and symbols"""
+    assert (
+        normalize_text(
+            "Plain “quoted” text with ‘marks’ & more",
+            normalization_options=NormalizationOptions(),
+        )
+        == "Plain \"quoted\" text with 'marks' and more"
+    )
+
+
+def test_verbalization_cache():
+    """Test repeated numbers are verbalized once and match inflect"""
+    from api.src.services.text_processing import normalizer
+
+    normalizer.number_to_words.cache_clear()
+    first = normalize_text("It is 1234 and $5.25", NormalizationOptions())
+    misses = normalizer.number_to_words.cache_info().misses
+    assert normalize_text("It is 1234 and $5.25", NormalizationOptions()) == first
+    assert normalizer.number_to_words.cache_info().misses == misses
+    assert "one thousand, two hundred and thirty-four" in first
+    assert "five dollars and twenty-five cents" in first
+
+
+def test_verbalization_cache_keeps_count_type():
+    """Test integer and float counts are cached separately"""
+    from api.src.services.text_processing import normalizer
+
+    assert normalizer.plural("dollar", 1) == normalizer.INFLECT_ENGINE.plural(
+        "dollar", count=1
+    )
+    assert normalizer.plural("dollar", 1.0) == normalizer.INFLECT_ENGINE.plural(
+        "dollar", count=1.0
+    )
+
+
+def test_warm_verbalization_cache():
+    """Test startup warmup precomputes common numbers and clock minutes"""
+    from api.src.services.text_processing import normalizer
+
+    normalizer.number_to_words.cache_clear()
+    normalizer.warm_verbalization_cache()
+    misses = normalizer.number_to_words.cache_info().misses
+    normalize_text("In 1984 at 10:05 we paid 250 for 42", NormalizationOptions())
+    assert normalizer.number_to_words.cache_info().misses == misses
+
+
+def test_warmup_thread_uses_own_inflect_engine():
+    """Test a worker thread never shares the request thread's inflect engine"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from api.src.services.text_processing import normalizer
+
+    with ThreadPoolExecutor(1) as pool:
+        engine = pool.submit(normalizer.inflect_engine).result()
+    assert normalizer.inflect_engine() is normalizer.INFLECT_ENGINE
+    assert engine is not normalizer.INFLECT_ENGINE
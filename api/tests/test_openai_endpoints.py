@@ -1,6 +1,9 @@
 import asyncio
+import base64
+import io
 import json
 import os
+import zipfile
 from typing import AsyncGenerator, Tuple
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -185,8 +188,8 @@ def test_openai_voice_mapping(mock_tts_service, mock_openai_mappings):
         },
     )
     assert response.status_code == 200
-    mock_tts_service.generate_audio.assert_called_once()
-    assert mock_tts_service.generate_audio.call_args[1]["voice"] == "am_adam"
+    mock_tts_service.generate_audio_stream.assert_called_once()
+    assert mock_tts_service.generate_audio_stream.call_args[1]["voice"] == "am_adam"
 
 
 def test_openai_voice_mapping_streaming(
@@ -244,9 +247,9 @@ def mock_tts_service(mock_audio_bytes):
         service.generate_audio.return_value = AudioChunk(np.zeros(1000, np.int16))
 
         async def mock_stream(*args, **kwargs) -> AsyncGenerator[AudioChunk, None]:
-            yield AudioChunk(np.ndarray([], np.int16), output=mock_audio_bytes)
+            yield AudioChunk(np.array([], np.int16), output=mock_audio_bytes)
 
-        service.generate_audio_stream = mock_stream
+        service.generate_audio_stream = MagicMock(side_effect=mock_stream)
         service.list_voices.return_value = ["test_voice", "voice1", "voice2"]
         service.combine_voices.return_value = "voice1_voice2"
 
@@ -255,16 +258,15 @@ def mock_tts_service(mock_audio_bytes):
         yield service
 
 
-@patch("api.src.services.audio.AudioService.convert_audio")
-def test_openai_speech_endpoint(
-    mock_convert, mock_tts_service, test_voice, mock_audio_bytes
-):
-    """Test the OpenAI-compatible speech endpoint with basic MP3 generation"""
-    # Configure mocks
-    mock_tts_service.generate_audio.return_value = AudioChunk(np.zeros(1000, np.int16))
-    mock_convert.return_value = AudioChunk(
-        np.zeros(1000, np.int16), output=mock_audio_bytes
-    )
+def test_openai_speech_endpoint(mock_tts_service, test_voice):
+    """Test the non-streamed endpoint encodes raw chunks as they arrive"""
+
+    async def mock_stream(*args, **kwargs):
+        yield AudioChunk(np.full(1200, 100, np.int16))
+        yield AudioChunk(np.array([], np.int16))
+        yield AudioChunk(np.full(1200, -100, np.int16))
+
+    mock_tts_service.generate_audio_stream.side_effect = mock_stream
 
     response = client.post(
         "/v1/audio/speech",
@@ -272,17 +274,19 @@ def test_openai_speech_endpoint(
             "model": "kokoro",
             "input": "Hello world",
             "voice": test_voice,
-            "response_format": "mp3",
+            "response_format": "pcm",
             "stream": False,
         },
     )
     assert response.status_code == 200
-    assert response.headers["content-type"] == "audio/mpeg"
-    assert len(response.content) > 0
-    assert response.content == mock_audio_bytes + mock_audio_bytes
+    assert response.headers["content-type"] == "audio/pcm"
+    assert response.content == (
+        np.full(1200, 100, np.int16).tobytes() + np.full(1200, -100, np.int16).tobytes()
+    )
 
-    mock_tts_service.generate_audio.assert_called_once()
-    assert mock_convert.call_count == 2
+    mock_tts_service.generate_audio_stream.assert_called_once()
+    assert mock_tts_service.generate_audio_stream.call_args[1]["output_format"] is None
+    mock_tts_service.generate_audio.assert_not_called()
 
 
 def test_openai_speech_streaming(mock_tts_service, test_voice, mock_audio_bytes):
@@ -357,8 +361,9 @@ def test_openai_speech_empty_text(mock_tts_service, test_voice):
 
     async def mock_error_stream(*args, **kwargs):
         raise ValueError("Text is empty after preprocessing")
+        yield
 
-    mock_tts_service.generate_audio = mock_error_stream
+    mock_tts_service.generate_audio_stream.side_effect = mock_error_stream
     mock_tts_service.list_voices.return_value = ["test_voice"]
 
     response = client.post(
@@ -424,8 +429,9 @@ def test_server_error(mock_tts_service, test_voice):
 
     async def mock_error_stream(*args, **kwargs):
         raise RuntimeError("Internal server error")
+        yield
 
-    mock_tts_service.generate_audio = mock_error_stream
+    mock_tts_service.generate_audio_stream.side_effect = mock_error_stream
     mock_tts_service.list_voices.return_value = ["test_voice"]
 
     response = client.post(
@@ -497,3 +503,272 @@ async def test_streaming_initialization_error():
 
     writer.close()
     assert "Failed to initialize stream" in str(exc.value)
+
+
+def test_speech_batch_ndjson(mock_tts_service):
+    """Test batch items stream back as JSON lines, bad voices failing alone"""
+    mock_tts_service._get_voices_path.side_effect = lambda voice: (
+        voice,
+        f"/voices/{voice}.pt",
+    )
+    mock_tts_service.generate_audio.side_effect = lambda **kwargs: AudioChunk(
+        np.ones(240, np.int16)
+    )
+    response = client.post(
+        "/v1/audio/speech/batch",
+        json={
+            "items": [
+                {"id": "a", "input": "One.", "voice": "voice1", "response_format": "pcm"},
+                {"input": "Two.", "voice": "missing", "response_format": "pcm"},
+                {"input": "Three.", "voice": "voice1", "response_format": "wav"},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    results = {
+        line["index"]: line for line in map(json.loads, response.text.splitlines())
+    }
+    assert results[0]["status"] == "completed"
+    assert results[0]["id"] == "a"
+    assert base64.b64decode(results[0]["audio"]) == np.ones(240, np.int16).tobytes()
+    assert results[1]["status"] == "failed"
+    assert "missing" in results[1]["error"]
+    assert base64.b64decode(results[2]["audio"])[:4] == b"RIFF"
+    # Each voice is resolved once for the whole batch
+    mock_tts_service._get_voices_path.assert_awaited_once_with("voice1")
+
+
+def test_speech_batch_zip(mock_tts_service):
+    """Test batch results can be fetched as a zip with a manifest"""
+    mock_tts_service._get_voices_path.return_value = ("voice1", "/voices/voice1.pt")
+    mock_tts_service.generate_audio.side_effect = lambda **kwargs: AudioChunk(
+        np.ones(240, np.int16)
+    )
+    response = client.post(
+        "/v1/audio/speech/batch",
+        json={
+            "output": "zip",
+            "items": [
+                {"id": "x/y", "input": "One.", "voice": "voice1", "response_format": "pcm"},
+                {"input": "Two.", "voice": "voice1", "response_format": "pcm"},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert sorted(archive.namelist()) == ["00000_x_y.pcm", "00001.pcm", "manifest.json"]
+    manifest = json.loads(archive.read("manifest.json"))
+    assert [entry["file"] for entry in manifest] == ["00000_x_y.pcm", "00001.pcm"]
+    assert archive.read("00001.pcm") == np.ones(240, np.int16).tobytes()
+
+
+def test_speech_batch_too_many_items(mock_tts_service):
+    """Test batches over the configured limit are rejected"""
+    with patch("api.src.routers.openai_compatible.settings") as mock_settings:
+        mock_settings.batch_max_items = 1
+        response = client.post(
+            "/v1/audio/speech/batch",
+            json={"items": [{"input": "One."}, {"input": "Two."}]},
+        )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("text", ["", "   \n"])
+def test_speech_batch_rejects_blank_items(mock_tts_service, text):
+    """Test blank prompts fail validation instead of synthesis"""
+    response = client.post(
+        "/v1/audio/speech/batch",
+        json={"items": [{"input": "One."}, {"input": text}]},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "items", 1, "input"]
+
+
+@pytest.fixture
+def job_runner(tmp_path):
+    """Job runner backed by a temporary store that is never started"""
+    from api.src.services.jobs import JobRunner, JobStore
+
+    runner = JobRunner(JobStore(str(tmp_path)))
+    with patch(
+        "api.src.routers.openai_compatible.get_job_runner", return_value=runner
+    ):
+        yield runner
+    runner.store.close()
+
+
+def test_speech_job_lifecycle(mock_tts_service, job_runner):
+    """Test a job is queued, reports progress and serves audio once done"""
+    response = client.post(
+        "/v1/audio/jobs",
+        json={"input": "A long document.", "voice": "voice1", "response_format": "pcm"},
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert response.json()["status"] == "pending"
+
+    response = client.get(f"/v1/audio/jobs/{job_id}/audio")
+    assert response.status_code == 409
+
+    mock_tts_service._get_voices_path.return_value = ("voice1", "/voices/voice1.pt")
+    mock_tts_service.generate_chunk_audio.return_value = np.ones(240, np.int16)
+    asyncio.run(job_runner.process(job_id, mock_tts_service))
+
+    progress = client.get(f"/v1/audio/jobs/{job_id}").json()
+    assert progress["status"] == "completed"
+    assert progress["chunks_done"] == progress["chunks_total"] == 1
+
+    response = client.get(f"/v1/audio/jobs/{job_id}/audio")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/pcm"
+    assert response.content == np.ones(240, np.int16).tobytes()
+
+    assert client.delete(f"/v1/audio/jobs/{job_id}").json()["status"] == "deleted"
+    assert client.get(f"/v1/audio/jobs/{job_id}").status_code == 404
+
+
+@pytest.mark.parametrize("text", ["", "   \n"])
+def test_speech_job_rejects_blank_input(mock_tts_service, job_runner, text):
+    """Test blank documents are rejected before a job is queued"""
+    response = client.post("/v1/audio/jobs", json={"input": text, "voice": "voice1"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "input"]
+    assert job_runner.store.next_pending() is None
+
+
+def test_speech_job_invalid_voice(mock_tts_service, job_runner):
+    """Test jobs are rejected up front for unknown voices"""
+    response = client.post(
+        "/v1/audio/jobs", json={"input": "Hello.", "voice": "missing_voice"}
+    )
+    assert response.status_code == 400
+    assert job_runner.store.next_pending() is None
+
+
+def test_resume_speech_stream(mock_tts_service, mock_audio_bytes):
+    """Test a streamed response can be fetched again from a byte offset"""
+    from api.src.services.stream_buffer import StreamBuffer
+
+    with patch(
+        "api.src.routers.openai_compatible.get_stream_buffer",
+        return_value=StreamBuffer(1024, 60),
+    ), patch(
+        "api.src.routers.openai_compatible.settings.stream_resume_enabled", True
+    ):
+        response = client.post(
+            "/v1/audio/speech",
+            json={"input": "Hello.", "voice": "voice1", "response_format": "pcm"},
+        )
+        assert response.status_code == 200
+        assert response.content == mock_audio_bytes
+        stream_id = response.headers["x-stream-id"]
+
+        response = client.get(f"/v1/audio/speech/streams/{stream_id}?offset=5")
+        assert response.status_code == 200
+        assert response.headers["x-stream-offset"] == "5"
+        assert response.content == mock_audio_bytes[5:]
+
+        response = client.get(f"/v1/audio/speech/streams/{stream_id}?offset=1000")
+        assert response.status_code == 416
+        assert client.get("/v1/audio/speech/streams/unknown").status_code == 404
+
+
+def test_download_ranges_and_etag(tmp_path):
+    """Test downloads serve byte ranges and revalidate with the ETag"""
+    from api.src.services.temp_manager import TempFileIndex
+
+    (tmp_path / "speech.mp3").write_bytes(bytes(range(100)))
+    with patch(
+        "api.src.services.temp_manager.temp_file_index", TempFileIndex(str(tmp_path))
+    ):
+        response = client.get("/v1/download/speech.mp3")
+        assert response.status_code == 200
+        assert response.content == bytes(range(100))
+        assert response.headers["accept-ranges"] == "bytes"
+        etag = response.headers["etag"]
+
+        response = client.get(
+            "/v1/download/speech.mp3", headers={"Range": "bytes=10-19"}
+        )
+        assert response.status_code == 206
+        assert response.content == bytes(range(10, 20))
+        assert response.headers["content-range"] == "bytes 10-19/100"
+
+        response = client.get(
+            "/v1/download/speech.mp3",
+            headers={"Range": "bytes=90-", "If-Range": etag},
+        )
+        assert response.status_code == 206
+        assert response.content == bytes(range(90, 100))
+
+        response = client.get(
+            "/v1/download/speech.mp3", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+
+        assert client.get("/v1/download/missing.mp3").status_code == 404
+
+
+def test_stream_download_in_other_format(mock_tts_service, tmp_path):
+    """Test the download copy is encoded in download_format, not streamed bytes"""
+    import wave
+
+    from api.src.services.temp_manager import TempFileIndex
+
+    async def mock_stream(*args, **kwargs):
+        yield AudioChunk(np.ones(240, np.int16), output=b"opus-bytes")
+        # A short pause Opus has not emitted any bytes for yet
+        yield AudioChunk(np.zeros(4800, np.int16), output=b"")
+        yield AudioChunk(np.full(240, 3, np.int16), output=b"more-opus")
+        yield AudioChunk(np.array([], np.int16), output=b"")
+
+    mock_tts_service.generate_audio_stream = mock_stream
+    with patch(
+        "api.src.services.temp_manager.temp_file_index", TempFileIndex(str(tmp_path))
+    ), patch(
+        "api.src.services.temp_manager.settings.temp_file_dir", str(tmp_path)
+    ):
+        response = client.post(
+            "/v1/audio/speech",
+            json={
+                "input": "Hello. [pause:0.2s] Bye.",
+                "voice": "voice1",
+                "response_format": "opus",
+                "download_format": "wav",
+                "return_download_link": True,
+            },
+        )
+    assert response.status_code == 200
+    assert response.content == b"opus-bytesmore-opus"
+
+    path = tmp_path / response.headers["x-download-path"].split("/")[-1]
+    with wave.open(str(path)) as wav:
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), np.int16)
+    assert len(samples) == 5280
+    assert not samples[240:5040].any()
+    assert samples[-1] == 3
+
+
+def test_openai_speech_ulaw(mock_tts_service):
+    """Test ulaw output is resampled to 8 kHz with one byte per sample"""
+
+    async def mock_stream(*args, **kwargs):
+        yield AudioChunk(np.zeros(1000, np.int16))
+
+    mock_tts_service.generate_audio_stream.side_effect = mock_stream
+    response = client.post(
+        "/v1/audio/speech",
+        json={
+            "input": "Hello world",
+            "voice": "voice1",
+            "response_format": "ulaw",
+            "stream": False,
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/basic"
+    # 1000 samples at 24 kHz
+    assert len(response.content) == 334
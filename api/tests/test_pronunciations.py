@@ -0,0 +1,145 @@
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api.src.core.pronunciations import PronunciationStore
+from api.src.inference.kokoro_v1 import KokoroV1
+
+
+@pytest.fixture
+def dict_file(tmp_path):
+    """Create a pronunciation dictionary on disk."""
+    path = tmp_path / "pronunciations.json"
+    path.write_text(json.dumps({"kokoro": "kˈOkəɹO"}), encoding="utf-8")
+    return path
+
+
+def test_store_loads_once(dict_file):
+    """Test the file is parsed once and shared by reads."""
+    store = PronunciationStore(str(dict_file))
+    with patch("json.load", wraps=json.load) as mock_load:
+        assert store.entries["kokoro"] == "kˈOkəɹO"
+        assert store.version == 1
+        assert dict(store.entries) == {"kokoro": "kˈOkəɹO"}
+        mock_load.assert_called_once()
+
+
+def test_store_missing_file(tmp_path):
+    """Test a missing dictionary yields an empty store."""
+    store = PronunciationStore(str(tmp_path / "missing.json"))
+    assert dict(store.entries) == {}
+    assert store.version == 0
+
+
+def test_store_update_and_delete_notify(dict_file):
+    """Test subscribers see every change and the file is persisted."""
+    store = PronunciationStore(str(dict_file))
+    seen = []
+    store.subscribe(lambda entries, version: seen.append((dict(entries), version)))
+
+    store.update("Llama", "lˈɑːmə")
+    store.delete("kokoro")
+
+    assert seen == [
+        ({"kokoro": "kˈOkəɹO"}, 1),
+        ({"kokoro": "kˈOkəɹO", "llama": "lˈɑːmə"}, 2),
+        ({"llama": "lˈɑːmə"}, 3),
+    ]
+    assert json.loads(dict_file.read_text(encoding="utf-8")) == {"llama": "lˈɑːmə"}
+    # Our own save is not treated as an external edit
+    assert store.check_for_updates() is False
+
+
+def test_store_update_validation(dict_file):
+    """Test empty words are rejected."""
+    store = PronunciationStore(str(dict_file))
+    with pytest.raises(ValueError):
+        store.update("", "x")
+    with pytest.raises(ValueError):
+        store.delete("")
+
+
+def test_store_reloads_on_mtime_change(dict_file):
+    """Test edits on disk are picked up by polling."""
+    store = PronunciationStore(str(dict_file))
+    assert store.version == 1
+    assert store.check_for_updates() is False
+
+    dict_file.write_text(json.dumps({"kokoro": "kˈOkəɹO", "hi": "hˈI"}))
+    stat = os.stat(dict_file)
+    os.utime(dict_file, (stat.st_atime, stat.st_mtime + 10))
+
+    assert store.check_for_updates() is True
+    assert store.entries["hi"] == "hˈI"
+    assert store.version == 2
+
+
+@pytest.mark.asyncio
+async def test_store_watch_reloads_in_thread(dict_file):
+    """Test polling picks up edits, reading the file off the event loop."""
+    import asyncio
+    import threading
+
+    store = PronunciationStore(str(dict_file))
+    assert store.version == 1
+    threads = []
+    store.subscribe(lambda entries, version: threads.append(threading.get_ident()))
+
+    dict_file.write_text(json.dumps({"hi": "hˈI"}))
+    stat = os.stat(dict_file)
+    os.utime(dict_file, (stat.st_atime, stat.st_mtime + 10))
+
+    store.start_watching(0.01)
+    try:
+        for _ in range(100):
+            if store.version == 2:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await store.stop_watching()
+
+    assert dict(store.entries) == {"hi": "hˈI"}
+    assert threads[-1] != threading.get_ident()
+
+
+def test_pipeline_lexicon_follows_store(dict_file):
+    """Test pipelines get entries without reading the file and track changes."""
+    store = PronunciationStore(str(dict_file))
+    with patch("api.src.inference.kokoro_v1.pronunciation_store", store):
+        backend = KokoroV1()
+    backend._model = MagicMock()
+
+    pipeline = MagicMock()
+    original = {"kokoro": "original"}
+    pipeline.g2p.lexicon.golds = original
+    with (
+        patch("api.src.inference.kokoro_v1.KPipeline", return_value=pipeline),
+        patch("builtins.open") as mock_open,
+    ):
+        backend._get_pipeline("a")
+        mock_open.assert_not_called()
+
+    golds = pipeline.g2p.lexicon.golds
+    assert golds["kokoro"] == "kˈOkəɹO"
+    assert golds["CEM"] == "C P Q"
+
+    store.update("llama", "lˈɑːmə")
+    # Each version is published as a new dict, never mutating one in use
+    assert pipeline.g2p.lexicon.golds is not golds
+    assert "llama" not in golds
+    assert pipeline.g2p.lexicon.golds["llama"] == "lˈɑːmə"
+
+    store.delete("kokoro")
+    store.delete("llama")
+    golds = pipeline.g2p.lexicon.golds
+    assert golds["kokoro"] == "original"
+    assert "llama" not in golds
+
+    backend.unload()
+    store.update("llama", "lˈɑːmə")
+    assert pipeline.g2p.lexicon.golds is golds
+    assert backend._original_golds == {}
+    # The shipped lexicon itself was never changed
+    assert original == {"kokoro": "original"}
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import numpy as np
 import pytest
@@ -21,13 +21,9 @@ def reset_config():
 def mock_tts_service():
     with patch("api.src.routers.openai_compatible.get_tts_service") as mock_get:
         service = AsyncMock()
-        service.generate_audio.return_value = openai_compatible.AudioChunk(
-            np.zeros(100, np.int16)
-        )
         async def mock_stream(*args, **kwargs):
-            if False:
-                yield b""
-        service.generate_audio_stream = mock_stream
+            yield openai_compatible.AudioChunk(np.zeros(100, np.int16))
+        service.generate_audio_stream = MagicMock(side_effect=mock_stream)
         service.list_voices.return_value = ["af_heart", "new_voice"]
         mock_get.return_value = service
         mock_get.side_effect = None
@@ -45,8 +41,8 @@ def test_update_base_config_affects_defaults(mock_tts_service):
         "/v1/audio/speech",
         json={"model": "kokoro", "input": "hi", "stream": False},
     )
-    mock_tts_service.generate_audio.assert_called()
-    kwargs = mock_tts_service.generate_audio.call_args[1]
+    mock_tts_service.generate_audio_stream.assert_called()
+    kwargs = mock_tts_service.generate_audio_stream.call_args[1]
     assert kwargs["voice"] == "new_voice"
     assert kwargs["speed"] == 1.5
 
@@ -62,5 +58,5 @@ def test_update_advanced_config_affects_stream(mock_tts_service):
         "/v1/audio/speech",
         json={"model": "kokoro", "input": "hello", "stream": False},
     )
-    mock_tts_service.generate_audio.assert_called_once()
+    mock_tts_service.generate_audio_stream.assert_called_once()
 
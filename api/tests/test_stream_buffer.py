@@ -0,0 +1,154 @@
+"""Tests for the resumable stream buffer"""
+
+import asyncio
+
+import pytest
+
+from api.src.services.stream_buffer import StreamBuffer, StreamEvictedError
+
+
+async def chunks(*items, gate: asyncio.Event = None):
+    for index, item in enumerate(items):
+        if gate is not None and index == 1:
+            await gate.wait()
+        yield item
+
+
+async def read_all(stream, offset=0):
+    return b"".join([data async for data in stream.read(offset)])
+
+
+@pytest.mark.asyncio
+async def test_read_from_offset_mid_chunk():
+    """Test reading resumes inside a chunk and skips delivered ones"""
+    stream = StreamBuffer(1024, 60).create("audio/pcm")
+    stream.start(chunks(b"abc", b"def", b"gh"))
+    assert await read_all(stream) == b"abcdefgh"
+    assert await read_all(stream, 4) == b"efgh"
+    assert await read_all(stream, 8) == b""
+    assert stream.offsets == [0, 3, 6]
+
+
+@pytest.mark.asyncio
+async def test_reader_receives_chunks_still_generating():
+    """Test a resumed reader waits for chunks produced after it attached"""
+    gate = asyncio.Event()
+    stream = StreamBuffer(1024, 60).create("audio/pcm")
+    stream.start(chunks(b"abc", b"def", gate=gate))
+    await asyncio.sleep(0)
+
+    reader = asyncio.create_task(read_all(stream, 1))
+    await asyncio.sleep(0.01)
+    assert not reader.done()
+    gate.set()
+    assert await asyncio.wait_for(reader, 1) == b"bcdef"
+
+
+@pytest.mark.asyncio
+async def test_generation_continues_without_readers():
+    """Test a dropped client does not stop generation"""
+    buffer = StreamBuffer(1024, 60)
+    stream = buffer.create("audio/pcm")
+    stream.start(chunks(b"abc", b"def"))
+
+    reader = stream.read()
+    assert await reader.__anext__() == b"abc"
+    await reader.aclose()
+    await asyncio.sleep(0.01)
+
+    assert stream.finished
+    assert buffer.get(stream.stream_id) is stream
+    assert await read_all(stream, 3) == b"def"
+
+
+@pytest.mark.asyncio
+async def test_memory_limit_evicts_least_recently_used():
+    """Test streams over the memory limit are evicted oldest first"""
+    buffer = StreamBuffer(8, 60)
+    old = buffer.create("audio/pcm")
+    old.start(chunks(b"12345"))
+    await asyncio.sleep(0.01)
+    new = buffer.create("audio/pcm")
+    new.start(chunks(b"67890"))
+    await asyncio.sleep(0.01)
+
+    assert buffer.get(old.stream_id) is None
+    assert buffer.get(new.stream_id) is new
+    assert buffer.total_bytes == 5
+    with pytest.raises(StreamEvictedError):
+        await read_all(old)
+
+
+@pytest.mark.asyncio
+async def test_live_reader_survives_memory_limit():
+    """Test a stream being read keeps playing and drops delivered bytes instead"""
+    gate = asyncio.Event()
+    buffer = StreamBuffer(8, 60)
+    stream = buffer.create("audio/pcm")
+    stream.start(chunks(b"12345", b"67890", gate=gate))
+    await asyncio.sleep(0)
+
+    reader = stream.read()
+    assert await reader.__anext__() == b"12345"
+    gate.set()
+    assert await reader.__anext__() == b"67890"
+    await reader.aclose()
+
+    assert not stream.evicted
+    assert stream.base == 5
+    assert buffer.total_bytes == 5
+    assert buffer.get(stream.stream_id) is None
+    with pytest.raises(StreamEvictedError):
+        await read_all(stream)
+
+
+@pytest.mark.asyncio
+async def test_memory_limit_skips_streams_with_readers():
+    """Test eviction passes over streams that still have a reader"""
+    buffer = StreamBuffer(8, 60)
+    gate = asyncio.Event()
+    live = buffer.create("audio/pcm")
+    live.start(chunks(b"12345", b"xyz", gate=gate))
+    await asyncio.sleep(0)
+    reader = live.read()
+    reader_task = asyncio.create_task(reader.__anext__())
+    await asyncio.sleep(0)
+
+    idle = buffer.create("audio/pcm")
+    idle.start(chunks(b"67890"))
+    await asyncio.sleep(0.01)
+
+    assert not live.evicted
+    assert idle.evicted
+    assert await reader_task == b"12345"
+    gate.set()
+    assert await reader.__anext__() == b"xyz"
+    await reader.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_streams_are_dropped():
+    """Test streams without readers expire after the ttl"""
+    buffer = StreamBuffer(1024, 0)
+    stream = buffer.create("audio/pcm")
+    stream.start(chunks(b"abc"))
+    await asyncio.sleep(0.01)
+    assert buffer.get(stream.stream_id) is None
+    assert buffer.total_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_generation_error_reaches_reader():
+    """Test readers get produced audio, then the generation error"""
+
+    async def failing():
+        yield b"abc"
+        raise RuntimeError("model failed")
+
+    stream = StreamBuffer(1024, 60).create("audio/pcm")
+    stream.start(failing())
+    received = []
+    with pytest.raises(RuntimeError, match="model failed"):
+        async for data in stream.read():
+            received.append(data)
+    assert received == [b"abc"]
@@ -0,0 +1,157 @@
+"""Tests for temp file writing and the download index"""
+
+import hashlib
+import os
+import time
+import wave
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from api.src.services.temp_manager import (
+    DownloadEncoder,
+    TempFileIndex,
+    TempFileWriter,
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TempFileIndex(str(tmp_path))
+    with patch("api.src.services.temp_manager.temp_file_index", index), patch(
+        "api.src.services.temp_manager.settings.temp_file_dir", str(tmp_path)
+    ):
+        yield index
+
+
+@pytest.mark.asyncio
+async def test_writer_indexes_finished_file(index):
+    """Test finalized files are indexed with a hash of what was written"""
+    async with TempFileWriter("mp3") as writer:
+        name = writer.download_path.split("/")[-1]
+        await writer.write(b"abc")
+        assert (await index.lookup(name)).etag is None
+        await writer.write(b"def")
+        await writer.finalize()
+
+    entry = await index.lookup(name)
+    assert entry.stat.st_size == 6
+    assert entry.etag == f'"{hashlib.blake2b(b"abcdef", digest_size=16).hexdigest()}"'
+
+
+@pytest.mark.asyncio
+async def test_lookup_indexes_existing_files(index, tmp_path):
+    """Test files written before a restart are hashed once on first lookup"""
+    (tmp_path / "old.wav").write_bytes(b"RIFF")
+    entry = await index.lookup("old.wav")
+    assert entry.etag == f'"{hashlib.blake2b(b"RIFF", digest_size=16).hexdigest()}"'
+    assert await index.lookup("old.wav") is entry
+
+
+@pytest.mark.asyncio
+async def test_lookup_rejects_paths(index, tmp_path):
+    """Test only plain names inside the temp directory are served"""
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.wav").write_bytes(b"x")
+    assert await index.lookup("sub/a.wav") is None
+    assert await index.lookup("../a.wav") is None
+    assert await index.lookup("missing.wav") is None
+
+
+def write_file(tmp_path, name, size, age_s=0):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age_s
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.mark.asyncio
+async def test_enforce_limits_removes_oldest_first(index, tmp_path):
+    """Test age, count and size limits delete the oldest indexed files"""
+    write_file(tmp_path, "expired.mp3", 10, age_s=7200)
+    write_file(tmp_path, "older.mp3", 10, age_s=300)
+    write_file(tmp_path, "old.mp3", 10, age_s=200)
+    write_file(tmp_path, "new.mp3", 10, age_s=100)
+    await index.load()
+    assert index.total_bytes == 40
+
+    with patch("api.src.services.temp_manager.settings") as mock_settings:
+        mock_settings.max_temp_dir_age_hours = 1
+        mock_settings.max_temp_dir_count = 2
+        mock_settings.max_temp_dir_size_mb = 1
+        assert await index.enforce_limits() == 2
+
+    assert sorted(os.listdir(tmp_path)) == ["new.mp3", "old.mp3"]
+    assert len(index) == 2
+    assert index.total_bytes == 20
+
+
+@pytest.mark.asyncio
+async def test_enforce_limits_skips_files_being_written(index, tmp_path):
+    """Test files still being written are never deleted by the limits"""
+    async with TempFileWriter("mp3") as writer:
+        await writer.write(b"abc")
+        with patch("api.src.services.temp_manager.settings") as mock_settings:
+            mock_settings.max_temp_dir_age_hours = 1
+            mock_settings.max_temp_dir_count = 0
+            mock_settings.max_temp_dir_size_mb = 0
+            assert await index.enforce_limits() == 0
+        assert os.path.exists(writer.temp_path)
+
+
+@pytest.mark.asyncio
+async def test_writer_buffers_until_threshold(index):
+    """Test chunks stay in memory until the flush threshold is reached"""
+    with patch(
+        "api.src.services.temp_manager.settings.temp_file_flush_bytes", 8
+    ):
+        async with TempFileWriter("pcm") as writer:
+            await writer.write(b"abcd")
+            assert os.path.getsize(writer.temp_path) == 0
+            await writer.write(b"efgh")
+            assert os.path.getsize(writer.temp_path) == 8
+            await writer.write(b"ij")
+            await writer.finalize()
+
+    with open(writer.temp_path, "rb") as f:
+        assert f.read() == b"abcdefghij"
+
+
+@pytest.mark.asyncio
+async def test_writer_keeps_partial_file_on_error(index):
+    """Test buffered chunks are written out when exiting without finalize"""
+    async with TempFileWriter("pcm") as writer:
+        await writer.write(b"partial")
+
+    with open(writer.temp_path, "rb") as f:
+        assert f.read() == b"partial"
+    assert (await index.lookup(os.path.basename(writer.temp_path))).etag
+
+
+@pytest.mark.asyncio
+async def test_download_encoder_transcodes_stream(index):
+    """Test the download copy is encoded in its own format from raw audio"""
+    async with TempFileWriter("wav") as writer:
+        encoder = DownloadEncoder(writer, "wav")
+        await encoder.submit(np.ones(100, np.int16))
+        await encoder.submit(np.array([], np.int16))
+        await encoder.submit(np.full(50, 2, np.int16))
+        await encoder.finalize()
+
+    with wave.open(writer.temp_path) as wav:
+        assert wav.getframerate() == 24000
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), np.int16)
+    assert len(samples) == 150
+    assert samples[-1] == 2
+
+
+@pytest.mark.asyncio
+async def test_download_encoder_close_leaves_partial_file(index):
+    """Test closing on a failed stream stops encoding without finalizing"""
+    async with TempFileWriter("mp3") as writer:
+        encoder = DownloadEncoder(writer, "mp3")
+        await encoder.submit(np.ones(2400, np.int16))
+        await encoder.close()
+        assert not writer._finalized
@@ -1,17 +1,51 @@
+from array import array
+from unittest.mock import MagicMock, patch
+
 import pytest
 
+from api.src.services.text_processing.phonemizer import phonemize, phonemize_batch
+from api.src.services.text_processing import text_processor
 from api.src.services.text_processing.text_processor import (
+    TextStreamBuffer,
+    cut_sentence,
     get_sentence_info,
     process_text_chunk,
+    process_text_chunks,
+    segment_clauses,
+    segment_words,
     smart_split,
+    split_sentences,
+)
+from api.src.services.text_processing.vocabulary import (
+    VOCAB,
+    decode_tokens,
+    tokenize,
 )
 
 
+def test_tokenize_matches_vocab():
+    """Test the lookup table tokenizer agrees with the vocabulary dict."""
+    phonemes = " həlˈoʊ, wˈɜːld! 中x😀\n"
+    expected = [VOCAB[c] for c in phonemes.strip() if c in VOCAB]
+    tokens = tokenize(phonemes)
+    assert isinstance(tokens, array)
+    assert tokens.typecode == "h"
+    assert list(tokens) == expected
+    assert len(tokenize("   ")) == 0
+
+
+def test_decode_tokens_round_trip():
+    """Test decoding restores the phoneme string."""
+    phonemes = "ðə tˈaɪm tɹˈævəlɚ"
+    assert decode_tokens(tokenize(phonemes)) == phonemes
+    assert decode_tokens([]) == ""
+
+
 def test_process_text_chunk_basic():
     """Test basic text chunk processing."""
     text = "Hello world"
     tokens = process_text_chunk(text)
-    assert isinstance(tokens, list)
+    assert isinstance(tokens, array)
     assert len(tokens) > 0
 
 
@@ -19,7 +53,7 @@ def test_process_text_chunk_empty():
     """Test processing empty text."""
     text = ""
     tokens = process_text_chunk(text)
-    assert isinstance(tokens, list)
+    assert isinstance(tokens, array)
     assert len(tokens) == 0
 
 
@@ -27,10 +61,34 @@ def test_process_text_chunk_phonemes():
     """Test processing with skip_phonemize."""
     phonemes = "h @ l @U"  # Example phoneme sequence
     tokens = process_text_chunk(phonemes, skip_phonemize=True)
-    assert isinstance(tokens, list)
+    assert isinstance(tokens, array)
     assert len(tokens) > 0
 
 
+def test_phonemize_batch_matches_single():
+    """Test batched phonemization stays aligned with its inputs."""
+    texts = ["Hello world.", "", "Two\nlines here.", "...", "  padded  ", "Nine, ninety!"]
+    assert phonemize_batch(texts) == [phonemize(text) for text in texts]
+
+
+def test_process_text_chunks_matches_single():
+    """Test batch processing gives the same tokens as one chunk at a time."""
+    texts = ["Hello world.", "", "How are you today?"]
+    assert process_text_chunks(texts) == [process_text_chunk(text) for text in texts]
+
+
+def test_get_sentence_info_single_batch():
+    """Test all sentences of a part are phonemized in one call."""
+    text = "This is sentence one. This is sentence two! What about three?"
+    with patch(
+        "api.src.services.text_processing.text_processor.phonemize_batch",
+        wraps=phonemize_batch,
+    ) as mock_batch:
+        results = get_sentence_info(text, {})
+    mock_batch.assert_called_once()
+    assert len(results) == 3
+
+
 def test_get_sentence_info():
     """Test sentence splitting and info extraction."""
     text = "This is sentence one. This is sentence two! What about three?"
@@ -39,7 +97,7 @@ def test_get_sentence_info():
     assert len(results) == 3
     for sentence, tokens, count in results:
         assert isinstance(sentence, str)
-        assert isinstance(tokens, list)
+        assert isinstance(tokens, array)
         assert isinstance(count, int)
         assert count == len(tokens)
         assert count > 0
@@ -56,12 +114,27 @@ def test_get_sentence_info_phenomoes():
     assert "sˈɛntᵊns" in results[1][0]
     for sentence, tokens, count in results:
         assert isinstance(sentence, str)
-        assert isinstance(tokens, list)
+        assert isinstance(tokens, array)
         assert isinstance(count, int)
         assert count == len(tokens)
         assert count > 0
 
 
+def test_split_sentences_restores_many_placeholders():
+    """Test every placeholder is restored in place and consumed once."""
+    phonemes = {f"</|custom_phonemes_{i}|/>": f"[w{i}](/p{i}/)" for i in range(500)}
+    text = " ".join(
+        f"Say </|custom_phonemes_{2 * i}|/> and </|custom_phonemes_{2 * i + 1}|/>."
+        for i in range(250)
+    )
+    sentences = split_sentences(text, phonemes)
+
+    assert len(sentences) == 250
+    assert sentences[0] == "Say [w0](/p0/) and [w1](/p1/)."
+    assert sentences[-1] == "Say [w498](/p498/) and [w499](/p499/)."
+    assert phonemes == {}
+
+
 @pytest.mark.asyncio
 async def test_smart_split_short_text():
     """Test smart splitting with text under max tokens."""
@@ -72,7 +145,7 @@ async def test_smart_split_short_text():
 
     assert len(chunks) == 1
     assert isinstance(chunks[0][0], str)
-    assert isinstance(chunks[0][1], list)
+    assert isinstance(chunks[0][1], array)
 
 
 @pytest.mark.asyncio
@@ -88,7 +161,7 @@ async def test_smart_split_long_text():
     assert len(chunks) > 1
     for chunk_text, chunk_tokens in chunks:
         assert isinstance(chunk_text, str)
-        assert isinstance(chunk_tokens, list)
+        assert isinstance(chunk_tokens, array)
         assert len(chunk_tokens) > 0
 
 
@@ -109,7 +182,7 @@ def test_process_text_chunk_chinese_phonemes():
     """Test processing with Chinese pinyin phonemes."""
     pinyin = "nǐ hǎo lì"  # Example pinyin sequence with tones
     tokens = process_text_chunk(pinyin, skip_phonemize=True, language="z")
-    assert isinstance(tokens, list)
+    assert isinstance(tokens, array)
     assert len(tokens) > 0
 
 
@@ -121,7 +194,7 @@ def test_get_sentence_info_chinese():
     assert len(results) == 3
     for sentence, tokens, count in results:
         assert isinstance(sentence, str)
-        assert isinstance(tokens, list)
+        assert isinstance(tokens, array)
         assert isinstance(count, int)
         assert count == len(tokens)
         assert count > 0
@@ -137,7 +210,7 @@ async def test_smart_split_chinese_short():
 
     assert len(chunks) == 1
     assert isinstance(chunks[0][0], str)
-    assert isinstance(chunks[0][1], list)
+    assert isinstance(chunks[0][1], array)
 
 
 @pytest.mark.asyncio
@@ -152,7 +225,7 @@ async def test_smart_split_chinese_long():
     assert len(chunks) > 1
     for chunk_text, chunk_tokens in chunks:
         assert isinstance(chunk_text, str)
-        assert isinstance(chunk_tokens, list)
+        assert isinstance(chunk_tokens, array)
         assert len(chunk_tokens) > 0
 
 
@@ -221,4 +294,132 @@ async def test_smart_split_with_two_pause():
     # Third chunk: text
     assert chunks[2][2] is None  # No pause
     assert "zero point five" in chunks[2][0]
-    assert len(chunks[2][1]) > 0
\ No newline at end of file
+    assert len(chunks[2][1]) > 0
+
+def test_phonemizer_pool_bounds_and_metrics():
+    """Test the pool never creates more backends than its size."""
+    import threading
+
+    from api.src.services.text_processing.phonemizer import PhonemizerPool
+
+    created = []
+
+    def fake_create(language):
+        backend = MagicMock()
+        backend.phonemize_batch.side_effect = lambda texts: [t.upper() for t in texts]
+        created.append(backend)
+        return backend
+
+    with patch(
+        "api.src.services.text_processing.phonemizer.create_phonemizer",
+        side_effect=fake_create,
+    ):
+        pool = PhonemizerPool("a", 2)
+        release = threading.Event()
+
+        def hold():
+            with pool.checkout():
+                release.wait(1)
+
+        threads = [threading.Thread(target=hold) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        texts = [f"text {i}" for i in range(40)]
+        assert pool.phonemize_batch(texts) == [t.upper() for t in texts]
+
+    stats = pool.stats()
+    assert len(created) == 2
+    assert stats["created"] == 2
+    assert stats["idle"] == 2
+    assert stats["checkouts"] >= 5
+    assert stats["max_wait_ms"] >= stats["avg_wait_ms"] >= 0
+
+
+def test_phonemize_batch_fans_out_in_order():
+    """Test a pooled batch matches phonemizing one text at a time."""
+    from api.src.services.text_processing.phonemizer import PhonemizerPool
+
+    texts = [f"Sentence number {i}." for i in range(30)]
+    pool = PhonemizerPool("a", 3)
+    assert pool.phonemize_batch(texts) == [phonemize(t) for t in texts]
+    # Parts that finish early hand their backend on, so fewer may be created
+    assert 1 <= pool.stats()["created"] <= 3
+
+
+def test_segment_clauses_align_with_tokens():
+    """Test clause segments slice the sentence tokens at its commas."""
+    sentence = "First part, second part, and the third part."
+    tokens = process_text_chunk(sentence)
+    segments = segment_clauses(sentence, tokens)
+
+    assert [segment.text for segment in segments] == [
+        "First part,",
+        "second part,",
+        "and the third part.",
+    ]
+    assert segments[0].start == 0
+    assert segments[-1].end == len(tokens)
+    assert decode_tokens(tokens[segments[0].start : segments[0].end]).endswith(",")
+
+    words = segment_words(segments[1], tokens)
+    assert [word.text for word in words] == ["second", "part,"]
+
+
+def test_cut_sentence_slices_without_g2p():
+    """Test cutting reuses the sentence tokens and respects the limits."""
+    sentence = ", ".join(f"clause number {i} of the run on sentence" for i in range(12))
+    tokens = process_text_chunk(sentence + ".")
+    with patch(
+        "api.src.services.text_processing.text_processor.process_text_chunks"
+    ) as mock_process:
+        pieces = cut_sentence(sentence + ".", tokens, 120, 80)
+    mock_process.assert_not_called()
+
+    assert len(pieces) > 1
+    assert " ".join(text for text, _ in pieces) == sentence + "."
+    assert all(len(piece_tokens) <= 80 for _, piece_tokens in pieces)
+    assert sum(len(piece_tokens) for _, piece_tokens in pieces) < len(tokens)
+
+
+@pytest.mark.asyncio
+async def test_smart_split_long_sentence_single_g2p():
+    """Test an oversized run-on sentence is phonemized only once."""
+    sentence = ", ".join(
+        f"the party of the {i} part shall indemnify the other party" for i in range(30)
+    )
+    with patch(
+        "api.src.services.text_processing.text_processor.process_text_chunks",
+        wraps=text_processor.process_text_chunks,
+    ) as mock_process:
+        chunks = [c async for c in smart_split(sentence + ".")]
+
+    assert mock_process.call_count == 1
+    assert len(chunks) > 1
+    assert all(0 < len(tokens) <= 450 for _, tokens, _ in chunks)
+
+
+@pytest.mark.asyncio
+async def test_text_stream_buffer_releases_sentences():
+    """Test streamed deltas are released at sentence boundaries"""
+    buffer = TextStreamBuffer()
+    assert await buffer.push("Hello") is None
+    assert await buffer.push(" there, Mr.") is None
+    assert await buffer.push(" Smith. How are") == "Hello there, Mr. Smith."
+    assert await buffer.push(" you?") is None
+    assert await buffer.push(" Fine") == "How are you?"
+    assert buffer.flush() == "Fine"
+    assert buffer.flush() is None
+
+
+@pytest.mark.asyncio
+async def test_text_stream_buffer_releases_clauses_when_too_long():
+    """Test a run-on sentence is released at a clause once it is too long"""
+    buffer = TextStreamBuffer(max_tokens=40)
+    assert await buffer.push("one, two") is None
+    ready = await buffer.push(" three four five six seven eight, nine")
+    assert ready == "one, two three four five six seven eight,"
+    assert buffer.flush() == "nine"
@@ -0,0 +1,161 @@
+"""Tests for token count estimation used by chunk planning"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from api.src.services.text_processing import text_processor, token_estimator
+from api.src.services.text_processing.text_processor import (
+    finalize_chunk,
+    process_text_chunk,
+    smart_split,
+)
+from api.src.services.text_processing.token_estimator import (
+    LINEAR_ESTIMATORS,
+    ExactTokenEstimator,
+    TokenEstimator,
+    get_token_estimator,
+)
+
+
+class ConstantEstimator(TokenEstimator):
+    """Estimator that always guesses the same count"""
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def estimate(self, text: str) -> int:
+        return self.count
+
+
+def test_linear_estimate_close_to_exact():
+    """Test the calibrated model is close on ordinary prose"""
+    estimator = LINEAR_ESTIMATORS["a"]
+    text = "The Time Traveller was expounding a recondite matter to us."
+    exact = len(process_text_chunk(text))
+    assert abs(estimator.estimate(text) - exact) <= 0.2 * exact
+    assert estimator.upper_bound(text) >= exact
+    assert estimator.estimate("") == 0
+    assert estimator.upper_bound("   ") == 0
+
+
+def test_exact_estimator():
+    """Test the exact estimator matches full G2P"""
+    text = "Hello world, how are you?"
+    assert ExactTokenEstimator().estimate(text) == len(process_text_chunk(text))
+
+
+def test_exact_estimator_phonemizes_each_text_once():
+    """Test upper_bound and repeated texts reuse the cached count"""
+    estimator = ExactTokenEstimator()
+    with patch(
+        "api.src.services.text_processing.token_estimator.phonemize",
+        wraps=token_estimator.phonemize,
+    ) as mock_phonemize:
+        count = estimator.estimate("Hello world.")
+        assert estimator.upper_bound("Hello world.") == count
+        assert estimator.estimate(" Hello world. ") == count
+    assert mock_phonemize.call_count == 1
+
+
+def test_get_token_estimator_setting():
+    """Test the setting selects between linear and exact estimators"""
+    with patch(
+        "api.src.services.text_processing.token_estimator.settings"
+    ) as mock_settings:
+        mock_settings.token_estimator = "linear"
+        assert get_token_estimator("b") is LINEAR_ESTIMATORS["a"]
+        mock_settings.token_estimator = "exact"
+        assert isinstance(get_token_estimator("a"), ExactTokenEstimator)
+
+
+@pytest.mark.asyncio
+async def test_finalize_chunk_splits_overflow():
+    """Test planned chunks that overflow are split on sentences and clauses"""
+    texts = ["First sentence here.", "Second one, with a clause, or two."]
+    exact = [process_text_chunk(t) for t in texts]
+    limit = max(len(exact[0]), len(exact[1]) - 1)
+
+    chunks = await finalize_chunk(texts, limit)
+    assert chunks[0] == (texts[0], exact[0])
+    assert len(chunks) >= 2
+    assert " ".join(text for text, _ in chunks[1:]) == texts[1]
+    assert all(len(tokens) <= limit for _, tokens in chunks)
+
+
+@pytest.mark.asyncio
+async def test_smart_split_never_exceeds_max_with_bad_estimates():
+    """Test chunks stay under max_tokens even when estimates are far too low"""
+    text = ". ".join(
+        f"Sentence {i} goes on, and on, and on about nothing in particular"
+        for i in range(30)
+    )
+    with patch(
+        "api.src.services.text_processing.text_processor.get_token_estimator",
+        return_value=ConstantEstimator(1),
+    ):
+        chunks = [c async for c in smart_split(text, max_tokens=60)]
+
+    assert len(chunks) > 1
+    for chunk_text, tokens, _ in chunks:
+        assert 0 < len(tokens) <= 60
+
+
+@pytest.mark.asyncio
+async def test_smart_split_plans_without_per_sentence_g2p():
+    """Test sentences are only phonemized once, in chunk sized batches"""
+    text = " ".join(f"This is sentence number {i}." for i in range(40))
+    with patch(
+        "api.src.services.text_processing.text_processor.process_text_chunks",
+        wraps=text_processor.process_text_chunks,
+    ) as mock_process:
+        chunks = [c async for c in smart_split(text)]
+
+    phonemized = sum(len(call.args[0]) for call in mock_process.call_args_list)
+    assert phonemized == 40
+    assert mock_process.call_count == len(chunks)
+
+
+@pytest.mark.asyncio
+async def test_smart_split_runs_g2p_estimators_in_thread():
+    """Test estimators that run G2P are kept off the event loop"""
+
+    class ThreadRecordingEstimator(ConstantEstimator):
+        runs_g2p = True
+
+        def estimate(self, text: str) -> int:
+            threads.add(threading.current_thread())
+            return self.count
+
+    threads = set()
+    with patch(
+        "api.src.services.text_processing.text_processor.get_token_estimator",
+        return_value=ThreadRecordingEstimator(5),
+    ):
+        chunks = [c async for c in smart_split("One. Two. Three.")]
+
+    assert chunks
+    assert threads and threading.main_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_smart_split_exact_plans_from_one_batch():
+    """Test exact planning phonemizes a part once and reuses those tokens"""
+    text = " ".join(f"This is sentence number {i}." for i in range(40))
+    with patch(
+        "api.src.services.text_processing.token_estimator.settings"
+    ) as mock_settings, patch(
+        "api.src.services.text_processing.text_processor.process_text_chunks",
+        wraps=text_processor.process_text_chunks,
+    ) as mock_process:
+        mock_settings.token_estimator = "exact"
+        chunks = [c async for c in smart_split(text)]
+
+    assert mock_process.call_count == 1
+    assert len(mock_process.call_args.args[0]) == 40
+    assert len(chunks) > 1
+    sentences = mock_process.call_args.args[0]
+    assert b"".join(tokens.tobytes() for _, tokens, _ in chunks) == b"".join(
+        tokens.tobytes() for tokens in text_processor.process_text_chunks(sentences)
+    )
@@ -6,6 +6,7 @@ import torch
 import os
 
 from api.src.services.tts_service import TTSService
+from api.src.structures.schemas import NormalizationOptions
 
 
 @pytest.fixture
@@ -128,3 +129,125 @@ async def test_list_voices():
         voices = await service.list_voices()
         assert voices == ["voice1", "voice2"]
         voice_manager.list_voices.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_split_text_stream():
+    """Test streamed text segments are each split into chunks as they arrive."""
+
+    async def segments():
+        yield "Hello world."
+        yield "Second [pause:0.5s] segment."
+
+    chunks = [
+        chunk
+        async for chunk in TTSService._split_text_stream(
+            segments(), "a", NormalizationOptions()
+        )
+    ]
+    texts = [text for text, _, pause in chunks if pause is None]
+    assert texts == ["Hello world.", "Second", "segment."]
+    assert [pause for _, _, pause in chunks if pause is not None] == [0.5]
+
+
+@pytest.mark.asyncio
+async def test_pause_streams_shared_silence_blocks():
+    """Test pauses are streamed in blocks viewing one read-only zero buffer."""
+    from api.src.services.streaming_audio_writer import StreamingAudioWriter
+
+    service = TTSService()
+    service.model_manager = MagicMock()
+
+    async def no_audio(*args, **kwargs):
+        return
+        yield
+
+    writer = StreamingAudioWriter("pcm", sample_rate=24000)
+    with patch.object(service, "_process_chunk", no_audio):
+        chunks = [
+            chunk
+            async for chunk in service.generate_audio_stream(
+                "[pause:2.5s]", "af_heart", writer, output_format="pcm", voice_path="/v.pt"
+            )
+        ]
+
+    assert [len(chunk.audio) for chunk in chunks] == [24000, 24000, 12000]
+    assert b"".join(chunk.output for chunk in chunks) == bytes(60000 * 2)
+    assert all(not chunk.audio.flags.writeable for chunk in chunks)
+    assert np.shares_memory(chunks[0].audio, chunks[2].audio)
+
+
+@pytest.mark.asyncio
+async def test_short_pause_yielded_without_encoded_bytes():
+    """Test a pause the encoder holds back still reaches consumers as audio."""
+    from api.src.services.streaming_audio_writer import StreamingAudioWriter
+
+    service = TTSService()
+    service.model_manager = MagicMock()
+
+    async def no_audio(*args, **kwargs):
+        return
+        yield
+
+    writer = StreamingAudioWriter("opus", sample_rate=24000)
+    with patch.object(service, "_process_chunk", no_audio):
+        chunks = [
+            chunk
+            async for chunk in service.generate_audio_stream(
+                "[pause:0.2s] [pause:0.2s]",
+                "af_heart",
+                writer,
+                output_format="opus",
+                voice_path="/v.pt",
+            )
+        ]
+    writer.close()
+
+    # The first pause carries the stream header, the second has no bytes yet
+    assert [len(chunk.audio) for chunk in chunks] == [4800, 4800]
+    assert chunks[1].output == b""
+
+
+@pytest.mark.asyncio
+async def test_crossfade_tail_precedes_pause(monkeypatch):
+    """Test audio held back for crossfading is released before a pause."""
+    from api.src.inference.base import AudioChunk, WordTimestamps
+
+    monkeypatch.setattr("api.src.services.tts_service.settings.crossfade_ms", 10)
+    service = TTSService()
+    service.model_manager = MagicMock()
+
+    async def generate(text, *args, **kwargs):
+        yield AudioChunk(
+            np.full(4800, 10000, np.int16),
+            word_timestamps=WordTimestamps([text], [0.0], [0.1]),
+        )
+
+    service.model_manager.generate = generate
+    with patch("api.src.services.tts_service.KokoroV1", MagicMock):
+        chunks = [
+            chunk
+            async for chunk in service.generate_audio_stream(
+                "Hello. [pause:0.1s] There.", "af_heart", None, output_format=None,
+                return_timestamps=True, voice_path="/v.pt",
+            )
+        ]
+
+    audio = np.concatenate([chunk.audio for chunk in chunks])
+    speech = np.flatnonzero(audio)
+    silence = np.flatnonzero(audio == 0)
+    # Speech, then the pause, then speech: nothing spoken lands in the pause
+    assert len(silence) == 2400
+    assert silence[-1] - silence[0] == 2399
+    assert len(speech) == len(audio) - 2400
+
+    starts = [
+        chunk.word_timestamps.start_times[0]
+        for chunk in chunks
+        if chunk.word_timestamps and chunk.word_timestamps.words
+    ]
+    # The second chunk starts right after the pause, less its trimmed start
+    from api.src.core.config import settings
+
+    expected = (silence[-1] + 1) / 24000 - settings.gap_trim_ms / 1000
+    assert starts[1] == pytest.approx(expected)
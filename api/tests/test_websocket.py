@@ -0,0 +1,179 @@
+"""Tests for the streaming text input and session WebSockets"""
+
+import asyncio
+import struct
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from api.src.inference.base import AudioChunk, WordTimestamps
+from api.src.main import app
+from api.src.services.tts_service import TTSService
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def mock_tts_service():
+    """Mock TTS service that emits one audio frame per text segment."""
+    with patch("api.src.routers.openai_compatible.get_tts_service") as mock_get:
+        service = AsyncMock(spec=TTSService)
+        service.list_voices.return_value = ["af_heart", "af_bella"]
+        service._get_voices_path.return_value = ("af_heart", "/voices/af_heart.pt")
+        service.segments = []
+        service.calls = []
+
+        async def mock_stream(text, **kwargs):
+            service.calls.append(kwargs)
+            if isinstance(text, str):
+                if text == "hang":
+                    await asyncio.Event().wait()
+                for word in text.split():
+                    yield AudioChunk(np.zeros(10, np.int16), output=word.encode())
+                return
+            async for segment in text:
+                service.segments.append(segment)
+                yield AudioChunk(
+                    np.zeros(10, np.int16),
+                    word_timestamps=WordTimestamps([segment], [0.0], [1.0]),
+                    output=segment.encode(),
+                )
+            # Final chunk from finalizing the writer
+            yield AudioChunk(np.array([], np.int16), output=b"")
+
+        service.generate_audio_stream = mock_stream
+        mock_get.return_value = service
+        yield service
+
+
+def test_stream_speech_sentences(mock_tts_service):
+    """Test deltas are synthesized as soon as a sentence completes"""
+    with client.websocket_connect("/v1/audio/speech/stream") as ws:
+        ws.send_json({"type": "config", "voice": "af_bella"})
+        for delta in ["Hello", " world.", " How are", " you"]:
+            ws.send_json({"type": "text", "text": delta})
+        assert ws.receive_bytes() == b"Hello world."
+
+        ws.send_json({"type": "close"})
+        assert ws.receive_bytes() == b"How are you"
+        assert ws.receive_json() == {"type": "done"}
+
+    assert mock_tts_service.segments == ["Hello world.", "How are you"]
+
+
+def test_stream_speech_flush_and_timestamps(mock_tts_service):
+    """Test flush releases partial text and timestamps follow the audio"""
+    with client.websocket_connect("/v1/audio/speech/stream") as ws:
+        ws.send_json({"type": "config", "return_timestamps": True})
+        ws.send_json({"type": "text", "text": "No boundary here"})
+        ws.send_json({"type": "flush"})
+        assert ws.receive_bytes() == b"No boundary here"
+        message = ws.receive_json()
+        assert message["type"] == "timestamps"
+        assert message["timestamps"][0]["word"] == "No boundary here"
+
+        ws.send_json({"type": "close"})
+        assert ws.receive_json() == {"type": "done"}
+
+
+def test_stream_speech_invalid_voice(mock_tts_service):
+    """Test an unknown voice is reported before closing"""
+    with client.websocket_connect("/v1/audio/speech/stream") as ws:
+        ws.send_json({"type": "config", "voice": "missing_voice"})
+        ws.send_json({"type": "text", "text": "Hello."})
+        message = ws.receive_json()
+        assert message["type"] == "error"
+        assert "missing_voice" in message["message"]
+
+
+def test_stream_speech_config_after_text(mock_tts_service):
+    """Test config cannot change once synthesis has started"""
+    with client.websocket_connect("/v1/audio/speech/stream") as ws:
+        ws.send_json({"type": "text", "text": "Hello"})
+        ws.send_json({"type": "config", "speed": 2.0})
+        message = ws.receive_json()
+        assert message == {
+            "type": "error",
+            "message": "Config must be sent before any text",
+        }
+
+
+def parse_frame(frame: bytes):
+    """Split a session audio frame into utterance id and audio"""
+    (length,) = struct.unpack(">H", frame[:2])
+    return frame[2 : 2 + length].decode(), frame[2 + length :]
+
+
+def test_speech_session_utterances(mock_tts_service):
+    """Test utterances share the voice resolved when the session opened"""
+    with client.websocket_connect("/v1/audio/speech/session") as ws:
+        ws.send_json({"type": "config", "response_format": "pcm"})
+        ws.send_json({"type": "utterance", "id": "u1", "text": "one two"})
+        assert ws.receive_json() == {"type": "ready", "voice": "af_heart"}
+        assert parse_frame(ws.receive_bytes()) == ("u1", b"one")
+        assert parse_frame(ws.receive_bytes()) == ("u1", b"two")
+        assert ws.receive_json() == {"type": "utterance_done", "id": "u1"}
+
+        ws.send_json({"type": "utterance", "id": "u2", "text": "three"})
+        assert parse_frame(ws.receive_bytes()) == ("u2", b"three")
+        assert ws.receive_json() == {"type": "utterance_done", "id": "u2"}
+
+        ws.send_json({"type": "close"})
+        assert ws.receive_json() == {"type": "done"}
+
+    mock_tts_service._get_voices_path.assert_awaited_once_with("af_heart")
+    assert len(mock_tts_service.calls) == 2
+    assert all(
+        call["voice_path"] == "/voices/af_heart.pt" for call in mock_tts_service.calls
+    )
+    assert mock_tts_service.calls[0]["normalizer"] is mock_tts_service.calls[1][
+        "normalizer"
+    ]
+
+
+def test_speech_session_cancel(mock_tts_service):
+    """Test cancelling one utterance leaves the session usable"""
+    with client.websocket_connect("/v1/audio/speech/session") as ws:
+        ws.send_json({"type": "utterance", "id": "slow", "text": "hang"})
+        assert ws.receive_json()["type"] == "ready"
+        ws.send_json({"type": "utterance", "id": "slow", "text": "again"})
+        assert ws.receive_json()["id"] == "slow"
+
+        ws.send_json({"type": "cancel", "id": "slow"})
+        assert ws.receive_json() == {"type": "cancelled", "id": "slow"}
+
+        ws.send_json({"type": "utterance", "id": "next", "text": "hi"})
+        assert parse_frame(ws.receive_bytes()) == ("next", b"hi")
+        assert ws.receive_json() == {"type": "utterance_done", "id": "next"}
+
+
+@pytest.mark.asyncio
+async def test_speech_session_cancel_propagates(mock_tts_service):
+    """Test a cancelled utterance reports it and ends as a cancelled task"""
+    from api.src.routers.websocket import SpeechSession, parse_config
+
+    websocket = AsyncMock()
+    session = SpeechSession(
+        websocket, mock_tts_service, parse_config({}), "af_heart", "/v.pt"
+    )
+    session.start("slow", "hang")
+    task = session.utterances["slow"]
+    await asyncio.sleep(0.01)
+
+    assert session.cancel("slow")
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert task.cancelled()
+    websocket.send_text.assert_awaited_once_with('{"type":"cancelled","id":"slow"}')
+
+
+def test_speech_session_invalid_voice(mock_tts_service):
+    """Test an unknown session voice closes the session"""
+    with client.websocket_connect("/v1/audio/speech/session") as ws:
+        ws.send_json({"type": "config", "voice": "missing_voice"})
+        ws.send_json({"type": "utterance", "id": "u1", "text": "Hello."})
+        message = ws.receive_json()
+        assert message["type"] == "error"
+        assert "id" not in message
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark custom phoneme placeholder restoration in sentence splitting.
+
+Builds documents with thousands of [word](/ipa/) tags, swaps them for
+placeholders the way smart_split does and compares restoring them with the
+original per-sentence scan over every remaining placeholder id against the
+single regex pass in split_sentences.
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+)
+
+from api.src.services.text_processing.text_processor import (  # noqa: E402
+    CUSTOM_PHONEMES,
+    handle_custom_phonemes,
+    split_sentences,
+)
+
+TERMS = [
+    ("[tachycardia](/tˌækɪkˈɑːɹdiə/)", "is a fast heart rate"),
+    ("[dyspnea](/dɪspnˈiːə/)", "means shortness of breath"),
+    ("[erythema](/ˌɛɹɪθˈiːmə/)", "is redness of the skin"),
+    ("[pruritus](/pɹuːɹˈaɪɾəs/)", "is severe itching"),
+]
+
+
+def split_sentences_legacy(text: str, custom_phenomes_list: dict) -> list:
+    """The original restoration: test every remaining id against every sentence"""
+    sentences = re.split(r"([.!?;:])(?=\s|$)", text)
+    phoneme_length, min_value = len(custom_phenomes_list), 0
+
+    texts = []
+    for i in range(0, len(sentences), 2):
+        sentence = sentences[i].strip()
+        for replaced in range(min_value, phoneme_length):
+            current_id = f"</|custom_phonemes_{replaced}|/>"
+            if current_id in sentence:
+                sentence = sentence.replace(
+                    current_id, custom_phenomes_list.pop(current_id)
+                )
+                min_value += 1
+        punct = sentences[i + 1] if i + 1 < len(sentences) else ""
+        if not sentence:
+            continue
+        full = (sentence + punct).strip()
+        if full:
+            texts.append(full)
+    return texts
+
+
+def build_document(tags: int) -> str:
+    parts = []
+    for i in range(tags):
+        term, definition = TERMS[i % len(TERMS)]
+        filler = " The patient was stable." if i % 3 == 0 else ""
+        parts.append(f"Entry {i}: {term} {definition}.{filler}")
+    return " ".join(parts)
+
+
+def with_placeholders(text: str):
+    custom_phoneme_list = {}
+    processed = CUSTOM_PHONEMES.sub(
+        lambda s: handle_custom_phonemes(s, custom_phoneme_list), text
+    )
+    return processed, custom_phoneme_list
+
+
+def main():
+    print(f"{'tags':>8}{'legacy':>12}{'regex':>12}{'speedup':>10}")
+    for tags in (100, 1_000, 5_000, 10_000):
+        text, phonemes = with_placeholders(build_document(tags))
+
+        start = time.perf_counter()
+        expected = split_sentences_legacy(text, dict(phonemes))
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = split_sentences(text, dict(phonemes))
+        fast = time.perf_counter() - start
+
+        if expected != actual:
+            raise AssertionError(f"Output mismatch with {tags} tags")
+        print(
+            f"{tags:>8}{legacy * 1000:>10.1f}ms{fast * 1000:>10.1f}ms"
+            f"{legacy / fast:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
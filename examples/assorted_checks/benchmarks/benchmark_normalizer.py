@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Benchmark the text normalizer against the original one-pass-per-rule version.
+
+Runs both implementations over documents of increasing length built from
+the_time_machine_hg_wells.txt (plain prose) and a number-heavy variant, checks
+that they produce identical output and reports the speedup. Also compares the
+number-heavy document with cold and warmed verbalization caches.
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+)
+
+from api.src.services.text_processing import normalizer  # noqa: E402
+from api.src.structures.schemas import NormalizationOptions  # noqa: E402
+
+
+def normalize_text_sequential(text: str, options: NormalizationOptions) -> str:
+    """The original normalizer: one full re.sub/str.replace pass per rule"""
+    if options.email_normalization:
+        text = normalizer.EMAIL_PATTERN.sub(normalizer.handle_email, text)
+    if options.url_normalization:
+        text = normalizer.URL_PATTERN.sub(normalizer.handle_url, text)
+    if options.unit_normalization:
+        text = normalizer.UNIT_PATTERN.sub(normalizer.handle_units, text)
+    if options.optional_pluralization_normalization:
+        text = re.sub(r"\(s\)", "s", text)
+    if options.phone_normalization:
+        text = re.sub(
+            r"(\+?\d{1,2})?([ .-]?)(\(?\d{3}\)?)[\s.-](\d{3})[\s.-](\d{4})",
+            normalizer.handle_phone_number,
+            text,
+        )
+    text = text.replace(chr(8216), "'").replace(chr(8217), "'")
+    text = text.replace("«", chr(8220)).replace("»", chr(8221))
+    text = text.replace(chr(8220), '"').replace(chr(8221), '"')
+    for a, b in zip("、。！，：；？–", ",.!,:;?-"):
+        text = text.replace(a, b + " ")
+    text = normalizer.TIME_PATTERN.sub(normalizer.handle_time, text)
+    text = re.sub(r"[^\S \n]", " ", text)
+    text = re.sub(r"  +", " ", text)
+    text = re.sub(r"(?<=\n) +(?=\n)", "", text)
+    text = text.replace("\n", " ")
+    text = text.replace("\r", " ")
+    text = re.sub(r"\bD[Rr]\.(?= [A-Z])", "Doctor", text)
+    text = re.sub(r"\b(?:Mr\.|MR\.(?= [A-Z]))", "Mister", text)
+    text = re.sub(r"\b(?:Ms\.|MS\.(?= [A-Z]))", "Miss", text)
+    text = re.sub(r"\b(?:Mrs\.|MRS\.(?= [A-Z]))", "Mrs", text)
+    text = re.sub(r"\betc\.(?! [A-Z])", "etc", text)
+    text = re.sub(r"(?i)\b(y)eah?\b", r"\1e'a", text)
+    text = re.sub(r"(?<=\d),(?=\d)", "", text)
+    text = normalizer.MONEY_PATTERN.sub(normalizer.handle_money, text)
+    text = normalizer.NUMBER_PATTERN.sub(normalizer.handle_numbers, text)
+    text = re.sub(r"\d*\.\d+", normalizer.handle_decimal, text)
+    if options.replace_remaining_symbols:
+        for symbol, replacement in normalizer.SYMBOL_REPLACEMENTS.items():
+            text = text.replace(symbol, replacement)
+    text = re.sub(r"(?<=\d)-(?=\d)", " to ", text)
+    text = re.sub(r"(?<=\d)S", " S", text)
+    text = re.sub(r"(?<=[BCDFGHJ-NP-TV-Z])'?s\b", "'S", text)
+    text = re.sub(r"(?<=X')S\b", "s", text)
+    text = re.sub(
+        r"(?:[A-Za-z]\.){2,} [a-z]", lambda m: m.group().replace(".", "-"), text
+    )
+    text = re.sub(r"(?i)(?<=[A-Z])\.(?=[A-Z])", "-", text)
+    text = re.sub(r"\s{2,}", " ", text)
+    return text.strip()
+
+
+def load_corpus() -> str:
+    path = os.path.join(os.path.dirname(__file__), "the_time_machine_hg_wells.txt")
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def time_call(fn, text: str, options: NormalizationOptions, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(text, options)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def clear_verbalization_caches() -> None:
+    for fn in (normalizer.number_to_words, normalizer.plural, normalizer.no):
+        fn.cache_clear()
+
+
+def main():
+    corpus = load_corpus()
+    numeric = re.sub(
+        r"\.\s",
+        lambda m: (
+            f", costing ${m.start() % 9973}.{m.start() % 89 + 10} at "
+            f"{m.start() % 12 + 1}:{m.start() % 50 + 10} in {1800 + m.start() % 220}. "
+        ),
+        corpus,
+    )
+    options = NormalizationOptions()
+
+    print(f"{'document':<10}{'chars':>10}{'sequential':>14}{'fused':>12}{'speedup':>10}")
+    for name, source in (("prose", corpus), ("numeric", numeric)):
+        for size in (1_000, 10_000, 100_000, len(source)):
+            text = source[:size]
+            repeats = 5 if size <= 10_000 else 2
+            expected = normalize_text_sequential(text, options)
+            actual = normalizer.normalize_text(text, options)
+            if expected != actual:
+                raise AssertionError(f"Output mismatch for {name} at {size} chars")
+
+            seq = time_call(normalize_text_sequential, text, options, repeats)
+            fused = time_call(normalizer.normalize_text, text, options, repeats)
+            print(
+                f"{name:<10}{len(text):>10}{seq * 1000:>12.1f}ms{fused * 1000:>10.1f}ms"
+                f"{seq / fused:>9.2f}x"
+            )
+
+    print(f"\n{'chars':>10}{'cold cache':>14}{'warm cache':>14}{'speedup':>10}")
+    start = time.perf_counter()
+    normalizer.warm_verbalization_cache()
+    warmup = time.perf_counter() - start
+    for size in (1_000, 10_000, 100_000, len(numeric)):
+        text = numeric[:size]
+        clear_verbalization_caches()
+        start = time.perf_counter()
+        normalizer.normalize_text(text, options)
+        cold = time.perf_counter() - start
+        normalizer.warm_verbalization_cache()
+        warm = time_call(normalizer.normalize_text, text, options, 3)
+        print(
+            f"{len(text):>10}{cold * 1000:>12.1f}ms{warm * 1000:>12.1f}ms"
+            f"{cold / warm:>9.2f}x"
+        )
+    print(f"Startup cache warmup: {warmup * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark the word timestamp pipeline for long captioned documents.
+
+Compares building, offsetting and serializing one pydantic WordTimestamp per
+word against the WordTimestamps arrays serialized with json_dumps at the
+response boundary.
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+)
+
+from api.src.inference.base import WordTimestamps  # noqa: E402
+from api.src.structures.custom_responses import json_dumps  # noqa: E402
+from api.src.structures.schemas import WordTimestamp  # noqa: E402
+
+WORDS_PER_CHUNK = 40
+
+
+def pydantic_pipeline(chunks: int) -> bytes:
+    lines = []
+    offset = 0.0
+    for _ in range(chunks):
+        timestamps = [
+            WordTimestamp(word=f"word{i}", start_time=i * 0.3, end_time=i * 0.3 + 0.25)
+            for i in range(WORDS_PER_CHUNK)
+        ]
+        for timestamp in timestamps:
+            timestamp.start_time += offset
+            timestamp.end_time += offset
+        offset += WORDS_PER_CHUNK * 0.3
+        lines.append(
+            json.dumps(
+                {"timestamps": [t.model_dump() for t in timestamps]},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+        )
+    return b"\n".join(lines)
+
+
+def array_pipeline(chunks: int) -> bytes:
+    lines = []
+    offset = 0.0
+    for _ in range(chunks):
+        words, start_times, end_times = [], [], []
+        for i in range(WORDS_PER_CHUNK):
+            words.append(f"word{i}")
+            start_times.append(i * 0.3)
+            end_times.append(i * 0.3 + 0.25)
+        timestamps = WordTimestamps(words, start_times, end_times)
+        timestamps.shift(offset)
+        offset += WORDS_PER_CHUNK * 0.3
+        lines.append(json_dumps({"timestamps": timestamps.to_dicts()}))
+    return b"\n".join(lines)
+
+
+def main():
+    print(f"{'words':>8}{'pydantic':>12}{'arrays':>12}{'speedup':>10}")
+    for chunks in (25, 250, 1_000):
+        start = time.perf_counter()
+        expected = pydantic_pipeline(chunks)
+        slow = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = array_pipeline(chunks)
+        fast = time.perf_counter() - start
+
+        if json.loads(b"[" + expected.replace(b"\n", b",") + b"]") != json.loads(
+            b"[" + actual.replace(b"\n", b",") + b"]"
+        ):
+            raise AssertionError(f"Output mismatch with {chunks} chunks")
+        print(
+            f"{chunks * WORDS_PER_CHUNK:>8}{slow * 1000:>10.1f}ms"
+            f"{fast * 1000:>10.1f}ms{slow / fast:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
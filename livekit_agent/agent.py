@@ -9,6 +9,8 @@ from livekit.agents import AgentSession, Agent, RoomInputOptions, RoomOutputOpti
 from livekit.plugins import openai, silero
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
+import kokoro_tts
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -60,8 +62,10 @@ async def entrypoint(ctx: agents.JobContext):
         llm=openai.LLM(model="gpt-4o-mini"),
         # tts=openai.TTS(),
         # tts=openai.TTS(model='coqui', base_url='http://localhost:5002/api/tts'),
-        tts=openai.TTS(model='kokoro', base_url='http://localhost:8880/v1', voice='af_jessica',
-                       instructions='you should be able to read acronyms'),
+        # tts=openai.TTS(model='kokoro', base_url='http://localhost:8880/v1', voice='af_jessica',
+        #                instructions='you should be able to read acronyms'),
+        # Streams LLM tokens to Kokoro so speech starts after the first sentence
+        tts=kokoro_tts.TTS(base_url='ws://localhost:8880/v1', voice='af_jessica'),
         vad=silero.VAD.load(),
         turn_detection=MultilingualModel(),
     )
@@ -0,0 +1,132 @@
+"""Streaming Kokoro TTS for LiveKit agents.
+
+Sends LLM output to the Kokoro-FastAPI /v1/audio/speech/stream WebSocket as it
+is generated, so audio starts after the first sentence instead of after the
+whole response.
+"""
+
+import asyncio
+import json
+
+import aiohttp
+from livekit.agents import (
+    DEFAULT_API_CONNECT_OPTIONS,
+    APIConnectionError,
+    APIConnectOptions,
+    tts,
+    utils,
+)
+
+SAMPLE_RATE = 24000
+NUM_CHANNELS = 1
+
+
+class TTS(tts.TTS):
+    def __init__(
+        self,
+        *,
+        base_url: str = "ws://localhost:8880/v1",
+        voice: str = "af_heart",
+        speed: float = 1.0,
+        model: str = "kokoro",
+    ):
+        super().__init__(
+            capabilities=tts.TTSCapabilities(streaming=True),
+            sample_rate=SAMPLE_RATE,
+            num_channels=NUM_CHANNELS,
+        )
+        self._url = f"{base_url.rstrip('/')}/audio/speech/stream"
+        self._config = {
+            "type": "config",
+            "model": model,
+            "voice": voice,
+            "speed": speed,
+            "response_format": "pcm",
+        }
+
+    def synthesize(
+        self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> "ChunkedStream":
+        return ChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+    def stream(
+        self, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> "SynthesizeStream":
+        return SynthesizeStream(tts=self, conn_options=conn_options)
+
+    async def _connect(self) -> aiohttp.ClientWebSocketResponse:
+        try:
+            ws = await utils.http_context.http_session().ws_connect(self._url)
+        except aiohttp.ClientError as e:
+            raise APIConnectionError(f"Could not connect to {self._url}") from e
+        await ws.send_str(json.dumps(self._config))
+        return ws
+
+
+async def _receive_audio(
+    ws: aiohttp.ClientWebSocketResponse, output_emitter: tts.AudioEmitter
+) -> None:
+    """Push audio frames into the emitter until the server is done"""
+    async for msg in ws:
+        if msg.type == aiohttp.WSMsgType.BINARY:
+            output_emitter.push(msg.data)
+        elif msg.type == aiohttp.WSMsgType.TEXT:
+            data = json.loads(msg.data)
+            if data["type"] == "error":
+                raise APIConnectionError(data["message"])
+            if data["type"] == "done":
+                return
+        elif msg.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED):
+            raise APIConnectionError("Kokoro closed the connection unexpectedly")
+
+
+class ChunkedStream(tts.ChunkedStream):
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        output_emitter.initialize(
+            request_id=utils.shortuuid(),
+            sample_rate=SAMPLE_RATE,
+            num_channels=NUM_CHANNELS,
+            mime_type="audio/pcm",
+        )
+        ws = await self._tts._connect()
+        try:
+            await ws.send_str(json.dumps({"type": "text", "text": self._input_text}))
+            await ws.send_str(json.dumps({"type": "close"}))
+            await _receive_audio(ws, output_emitter)
+        finally:
+            await ws.close()
+        output_emitter.flush()
+
+
+class SynthesizeStream(tts.SynthesizeStream):
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        request_id = utils.shortuuid()
+        output_emitter.initialize(
+            request_id=request_id,
+            sample_rate=SAMPLE_RATE,
+            num_channels=NUM_CHANNELS,
+            mime_type="audio/pcm",
+            stream=True,
+        )
+        output_emitter.start_segment(segment_id=request_id)
+
+        async def send_text(ws: aiohttp.ClientWebSocketResponse) -> None:
+            async for data in self._input_ch:
+                if isinstance(data, self._FlushSentinel):
+                    await ws.send_str(json.dumps({"type": "flush"}))
+                else:
+                    self._mark_started()
+                    await ws.send_str(json.dumps({"type": "text", "text": data}))
+            await ws.send_str(json.dumps({"type": "close"}))
+
+        ws = await self._tts._connect()
+        tasks = [
+            asyncio.create_task(send_text(ws)),
+            asyncio.create_task(_receive_audio(ws, output_emitter)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            await utils.aio.gracefully_cancel(*tasks)
+            await ws.close()
+        output_emitter.end_segment()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Fit the linear token estimator used to plan chunks in smart_split.
+
+Normalizes and sentence-splits a corpus exactly like smart_split, phonemizes
+every sentence to get the true token counts and fits a least squares model
+over letter/word/punctuation counts. Digit and non-Latin character costs can't
+be learned from an English novel, so they are measured directly.
+
+The ratio/slack pair is chosen so the upper bound covers every sentence of
+the corpus. Paste the printed estimator into LINEAR_ESTIMATORS in
+api/src/services/text_processing/token_estimator.py.
+
+Usage:
+    python scripts/calibrate_token_estimator.py [corpus.txt] [--lang a] [--slack 16]
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from api.src.services.text_processing.normalizer import normalize_text  # noqa: E402
+from api.src.services.text_processing.text_processor import (  # noqa: E402
+    get_sentence_info,
+    process_text_chunks,
+)
+from api.src.services.text_processing.token_estimator import (  # noqa: E402
+    ASCII_LETTER_PATTERN,
+    PUNCTUATION_PATTERN,
+    LinearTokenEstimator,
+)
+from api.src.structures.schemas import NormalizationOptions  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(
+    ROOT, "examples", "assorted_checks", "benchmarks", "the_time_machine_hg_wells.txt"
+)
+CJK_SAMPLE = "这是一个句子我们今天测试中文语音合成的效果"
+
+
+def features(text: str) -> list:
+    return [
+        len(ASCII_LETTER_PATTERN.findall(text)),
+        len(text.split()),
+        len(PUNCTUATION_PATTERN.findall(text)),
+        1,
+    ]
+
+
+def per_char_cost(chars: str, lang: str) -> float:
+    """Worst case tokens per character for characters read one by one"""
+    counts = process_text_chunks(list(chars), lang)
+    return float(max(len(tokens) for tokens in counts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", default=DEFAULT_CORPUS)
+    parser.add_argument("--lang", default="a")
+    parser.add_argument("--slack", type=float, default=16.0)
+    args = parser.parse_args()
+
+    with open(args.corpus, "r", encoding="utf-8") as f:
+        text = normalize_text(f.read(), NormalizationOptions())
+    sentences = get_sentence_info(text, {}, lang_code=args.lang)
+
+    X = np.array([features(s) for s, _, _ in sentences], dtype=float)
+    y = np.array([count for _, _, count in sentences], dtype=float)
+    (letter, word, punctuation, intercept), *_ = np.linalg.lstsq(X, y, rcond=None)
+
+    estimator = LinearTokenEstimator(
+        letter=letter,
+        word=word,
+        punctuation=punctuation,
+        digit=per_char_cost("0123456789", args.lang),
+        other=per_char_cost(CJK_SAMPLE, args.lang),
+        intercept=intercept,
+        ratio=1.0,
+        slack=args.slack,
+    )
+    estimates = np.array([estimator._raw_estimate(s) for s, _, _ in sentences])
+    ratio = float(np.max((y - args.slack) / np.maximum(estimates, 1.0)))
+    estimator.ratio = max(1.0, np.ceil(ratio * 100) / 100)
+
+    errors = np.abs(np.round(estimates) - y)
+    bounds = np.array([estimator.upper_bound(s) for s, _, _ in sentences])
+    print(f"Sentences: {len(y)}, tokens: {int(y.sum())}")
+    print(f"Mean abs error: {errors.mean():.2f} tokens, max: {errors.max():.0f}")
+    print(f"Total estimate error: {(estimates.sum() - y.sum()) / y.sum():+.2%}")
+    print(f"Upper bound covers {np.mean(bounds >= y):.2%} of sentences")
+    print()
+    print(f'    "{args.lang}": LinearTokenEstimator(')
+    for name in ("letter", "word", "punctuation", "digit", "other", "intercept"):
+        print(f"        {name}={getattr(estimator, name):.4f},")
+    print(f"        ratio={estimator.ratio:.2f},")
+    print(f"        slack={estimator.slack:.1f},")
+    print("    ),")
+
+
+if __name__ == "__main__":
+    main()